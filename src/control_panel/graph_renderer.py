@@ -0,0 +1,70 @@
+"""
+QuantumDesk Graph Renderer
+Blit-based incremental rendering for the Control Panel monitor graphs
+"""
+
+
+class BlitGraphRenderer:
+    """Redraw only the line artists of registered graphs
+
+    The static part of each figure (title, grid, ticks and labels) is cached
+    as a bitmap whenever the canvas performs a full draw. Updates only mark a
+    graph dirty; render() then restores the cached background, draws the
+    line and blits it, once per frame for all dirty graphs together.
+    """
+
+    def __init__(self):
+        """Initialize an empty renderer"""
+        self._graphs = {}
+        self._dirty = set()
+
+    def add(self, key, canvas, line):
+        """
+        Register a graph
+
+        Args:
+            key: Identifier used by update()
+            canvas: FigureCanvasTkAgg hosting the figure
+            line: Line2D artist to animate
+        """
+        line.set_animated(True)
+        graph = {'canvas': canvas, 'line': line, 'background': None}
+        self._graphs[key] = graph
+        canvas.mpl_connect('draw_event', lambda event, g=graph: self._on_draw(g))
+        self._dirty.add(key)
+
+    def update(self, key, ydata):
+        """Set new data for a graph; drawing happens on the next render()"""
+        graph = self._graphs.get(key)
+        if graph is None:
+            return
+        graph['line'].set_ydata(ydata)
+        self._dirty.add(key)
+
+    def invalidate(self):
+        """Force a full redraw of every graph (e.g. after a theme change)"""
+        for graph in self._graphs.values():
+            graph['background'] = None
+        self._dirty.update(self._graphs)
+
+    def render(self):
+        """Blit every dirty graph; returns the number of graphs redrawn"""
+        dirty = [self._graphs[key] for key in self._dirty if key in self._graphs]
+        self._dirty.clear()
+        for graph in dirty:
+            canvas = graph['canvas']
+            if graph['background'] is None:
+                # Full draw; the draw_event caches the background and draws the line
+                canvas.draw()
+                continue
+            canvas.restore_region(graph['background'])
+            canvas.figure.draw_artist(graph['line'])
+            canvas.blit(canvas.figure.bbox)
+        return len(dirty)
+
+    @staticmethod
+    def _on_draw(graph):
+        """Cache the static background after a full draw"""
+        canvas = graph['canvas']
+        graph['background'] = canvas.copy_from_bbox(canvas.figure.bbox)
+        canvas.figure.draw_artist(graph['line'])
@@ -2,16 +2,19 @@ import customtkinter as ctk
 import psutil
 import threading
 import time
-import GPUtil
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from system_optimizer import SystemOptimizer
+from system_optimizer import PipelineStage, SystemOptimizer
 from security_prefs import SecurityTools
+from system_monitor import get_shared_sampler
+from control_panel.graph_renderer import BlitGraphRenderer
+from control_panel.render_scheduler import RenderScheduler
+from control_panel.refresh_policy import AdaptiveRefreshPolicy
 
 class QuantumDeskGUI(ctk.CTk):
-    def __init__(self):
+    def __init__(self, monitor_fps=4):
         super().__init__()
         self.title("QuantumDesk")
         self.geometry("1200x800")
@@ -120,6 +123,14 @@ class QuantumDeskGUI(ctk.CTk):
         self.gpu_fig, self.gpu_ax, self.gpu_line = make_graph("GPU Usage (%)", '#AA88FF')
         self.gpu_canvas = FigureCanvasTkAgg(self.gpu_fig, master=self.monitor_frame)
         self.gpu_canvas.get_tk_widget().grid(row=2, column=1, padx=10, pady=10, sticky='nsew')
+        
+        # Graphs only blit their lines over a cached background
+        self.graph_renderer = BlitGraphRenderer()
+        self.graph_renderer.add('cpu', self.cpu_canvas, self.cpu_line)
+        self.graph_renderer.add('ram', self.ram_canvas, self.ram_line)
+        self.graph_renderer.add('gpu', self.gpu_canvas, self.gpu_line)
+        for fig, ax, line, canvas, dev in self.disk_graphs:
+            self.graph_renderer.add(dev, canvas, line)
         self.monitor_frame.pack_forget()
 
         # --- System Optimizer Panel ---
@@ -135,6 +146,8 @@ class QuantumDeskGUI(ctk.CTk):
         ctk.CTkButton(ram_buttons, text="Free RAM", command=self.free_ram, fg_color="#FF6B6B").pack(side="left", padx=5)
         ctk.CTkButton(ram_buttons, text="Clear Cache", command=self.clear_cache, fg_color="#4ECDC4").pack(side="left", padx=5)
         ctk.CTkButton(ram_buttons, text="Optimize Memory", command=self.optimize_memory, fg_color="#45B7D1").pack(side="left", padx=5)
+        self.watchdog_switch = ctk.CTkSwitch(ram_buttons, text="Memory Watchdog", command=self.toggle_memory_watchdog)
+        self.watchdog_switch.pack(side="left", padx=5)
         
         self.ram_status = ctk.CTkLabel(ram_section, text="Ready to optimize", font=("Arial", 12))
         self.ram_status.pack(pady=5)
@@ -196,6 +209,7 @@ class QuantumDeskGUI(ctk.CTk):
         ctk.CTkButton(perf_buttons, text="Game Mode", command=self.game_mode, fg_color="#FF5722").pack(side="left", padx=5)
         ctk.CTkButton(perf_buttons, text="High Performance", command=self.high_performance, fg_color="#795548").pack(side="left", padx=5)
         ctk.CTkButton(perf_buttons, text="Priority Boost", command=self.priority_boost, fg_color="#607D8B").pack(side="left", padx=5)
+        ctk.CTkButton(perf_buttons, text="Normal Mode", command=self.normal_mode, fg_color="#9E9E9E").pack(side="left", padx=5)
         
         self.perf_status = ctk.CTkLabel(perf_section, text="Performance: Normal", font=("Arial", 12))
         self.perf_status.pack(pady=5)
@@ -300,6 +314,10 @@ class QuantumDeskGUI(ctk.CTk):
         self.log_panel.pack(side="bottom", fill="x", padx=10, pady=5)
         self.log_panel.insert("end", "[INFO] QuantumDesk started.\n")
         self.log_panel.configure(state="disabled")
+        # log() is also called from worker threads (optimizer actions, the
+        # memory watchdog); lines are queued and written by a Tk after() loop
+        self.log_scheduler = RenderScheduler(self, self._write_log, fps=10, maxsize=0)
+        self.log_scheduler.start()
 
         self.show_panel("Control Panel")
         self.monitoring = True
@@ -308,9 +326,22 @@ class QuantumDeskGUI(ctk.CTk):
         self.optimizer = SystemOptimizer(log_callback=self.log)
         self.security_tools = SecurityTools(log_callback=self.log)
         
-        threading.Thread(target=self.update_monitor, daemon=True).start()
+        # All panels read from the shared metrics sampler. Its thread only
+        # queues snapshots; widgets are updated by a Tk after() render loop.
+        self.render_scheduler = RenderScheduler(self, self.update_monitor, fps=monitor_fps)
+        self.sampler = get_shared_sampler()
+        self.sampler.subscribe(self.render_scheduler.push)
+        self.sampler.start()
+        self.render_scheduler.start()
+        
+        # Slow down when the monitor is hidden, minimised or the box is busy
+        self.refresh_policy = AdaptiveRefreshPolicy(base_interval=self.sampler.base_interval, base_fps=monitor_fps)
+        self.bind("<Unmap>", self._on_map_change, add="+")
+        self.bind("<Map>", self._on_map_change, add="+")
+        self.after(1000, self._refresh_policy_loop)
 
     def show_panel(self, feature):
+        self.current_panel = feature
         if feature == "Control Panel":
             self.panel_label.configure(text="System Monitor")
             self.monitor_frame.pack(expand=True, fill="both", padx=20, pady=20)
@@ -321,6 +352,8 @@ class QuantumDeskGUI(ctk.CTk):
             self.optimizer_frame.pack(expand=True, fill="both", padx=20, pady=20)
             self.monitor_frame.pack_forget()
             self.security_frame.pack_forget()
+            if hasattr(self, 'optimizer'):
+                self.estimate_cleanup()
         elif feature == "Security":
             self.panel_label.configure(text="Security Tools")
             self.security_frame.pack(expand=True, fill="both", padx=20, pady=20)
@@ -331,101 +364,121 @@ class QuantumDeskGUI(ctk.CTk):
             self.monitor_frame.pack_forget()
             self.optimizer_frame.pack_forget()
             self.security_frame.pack_forget()
+        if hasattr(self, 'refresh_policy'):
+            self.adapt_refresh_rate()
         self.log(f"Switched to {feature} panel.")
 
     def toggle_theme(self):
         mode = "Dark" if self.theme_toggle.get() else "Light"
         ctk.set_appearance_mode(mode)
+        self.graph_renderer.invalidate()
         self.log(f"Switched to {mode} mode.")
 
     def log(self, message):
+        """Queue a log line; safe to call from any thread"""
+        self.log_scheduler.push(message)
+
+    def _write_log(self, messages):
+        """Append queued log lines to the log panel (runs on the Tk thread)"""
         self.log_panel.configure(state="normal")
-        self.log_panel.insert("end", f"[LOG] {message}\n")
+        self.log_panel.insert("end", "".join(f"[LOG] {message}\n" for message in messages))
         self.log_panel.see("end")
         self.log_panel.configure(state="disabled")
 
-    def update_monitor(self):
-        while self.monitoring:
+    def monitor_visible(self):
+        """True if the Control Panel is shown and the window is not minimised"""
+        return self.current_panel == "Control Panel" and self.state() != "iconic"
+
+    def _on_map_change(self, event):
+        """Minimise/restore of the main window (child widget events are ignored)"""
+        if event.widget is self:
+            self.adapt_refresh_rate()
+
+    def adapt_refresh_rate(self):
+        """Apply the adaptive refresh policy to the monitor's render cadence
+
+        The monitor's subscription and render loop are throttled; the shared
+        sampler follows once no other subscriber needs its faster rate.
+        """
+        latest = self.sampler.latest()
+        interval, fps = self.refresh_policy.evaluate(
+            self.monitor_visible(),
+            system_cpu=latest.cpu_percent if latest else 0.0
+        )
+        self.sampler.set_min_interval(self.render_scheduler.push, interval)
+        self.render_scheduler.set_fps(fps)
+
+    def _refresh_policy_loop(self):
+        """Re-evaluate the refresh rate periodically (runs on the Tk thread)"""
+        self.adapt_refresh_rate()
+        self.after(2000, self._refresh_policy_loop)
+
+    def update_monitor(self, snapshots):
+        """Apply queued sampler snapshots to the monitor (runs on the Tk thread)"""
+        if not self.monitoring or not snapshots:
+            return
+        gpu_due = disk_due = slow_due = False
+        
+        # Every queued sample goes into the graph history
+        for snapshot in snapshots:
             self.update_counter += 1
-            
-            # Get system data
-            cpu = psutil.cpu_percent(interval=0.1)  # Faster interval
-            ram = psutil.virtual_memory().percent
-            self.cpu_history.append(cpu)
+            self.cpu_history.append(snapshot.cpu_percent)
             self.cpu_history.pop(0)
-            self.ram_history.append(ram)
+            self.ram_history.append(snapshot.memory.percent)
             self.ram_history.pop(0)
             
-            # GPU (update less frequently)
-            if self.update_counter % 2 == 0:  # Every 2nd update
-                try:
-                    gpus = GPUtil.getGPUs()
-                    if gpus:
-                        gpu = gpus[0]
-                        gpu_load = int(gpu.load*100)
-                        gpu_temp = int(gpu.temperature)
-                    else:
-                        gpu_load = 0
-                        gpu_temp = 0
-                except Exception:
-                    gpu_load = 0
-                    gpu_temp = 0
-                self.gpu_history.append(gpu_load)
+            # GPU (the sampler refreshes it every 2nd tick)
+            if self.update_counter % 2 == 0:
+                gpu_due = True
+                self.gpu_history.append(snapshot.gpu_load)
                 self.gpu_history.pop(0)
                 
             # Disks (update even less frequently)
             if self.update_counter % 5 == 0:  # Every 5th update
-                partitions = [p for p in psutil.disk_partitions(all=True) if p.fstype and (p.opts.find('cdrom') == -1)]
-                for i, part in enumerate(partitions):
-                    try:
-                        usage = psutil.disk_usage(part.mountpoint).percent
-                    except Exception:
-                        usage = 0
-                    if i < len(self.disk_labels):
-                        self.disk_labels[i].configure(text=f"{part.device} Usage: {usage}%")
-                        self.disk_usage_history[part.device].append(usage)
-                        self.disk_usage_history[part.device].pop(0)
-                        
+                disk_due = True
+                for dev, usage in snapshot.disk_usage.items():
+                    if dev in self.disk_usage_history:
+                        self.disk_usage_history[dev].append(usage)
+                        self.disk_usage_history[dev].pop(0)
+            
             # Battery and Network (update even less frequently)
             if self.update_counter % 10 == 0:  # Every 10th update
-                try:
-                    battery = psutil.sensors_battery()
-                    battery_str = f"{battery.percent}% ({'Plugged' if battery.power_plugged else 'On Battery'})" if battery else "N/A"
-                except Exception:
-                    battery_str = "N/A"
-                try:
-                    net = psutil.net_io_counters()
-                    net_str = f"Sent: {net.bytes_sent//1024//1024} MB, Recv: {net.bytes_recv//1024//1024} MB"
-                except Exception:
-                    net_str = "N/A"
-                self.battery_label.configure(text=f"Battery: {battery_str}")
-                self.net_label.configure(text=f"Network: {net_str}")
-            
-            # Update labels (CPU/RAM every time, others as updated above)
-            self.cpu_label.configure(text=f"CPU Usage: {cpu:.1f}%")
-            self.ram_label.configure(text=f"RAM Usage: {ram:.1f}%")
-            if self.update_counter % 2 == 0:
-                self.gpu_label.configure(text=f"GPU Usage: {gpu_load}% | Temp: {gpu_temp}°C")
-            
-            # Update graphs more efficiently
-            self.cpu_line.set_ydata(self.cpu_history)
-            self.cpu_canvas.draw_idle()  # More efficient than draw()
+                slow_due = True
+        
+        # Widgets are only refreshed from the newest sample
+        snapshot = snapshots[-1]
+        if disk_due:
+            for i, (dev, usage) in enumerate(snapshot.disk_usage.items()):
+                if i < len(self.disk_labels) and dev in self.disk_usage_history:
+                    self.disk_labels[i].configure(text=f"{dev} Usage: {usage}%")
+                    
+        if slow_due:
+            battery = snapshot.battery
+            battery_str = f"{battery.percent}% ({'Plugged' if battery.power_plugged else 'On Battery'})" if battery else "N/A"
+            net = snapshot.net_io
+            net_str = f"Sent: {net.bytes_sent//1024//1024} MB, Recv: {net.bytes_recv//1024//1024} MB" if net else "N/A"
+            self.battery_label.configure(text=f"Battery: {battery_str}")
+            self.net_label.configure(text=f"Network: {net_str}")
+        
+        # Update labels (CPU/RAM every time, others as updated above)
+        self.cpu_label.configure(text=f"CPU Usage: {snapshot.cpu_percent:.1f}%")
+        self.ram_label.configure(text=f"RAM Usage: {snapshot.memory.percent:.1f}%")
+        if gpu_due:
+            self.gpu_label.configure(text=f"GPU Usage: {snapshot.gpu_load}% | Temp: {snapshot.gpu_temperature}°C")
+        
+        # Update graphs (only the lines are redrawn, in one pass per frame)
+        self.graph_renderer.update('cpu', self.cpu_history)
+        self.graph_renderer.update('ram', self.ram_history)
+        
+        if gpu_due:
+            self.graph_renderer.update('gpu', self.gpu_history)
             
-            self.ram_line.set_ydata(self.ram_history)
-            self.ram_canvas.draw_idle()
-            
-            if self.update_counter % 2 == 0:
-                self.gpu_line.set_ydata(self.gpu_history)
-                self.gpu_canvas.draw_idle()
-                
-            # Update disk graphs less frequently
-            if self.update_counter % 5 == 0:
-                for i, (fig, ax, line, canvas, dev) in enumerate(self.disk_graphs):
-                    if dev in self.disk_usage_history:
-                        line.set_ydata(self.disk_usage_history[dev])
-                        canvas.draw_idle()
-            
-            time.sleep(0.2)  # Faster update rate
+        # Update disk graphs less frequently
+        if disk_due:
+            for dev, history in self.disk_usage_history.items():
+                self.graph_renderer.update(dev, history)
+        
+        self.graph_renderer.render()
 
     # System Optimizer Methods - Using SystemOptimizer module
     def free_ram(self):
@@ -440,20 +493,51 @@ class QuantumDeskGUI(ctk.CTk):
         result = self.optimizer.optimize_memory()
         self.ram_status.configure(text=result['message'])
 
-    def kill_heavy_processes(self):
-        result = self.optimizer.kill_heavy_processes()
+    def toggle_memory_watchdog(self):
+        if self.watchdog_switch.get():
+            result = self.optimizer.start_memory_watchdog()
+        else:
+            result = self.optimizer.stop_memory_watchdog()
+        self.ram_status.configure(text=result['message'])
+
+    def _sync_watchdog_switch(self):
+        """Reflect a watchdog started elsewhere (Auto Optimize) in the switch"""
+        if self.optimizer.memory_watchdog_running:
+            self.watchdog_switch.select()
+        else:
+            self.watchdog_switch.deselect()
+
+    def _run_process_action(self, action):
+        """Run a terminating action on a worker thread; it waits for processes to exit"""
+        if getattr(self, '_process_action_running', False):
+            return
+        self._process_action_running = True
+        self.process_list.delete("1.0", "end")
+        self.process_list.insert("1.0", "Waiting for processes to exit...")
+
+        def run():
+            try:
+                result = action()
+            finally:
+                self._process_action_running = False
+            self.after(0, lambda: self._show_process_result(result))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _show_process_result(self, result):
         self.process_list.delete("1.0", "end")
         self.process_list.insert("1.0", result['message'])
 
+    def kill_heavy_processes(self):
+        self._run_process_action(self.optimizer.kill_heavy_processes)
+
     def end_idle_apps(self):
         result = self.optimizer.end_idle_apps()
         self.process_list.delete("1.0", "end")
         self.process_list.insert("1.0", result['message'])
 
     def clean_chrome(self):
-        result = self.optimizer.clean_chrome()
-        self.process_list.delete("1.0", "end")
-        self.process_list.insert("1.0", result['message'])
+        self._run_process_action(self.optimizer.clean_chrome)
 
     def scan_startup(self):
         result = self.optimizer.scan_startup()
@@ -470,6 +554,22 @@ class QuantumDeskGUI(ctk.CTk):
         self.startup_list.delete("1.0", "end")
         self.startup_list.insert("1.0", result['message'])
 
+    def estimate_cleanup(self):
+        """Show the reclaimable space from a background dry-run scan"""
+        if getattr(self, '_estimating_cleanup', False):
+            return
+        self._estimating_cleanup = True
+
+        def run():
+            try:
+                result = self.optimizer.full_system_clean(dry_run=True)
+                if result['status'] == 'success':
+                    self.after(0, lambda: self.cleanup_status.configure(text=result['message']))
+            finally:
+                self._estimating_cleanup = False
+
+        threading.Thread(target=run, daemon=True).start()
+
     def clean_temp(self):
         result = self.optimizer.clean_temp()
         self.cleanup_status.configure(text=result['message'])
@@ -505,6 +605,10 @@ class QuantumDeskGUI(ctk.CTk):
     def priority_boost(self):
         result = self.optimizer.priority_boost()
         self.perf_status.configure(text=result['message'])
+
+    def normal_mode(self):
+        result = self.optimizer.normal_mode()
+        self.perf_status.configure(text=result['message'])
     
     # Elite Tools Methods
     def auto_optimize(self):
@@ -512,6 +616,7 @@ class QuantumDeskGUI(ctk.CTk):
         result = self.optimizer.auto_optimize()
         self.elite_status.delete("1.0", "end")
         self.elite_status.insert("1.0", result['message'])
+        self._sync_watchdog_switch()
     
     def check_system_health(self):
         """Check comprehensive system health"""
@@ -545,41 +650,66 @@ System Status: {health['status'].upper()}
     
     def _elite_clean_thread(self):
         """Background thread for elite cleanup"""
-        operations = [
-            ("Memory Optimization", self.optimizer.optimize_memory),
-            ("Process Cleanup", self.optimizer.end_idle_apps),
-            ("Temp Files", self.optimizer.clean_temp),
-            ("Cache Clear", self.optimizer.clear_cache),
-            ("Prefetch Clear", self.optimizer.clear_prefetch),
-            ("Registry Clean", self.optimizer.clean_registry)
+        stages = [
+            PipelineStage("Memory Optimization", self.optimizer.optimize_memory, 'memory'),
+            PipelineStage("Process Cleanup", self.optimizer.end_idle_apps, 'process'),
+            PipelineStage("Temp Files", self.optimizer.clean_temp, 'disk', progress=True),
+            PipelineStage("Cache Clear", self.optimizer.clear_cache, 'disk', after=("Temp Files",), progress=True),
+            PipelineStage("Prefetch Clear", self.optimizer.clear_prefetch, 'disk', progress=True),
+            PipelineStage("Registry Clean", self.optimizer.clean_registry, 'system')
         ]
+        self._elite_progress = {stage.name: None for stage in stages}
+        self._elite_progress_scheduled = False
+        
+        def on_progress(event):
+            # Pipeline threads only record the event; the UI redraws on Tk's thread
+            self._elite_progress[event['stage']] = event
+            if not self._elite_progress_scheduled:
+                self._elite_progress_scheduled = True
+                self.after(100, self._show_elite_progress)
         
         results = []
-        for i, (name, operation) in enumerate(operations):
-            try:
-                result = operation()
-                status = "✅ COMPLETED" if result['status'] == 'success' else "❌ FAILED"
-                results.append(f"{name}: {status}")
-                
-                # Update progress
-                progress_text = f"🔥 ELITE CLEANUP IN PROGRESS...\n"
-                progress_text += f"Progress: {i+1}/{len(operations)}\n\n"
-                progress_text += "\n".join(results)
-                
-                self.elite_status.delete("1.0", "end")
-                self.elite_status.insert("1.0", progress_text)
-                
-                time.sleep(0.5)  # Small delay for visual effect
-            except Exception as e:
-                results.append(f"{name}: ❌ ERROR")
+        for name, result in self.optimizer.run_pipeline(stages, on_progress).items():
+            status = "✅ COMPLETED" if result.get('status') == 'success' else "❌ FAILED"
+            results.append(f"{name}: {status}")
         
         # Final results
         final_text = f"🔥 ELITE CLEANUP COMPLETED!\n\n"
         final_text += "\n".join(results)
         final_text += f"\n\n⚡ System optimized to elite performance levels!"
         
+        def show_final():
+            self._elite_progress = None
+            self.elite_status.delete("1.0", "end")
+            self.elite_status.insert("1.0", final_text)
+        self.after(0, show_final)
+    
+    def _show_elite_progress(self):
+        """Render the elite cleanup progress events"""
+        self._elite_progress_scheduled = False
+        progress = self._elite_progress
+        if progress is None:
+            return
+        finished = sum(1 for event in progress.values() if event and event['event'] == 'finished')
+        lines = []
+        for name, event in progress.items():
+            if event is None:
+                lines.append(f"{name}: waiting")
+            elif event['event'] == 'finished':
+                status = "✅ COMPLETED" if event['status'] == 'success' else "❌ FAILED"
+                lines.append(f"{name}: {status}")
+            elif event['files_seen'] or event['files_removed']:
+                lines.append(f"{name}: {event['files_removed']}/{event['files_seen']} files, "
+                             f"{event['bytes_freed'] // (1024 * 1024)}MB freed")
+            else:
+                lines.append(f"{name}: running")
+        
+        progress_text = f"🔥 ELITE CLEANUP IN PROGRESS...\n"
+        progress_text += f"Progress: {finished}/{len(progress)}\n\n"
+        progress_text += "\n".join(lines)
+        
         self.elite_status.delete("1.0", "end")
-        self.elite_status.insert("1.0", final_text)
+        self.elite_status.insert("1.0", progress_text)
 
     # Security Tools Methods - Using SecurityTools module
     def quick_malware_scan(self):
@@ -0,0 +1,82 @@
+"""
+QuantumDesk Refresh Policy
+Adaptive monitor refresh rate based on panel visibility and system load
+"""
+
+import psutil
+
+
+class AdaptiveRefreshPolicy:
+    """Pick the snapshot delivery interval and render frame rate for the monitor
+
+    The interval throttles the monitor's own subscription; the shared
+    sampler slows down with it unless another subscriber (the metrics log,
+    the watchdog) still needs a faster rate.
+
+    - Hidden panel or minimised window: slow heartbeat
+    - High system load or QuantumDesk itself busy: back off exponentially
+    - Panel shown again: jump straight back to the base rate
+    - Load back to normal: ramp back to the base rate step by step
+    """
+
+    def __init__(self, base_interval=0.5, base_fps=4, heartbeat_interval=5.0,
+                 max_interval=4.0, high_load=85.0, own_cpu_limit=10.0):
+        """
+        Initialize the refresh policy
+
+        Args:
+            base_interval: Delivery interval in seconds while visible and idle
+            base_fps: Render frame rate while visible and idle
+            heartbeat_interval: Delivery interval while hidden
+            max_interval: Longest interval used when backing off under load
+            high_load: System CPU percent above which the monitor backs off
+            own_cpu_limit: QuantumDesk CPU percent above which it backs off
+        """
+        self.base_interval = base_interval
+        self.base_fps = base_fps
+        self.heartbeat_interval = heartbeat_interval
+        self.max_interval = max_interval
+        self.high_load = high_load
+        self.own_cpu_limit = own_cpu_limit
+
+        self.interval = base_interval
+        self.visible = True
+        self._process = psutil.Process()
+        self._process.cpu_percent(interval=None)
+
+    def own_cpu_percent(self):
+        """CPU used by the QuantumDesk process since the previous call"""
+        try:
+            return self._process.cpu_percent(interval=None) / (psutil.cpu_count() or 1)
+        except psutil.Error:
+            return 0.0
+
+    def evaluate(self, visible, system_cpu=0.0, own_cpu=None):
+        """
+        Return (delivery interval seconds, render fps) for the current state
+
+        Args:
+            visible: True if the monitor panel is shown and not minimised
+            system_cpu: Latest overall CPU utilisation
+            own_cpu: QuantumDesk CPU utilisation (measured if None)
+        """
+        if not visible:
+            self.visible = False
+            self.interval = self.heartbeat_interval
+            return self.interval, 1.0 / self.heartbeat_interval
+
+        if not self.visible:
+            self.visible = True
+            self.interval = self.base_interval
+
+        if own_cpu is None:
+            own_cpu = self.own_cpu_percent()
+
+        if system_cpu >= self.high_load or own_cpu >= self.own_cpu_limit:
+            self.interval = min(self.max_interval, self.interval * 2)
+        else:
+            # Ramp up gradually, but never slower than the back-off ceiling
+            self.interval = max(self.base_interval, min(self.interval, self.max_interval) / 2)
+
+        fps = self.base_fps * self.base_interval / self.interval
+        return self.interval, max(fps, 1.0 / self.interval)
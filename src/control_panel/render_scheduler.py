@@ -0,0 +1,85 @@
+"""
+QuantumDesk Render Scheduler
+Moves sampler output onto the Tk event loop through a bounded queue
+"""
+
+import queue
+
+
+class RenderScheduler:
+    """Producer/consumer bridge between a sampler thread and Tk
+
+    Producers call push() from any thread. The consumer runs on the Tk
+    thread via widget.after(), drains everything queued since the previous
+    frame and hands it to the render callback in a single call. When
+    rendering falls behind, the oldest queued items are dropped.
+    """
+
+    def __init__(self, widget, render_callback, fps=4, maxsize=8):
+        """
+        Initialize the render scheduler
+
+        Args:
+            widget: Tk widget whose after() drives the render loop
+            render_callback: Called on the Tk thread with a list of items
+            fps: Render frames per second
+            maxsize: Items kept in the queue before the oldest are dropped
+                     (0 keeps every item)
+        """
+        self.widget = widget
+        self.render_callback = render_callback
+        self.fps = fps
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._after_id = None
+
+    @property
+    def frame_interval_ms(self):
+        """Milliseconds between render frames"""
+        return max(1, int(1000 / self.fps))
+
+    def set_fps(self, fps):
+        """Change the render frame rate (takes effect on the next frame)"""
+        self.fps = max(0.1, fps)
+
+    def push(self, item):
+        """Queue an item for rendering; safe to call from any thread"""
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def start(self):
+        """Start the render loop"""
+        if self._after_id is None:
+            self._after_id = self.widget.after(0, self._frame)
+
+    def stop(self):
+        """Stop the render loop"""
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _frame(self):
+        """Drain the queue and render once (runs on the Tk thread)"""
+        items = []
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if items:
+            try:
+                self.render_callback(items)
+            except Exception as e:
+                print(f"Render error: {e}")
+        self._after_id = self.widget.after(self.frame_interval_ms, self._frame)
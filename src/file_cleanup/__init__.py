@@ -0,0 +1,10 @@
+"""
+QuantumDesk File Cleanup Package
+Cleanup planning and parallel deletion shared by the System Optimizer and Security Tools
+"""
+
+from .cleanup_engine import CleanupEngine, CleanupStats, summarize
+from .cleanup_planner import CleanupPlan, CleanupPlanner, CleanupTarget, PlanCategory, PlanEntry
+
+__all__ = ['CleanupEngine', 'CleanupPlan', 'CleanupPlanner', 'CleanupStats', 'CleanupTarget', 'PlanCategory',
+           'PlanEntry', 'summarize']
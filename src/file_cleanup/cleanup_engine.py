@@ -0,0 +1,151 @@
+"""
+QuantumDesk Cleanup Engine
+Parallel, bounded file cleanup with per-category statistics
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .cleanup_planner import CleanupPlanner
+
+
+class CleanupStats:
+    """Counters for one cleanup category"""
+
+    __slots__ = ('files', 'bytes', 'skipped', 'errors', 'dirs_removed')
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.skipped = 0
+        self.errors = 0
+        self.dirs_removed = 0
+
+    def merge(self, other):
+        """Add the counters of another CleanupStats"""
+        for field in self.__slots__:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class CleanupEngine:
+    """Apply cleanup plans through a bounded worker pool
+
+    Plans come from a CleanupPlanner (one parallel os.scandir pass whose
+    stat results are reused for sizes). The planned files are deleted in
+    batches on a fixed number of worker threads with at most a few batches
+    queued at a time, so huge temp folders neither block on a single
+    thread nor flood memory with pending work. Directories emptied by the
+    cleanup are removed afterwards (the category roots are kept unless the
+    target asked for them to go too). A file whose size or mtime changed
+    since it was planned is skipped rather than deleted.
+    """
+
+    def __init__(self, max_workers=8, batch_size=256, log_callback=None, planner=None):
+        """
+        Initialize the cleanup engine
+
+        Args:
+            max_workers: Deletion worker threads
+            batch_size: Files deleted per worker task
+            log_callback: Function to call for logging messages
+            planner: CleanupPlanner used by clean() (a new one if None)
+        """
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.log_callback = log_callback
+        self.planner = planner or CleanupPlanner(max_workers)
+
+    def log(self, message):
+        """Log a message using the callback if available"""
+        if self.log_callback:
+            self.log_callback(message)
+
+    def plan(self, targets, progress=None):
+        """Dry run: return the CleanupPlan for targets without deleting"""
+        return self.planner.plan(targets, progress)
+
+    def clean(self, targets, remove_empty_dirs=True, progress=None):
+        """Plan and immediately execute a cleanup of targets"""
+        return self.execute(self.plan(targets, progress), remove_empty_dirs, progress)
+
+    def execute(self, plan, remove_empty_dirs=True, progress=None):
+        """
+        Delete the files of a plan
+
+        Args:
+            plan: CleanupPlan from plan()
+            remove_empty_dirs: Remove directories left empty
+            progress: Optional callback(files=removed, bytes=freed) per batch
+
+        Returns:
+            {category: CleanupStats}
+        """
+        results = {}
+        pending = threading.BoundedSemaphore(self.max_workers * 2)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Cleanup") as pool:
+            for name, category in plan.categories.items():
+                stats = results[name] = CleanupStats()
+                files = category.files
+                futures = []
+                for start in range(0, len(files), self.batch_size):
+                    pending.acquire()
+                    future = pool.submit(self._delete_batch, files[start:start + self.batch_size], progress)
+                    future.add_done_callback(lambda _: pending.release())
+                    futures.append(future)
+                for future in futures:
+                    stats.merge(future.result())
+
+                if remove_empty_dirs:
+                    stats.dirs_removed += self._remove_empty_dirs(category.directories + category.roots)
+
+        for name, stats in results.items():
+            self.log(f"{name}: {stats.files} files, {stats.bytes // (1024 * 1024)}MB freed, "
+                     f"{stats.skipped} skipped, {stats.errors} errors")
+        return results
+
+    @staticmethod
+    def _delete_batch(files, progress=None):
+        """Delete a batch of PlanEntry; returns CleanupStats"""
+        stats = CleanupStats()
+        for entry in files:
+            try:
+                info = os.stat(entry.path, follow_symlinks=False)
+                if info.st_mtime != entry.mtime or info.st_size != entry.size:
+                    # Written since it was planned: the file is in use
+                    stats.skipped += 1
+                    continue
+                os.remove(entry.path)
+                stats.files += 1
+                stats.bytes += entry.size
+            except (FileNotFoundError, PermissionError):
+                # Already gone, or locked by a running application
+                stats.skipped += 1
+            except OSError:
+                stats.errors += 1
+        if progress:
+            progress(files=stats.files, bytes=stats.bytes)
+        return stats
+
+    @staticmethod
+    def _remove_empty_dirs(directories):
+        """rmdir each directory (deepest first); returns how many were removed"""
+        removed = 0
+        for path in directories:
+            try:
+                os.rmdir(path)
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+def summarize(results):
+    """Return total CleanupStats over {category: CleanupStats}"""
+    total = CleanupStats()
+    for stats in results.values():
+        total.merge(stats)
+    return total
@@ -0,0 +1,247 @@
+"""
+QuantumDesk Cleanup Planner
+Parallel dry-run scans that build cacheable cleanup plans
+"""
+
+import os
+import stat
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# What to clean: a directory tree (or a single file) under a category,
+# optionally filtered by a RetentionPolicy
+CleanupTarget = namedtuple('CleanupTarget', ['category', 'path', 'recursive', 'remove_root', 'policy'],
+                           defaults=(True, False, None))
+
+# One file scheduled for deletion
+PlanEntry = namedtuple('PlanEntry', ['path', 'size', 'mtime', 'atime'])
+
+
+def _is_link(entry, info):
+    """True for symlinks and Windows reparse points such as junctions"""
+    if entry.is_symlink():
+        return True
+    return bool(getattr(info, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def _restat(entries):
+    """Return the PlanEntry list re-read from disk, without files that are gone"""
+    fresh = []
+    for entry in entries:
+        try:
+            info = os.stat(entry.path, follow_symlinks=False)
+        except OSError:
+            continue
+        fresh.append(PlanEntry(entry.path, info.st_size, info.st_mtime, info.st_atime))
+    return fresh
+
+
+class PlanCategory:
+    """Files and directories of one category in a cleanup plan"""
+
+    def __init__(self):
+        self.files = []
+        self.directories = []
+        self.roots = []
+        self.kept_files = 0
+        self.kept_bytes = 0
+
+    def add(self, entries, policy=None, now=None):
+        """Add scanned entries, keeping those the retention policy protects"""
+        if policy is not None:
+            entries, kept = policy.select(entries, now)
+            if entries:
+                # Listings are cached by directory mtime, which in-place edits
+                # do not change: judge the deletion candidates on fresh stats
+                entries, kept = policy.select(_restat(entries) + kept, now)
+            self.kept_files += len(kept)
+            self.kept_bytes += sum(entry.size for entry in kept)
+        self.files.extend(entries)
+
+    @property
+    def bytes(self):
+        return sum(entry.size for entry in self.files)
+
+    def summary(self, now):
+        """Return {'files', 'bytes', 'kept_files', 'kept_bytes', 'oldest_days', 'newest_days'}"""
+        ages = [now - entry.mtime for entry in self.files]
+        return {
+            'files': len(self.files),
+            'bytes': self.bytes,
+            'kept_files': self.kept_files,
+            'kept_bytes': self.kept_bytes,
+            'oldest_days': round(max(ages) / 86400, 1) if ages else 0,
+            'newest_days': round(min(ages) / 86400, 1) if ages else 0,
+        }
+
+
+class CleanupPlan:
+    """Result of a dry-run scan: what a cleanup would delete, by category"""
+
+    def __init__(self, created_at=None):
+        self.created_at = created_at or time.time()
+        self.categories = {}
+
+    def category(self, name):
+        """Return the PlanCategory for name, creating it if needed"""
+        if name not in self.categories:
+            self.categories[name] = PlanCategory()
+        return self.categories[name]
+
+    @property
+    def total_files(self):
+        return sum(len(category.files) for category in self.categories.values())
+
+    @property
+    def total_bytes(self):
+        return sum(category.bytes for category in self.categories.values())
+
+    def summary(self):
+        """Return {category: summary dict} for display"""
+        return {name: category.summary(self.created_at) for name, category in self.categories.items()}
+
+    def merge(self, other):
+        """Return a new plan with the categories of both plans, each file once"""
+        merged = CleanupPlan(min(self.created_at, other.created_at))
+        seen = set()
+        for plan in (self, other):
+            for name, category in plan.categories.items():
+                target = merged.category(name)
+                for entry in category.files:
+                    if entry.path not in seen:
+                        seen.add(entry.path)
+                        target.files.append(entry)
+                target.directories.extend(d for d in category.directories if d not in target.directories)
+                target.roots.extend(r for r in category.roots if r not in target.roots)
+                target.kept_files += category.kept_files
+                target.kept_bytes += category.kept_bytes
+        return merged
+
+
+class CleanupPlanner:
+    """Build cleanup plans with a parallel, mtime-cached directory scan
+
+    Every directory is listed on a worker pool with os.scandir. Listings
+    are cached with the directory's mtime: a re-scan stats each directory
+    once and only re-lists those whose mtime changed, so repeated dry runs
+    of large temp folders are nearly free. File sizes come from the cached
+    listing and are therefore estimates until the directory changes.
+    """
+
+    def __init__(self, max_workers=8):
+        """
+        Initialize the planner
+
+        Args:
+            max_workers: Directory scanning threads
+        """
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._listings = {}
+
+    def plan(self, targets, progress=None):
+        """
+        Scan targets and return a CleanupPlan
+
+        Args:
+            targets: Iterable of CleanupTarget or (category, path) tuples;
+                     missing paths are ignored and duplicates scanned once.
+                     A target inside another target's tree is specific-first:
+                     the outer scan skips it, so only its own policy applies.
+            progress: Optional callback(seen=files) called per listed directory
+        """
+        plan = CleanupPlan()
+        seen = set()
+        roots = []
+        for target in targets:
+            target = CleanupTarget(*target)
+            category = plan.category(target.category)
+            if not target.path or not os.path.lexists(target.path):
+                continue
+            key = os.path.normcase(os.path.realpath(target.path))
+            if key in seen:
+                continue
+            seen.add(key)
+            if os.path.isfile(target.path) and not os.path.islink(target.path):
+                info = os.stat(target.path)
+                entry = PlanEntry(target.path, info.st_size, info.st_mtime, info.st_atime)
+                category.add([entry], target.policy, plan.created_at)
+            elif os.path.isdir(target.path):
+                if target.remove_root:
+                    category.roots.append(target.path)
+                roots.append((target, category, []))
+
+        # Directories owned by a more specific target are left to that target
+        root_keys = {os.path.normcase(os.path.abspath(root[0].path)) for root in roots}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="CleanupScan") as pool:
+            pending = {}
+            for root in roots:
+                pending[pool.submit(self._list, root[0].path)] = root
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    target, category, collected = root = pending.pop(future)
+                    files, subdirectories = future.result()
+                    collected.extend(files)
+                    if progress and files:
+                        progress(seen=len(files))
+                    if target.recursive:
+                        for path in subdirectories:
+                            if os.path.normcase(os.path.abspath(path)) in root_keys:
+                                continue
+                            category.directories.append(path)
+                            pending[pool.submit(self._list, path)] = root
+
+        # Policies see each target's whole tree from the same stat pass
+        for target, category, collected in roots:
+            category.add(collected, target.policy, plan.created_at)
+
+        for category in plan.categories.values():
+            category.directories.sort(key=lambda path: path.count(os.sep), reverse=True)
+        return plan
+
+    def _list(self, directory):
+        """Return ([PlanEntry], [subdirectories]) of one directory, cached by mtime"""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return [], []
+        with self._lock:
+            cached = self._listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        files = []
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        info = entry.stat(follow_symlinks=False)
+                        if _is_link(entry, info):
+                            continue
+                        if stat.S_ISDIR(info.st_mode):
+                            subdirectories.append(entry.path)
+                        elif stat.S_ISREG(info.st_mode):
+                            files.append(PlanEntry(entry.path, info.st_size, info.st_mtime, info.st_atime))
+                    except OSError:
+                        continue
+        except OSError:
+            return [], []
+
+        with self._lock:
+            self._listings[directory] = (mtime, files, subdirectories)
+        return files, subdirectories
+
+    def invalidate(self, path=None):
+        """Forget cached listings below path (all listings if None)"""
+        with self._lock:
+            if path is None:
+                self._listings.clear()
+                return
+            prefix = os.path.join(path, '')
+            for key in [k for k in self._listings if k == path or k.startswith(prefix)]:
+                del self._listings[key]
@@ -16,6 +16,7 @@ from pathlib import Path
 import re
 import shutil
 import tempfile
+from file_cleanup import CleanupEngine, CleanupTarget
 
 class SecurityTools:
     """Elite Security Tools with advanced Windows security and privacy features"""
@@ -31,6 +32,7 @@ class SecurityTools:
         self.security_scan_running = False
         self.quarantine_folder = Path.home() / "QuantumDesk_Quarantine"
         self.quarantine_folder.mkdir(exist_ok=True)
+        self.cleanup = CleanupEngine(log_callback=log_callback)
         
         # Known malicious file patterns
         self.malicious_patterns = [
@@ -234,104 +236,49 @@ class SecurityTools:
     # PRIVACY PROTECTION
     # ======================
     
-    def clear_browser_data(self):
-        """Clear browser data for privacy protection"""
+    def _browser_data_targets(self):
+        """Return the CleanupTarget list of browser history, cookies and caches"""
+        targets = []
+        
+        # Chrome data locations
+        for name in ("History", "Cookies", "Cache", "Web Data"):
+            path = os.path.expanduser(rf"~\AppData\Local\Google\Chrome\User Data\Default\{name}")
+            targets.append(CleanupTarget('Chrome', path, remove_root=True))
+        
+        # Edge data locations
+        for name in ("History", "Cookies", "Cache"):
+            path = os.path.expanduser(rf"~\AppData\Local\Microsoft\Edge\User Data\Default\{name}")
+            targets.append(CleanupTarget('Edge', path, remove_root=True))
+        
+        # Firefox data locations (every profile)
+        firefox_profile_path = os.path.expanduser(r"~\AppData\Roaming\Mozilla\Firefox\Profiles")
+        if os.path.exists(firefox_profile_path):
+            for profile_dir in os.listdir(firefox_profile_path):
+                profile_path = os.path.join(firefox_profile_path, profile_dir)
+                if os.path.isdir(profile_path):
+                    for name in ('places.sqlite', 'cookies.sqlite', 'cache2'):
+                        targets.append(CleanupTarget('Firefox', os.path.join(profile_path, name), remove_root=True))
+        
+        return targets
+    
+    def clear_browser_data(self, dry_run=False):
+        """
+        Clear browser data for privacy protection
+        
+        Args:
+            dry_run: Only plan the cleanup and report what would be removed
+        """
         try:
-            browsers_cleaned = []
-            total_size_cleared = 0
-            
-            # Chrome data locations
-            chrome_paths = [
-                os.path.expanduser(r"~\AppData\Local\Google\Chrome\User Data\Default\History"),
-                os.path.expanduser(r"~\AppData\Local\Google\Chrome\User Data\Default\Cookies"),
-                os.path.expanduser(r"~\AppData\Local\Google\Chrome\User Data\Default\Cache"),
-                os.path.expanduser(r"~\AppData\Local\Google\Chrome\User Data\Default\Web Data"),
-            ]
-            
-            # Firefox data locations
-            firefox_profile_path = os.path.expanduser(r"~\AppData\Roaming\Mozilla\Firefox\Profiles")
-            
-            # Edge data locations
-            edge_paths = [
-                os.path.expanduser(r"~\AppData\Local\Microsoft\Edge\User Data\Default\History"),
-                os.path.expanduser(r"~\AppData\Local\Microsoft\Edge\User Data\Default\Cookies"),
-                os.path.expanduser(r"~\AppData\Local\Microsoft\Edge\User Data\Default\Cache"),
-            ]
+            plan = self.cleanup.plan(self._browser_data_targets())
+            if dry_run:
+                size_mb = plan.total_bytes // (1024 * 1024)
+                result_text = f"Browser data: {plan.total_files} files can be cleared ({size_mb}MB)"
+                return {"status": "success", "message": result_text, "plan": plan.summary()}
             
-            # Clean Chrome
-            chrome_cleaned = 0
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    try:
-                        if os.path.isfile(path):
-                            size = os.path.getsize(path)
-                            os.remove(path)
-                            total_size_cleared += size
-                            chrome_cleaned += 1
-                        elif os.path.isdir(path):
-                            size = sum(os.path.getsize(os.path.join(dirpath, filename))
-                                     for dirpath, dirnames, filenames in os.walk(path)
-                                     for filename in filenames)
-                            shutil.rmtree(path)
-                            total_size_cleared += size
-                            chrome_cleaned += 1
-                    except:
-                        pass
-            
-            if chrome_cleaned > 0:
-                browsers_cleaned.append(f"Chrome ({chrome_cleaned} items)")
-            
-            # Clean Edge
-            edge_cleaned = 0
-            for path in edge_paths:
-                if os.path.exists(path):
-                    try:
-                        if os.path.isfile(path):
-                            size = os.path.getsize(path)
-                            os.remove(path)
-                            total_size_cleared += size
-                            edge_cleaned += 1
-                        elif os.path.isdir(path):
-                            size = sum(os.path.getsize(os.path.join(dirpath, filename))
-                                     for dirpath, dirnames, filenames in os.walk(path)
-                                     for filename in filenames)
-                            shutil.rmtree(path)
-                            total_size_cleared += size
-                            edge_cleaned += 1
-                    except:
-                        pass
-            
-            if edge_cleaned > 0:
-                browsers_cleaned.append(f"Edge ({edge_cleaned} items)")
-            
-            # Clean Firefox
-            if os.path.exists(firefox_profile_path):
-                firefox_cleaned = 0
-                for profile_dir in os.listdir(firefox_profile_path):
-                    profile_path = os.path.join(firefox_profile_path, profile_dir)
-                    if os.path.isdir(profile_path):
-                        firefox_files = ['places.sqlite', 'cookies.sqlite', 'cache2']
-                        for file in firefox_files:
-                            file_path = os.path.join(profile_path, file)
-                            if os.path.exists(file_path):
-                                try:
-                                    if os.path.isfile(file_path):
-                                        size = os.path.getsize(file_path)
-                                        os.remove(file_path)
-                                        total_size_cleared += size
-                                        firefox_cleaned += 1
-                                    elif os.path.isdir(file_path):
-                                        size = sum(os.path.getsize(os.path.join(dirpath, filename))
-                                                 for dirpath, dirnames, filenames in os.walk(file_path)
-                                                 for filename in filenames)
-                                        shutil.rmtree(file_path)
-                                        total_size_cleared += size
-                                        firefox_cleaned += 1
-                                except:
-                                    pass
-                
-                if firefox_cleaned > 0:
-                    browsers_cleaned.append(f"Firefox ({firefox_cleaned} items)")
+            results = self.cleanup.execute(plan)
+            browsers_cleaned = [f"{browser} ({stats.files} items)"
+                                for browser, stats in results.items() if stats.files > 0]
+            total_size_cleared = sum(stats.bytes for stats in results.values())
             
             size_mb = total_size_cleared // (1024 * 1024)
             result_text = f"BROWSER DATA CLEARED\n"
@@ -340,7 +287,8 @@ class SecurityTools:
             result_text += f"Privacy Enhanced: History, Cookies, Cache cleared"
             
             self.log(f"Browser data cleared: {size_mb}MB from {len(browsers_cleaned)} browsers")
-            return {"status": "success", "message": result_text}
+            return {"status": "success", "message": result_text,
+                    "categories": {name: stats.as_dict() for name, stats in results.items()}}
         except Exception as e:
             self.log(f"Browser data clear error: {str(e)}")
             return {"status": "error", "message": f"Browser cleanup failed: {str(e)}"}
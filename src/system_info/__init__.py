@@ -0,0 +1,17 @@
+"""
+QuantumDesk System Information Package
+Elite system information and hardware intelligence for Windows
+"""
+
+from .system_info import EliteSystemInfo
+from .report_diff import ReportDiffer, ReportIndex
+from .report_export import ReportWriter, read_report
+from .software_inventory import FakeRegistryBackend, SoftwareInventory, WinregBackend
+from .wmi_query import StaticWmiProvider, WmiProvider, WmiQueryExecutor
+
+__all__ = [
+    'EliteSystemInfo',
+    'ReportDiffer', 'ReportIndex', 'ReportWriter', 'read_report',
+    'FakeRegistryBackend', 'SoftwareInventory', 'WinregBackend',
+    'StaticWmiProvider', 'WmiProvider', 'WmiQueryExecutor',
+]
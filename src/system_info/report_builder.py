@@ -0,0 +1,129 @@
+"""
+QuantumDesk Report Builder
+Runs system report collectors concurrently and streams finished sections
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+
+class ReportBuilder:
+    """Concurrent report builder with per-section timeouts
+
+    Every section collector runs on a pool of daemon worker threads.
+    Sections are yielded in completion order, so one slow collector (e.g. a
+    stuck WMI call) only delays its own section; when it exceeds its timeout
+    an error entry is emitted in its place and the rest of the report is not
+    held up. An abandoned collector keeps its thread until it returns, but
+    never keeps the interpreter from exiting.
+    """
+
+    def __init__(self, sections, default_timeout=15, timeouts=None, max_workers=None):
+        """
+        Initialize the report builder
+
+        Args:
+            sections: Iterable of (section name, zero-argument callable)
+            default_timeout: Seconds a section may take before it is abandoned
+            timeouts: {section name: seconds} overriding default_timeout
+            max_workers: Worker threads (one per section when None)
+        """
+        self.sections = list(sections)
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts or {}
+        self.max_workers = max_workers or max(1, len(self.sections))
+
+    def stream(self, on_section=None):
+        """
+        Yield (section name, result) pairs as sections finish
+
+        Args:
+            on_section: Optional callback(section name, result) invoked for
+                        every finished, failed or timed out section
+        """
+        started = time.monotonic()
+        work = queue.SimpleQueue()
+        deadlines = {}
+        pending = {}
+        for name, collector in self.sections:
+            future = Future()
+            work.put((future, collector))
+            pending[future] = name
+            deadlines[future] = started + self.timeouts.get(name, self.default_timeout)
+        for index in range(min(self.max_workers, len(pending))):
+            threading.Thread(target=self._worker, args=(work,), name=f"ReportSection_{index}",
+                             daemon=True).start()
+
+        try:
+            while pending:
+                next_deadline = min(deadlines[f] for f in pending)
+                done, _ = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+
+                finished = []
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'error': f"Failed to collect {name}: {e}"}
+                    finished.append((name, result))
+
+                now = time.monotonic()
+                for future in [f for f in pending if deadlines[f] <= now]:
+                    name = pending.pop(future)
+                    future.cancel()
+                    timeout = self.timeouts.get(name, self.default_timeout)
+                    finished.append((name, {'error': f"Timed out collecting {name} after {timeout}s"}))
+
+                for name, result in finished:
+                    if on_section:
+                        on_section(name, result)
+                    yield name, result
+        finally:
+            # Sections not started yet are skipped; running ones are abandoned
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def _worker(work):
+        """Run queued collectors until none is left (daemon thread)"""
+        while True:
+            try:
+                future, collector = work.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(collector())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def build(self, on_section=None):
+        """Collect every section and return them as a dict in declaration order"""
+        results = dict(self.stream(on_section))
+        return {name: results.get(name) for name, _ in self.sections}
+
+    async def astream(self):
+        """Async iterator over (section name, result) pairs"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+
+        def produce():
+            try:
+                for item in self.stream():
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        loop.run_in_executor(None, produce)
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            yield item
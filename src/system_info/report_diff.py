@@ -0,0 +1,272 @@
+"""
+QuantumDesk Report Diff
+Delta reports between two system reports using stable keys and hashing
+"""
+
+import copy
+import hashlib
+import json
+
+# Placeholders the collectors use for values WMI did not report
+MISSING_VALUES = {'', 'unknown', 'none', 'n/a'}
+
+
+def _disk_key(item, position):
+    """Serial number, or position and model when the serial is missing"""
+    serial = str(item.get('serial_number') or '').strip()
+    if serial.lower() not in MISSING_VALUES:
+        return f"serial:{serial}"
+    return f"{position}|{item.get('model')}"
+
+
+# Stable identity of list items, by path of the list inside the report.
+# Key functions get the item and its position among the list's dict items;
+# repeated keys (two identical GPUs) get an occurrence suffix, see _keyed.
+LIST_KEYS = {
+    ('top_processes',): lambda item, _: f"{item.get('name')}|{item.get('pid')}",
+    ('services',): lambda item, _: item.get('name'),
+    # The inventory lists side-by-side versions of one product separately
+    ('installed_software',): lambda item, _: f"{item.get('name')}|{item.get('version')}",
+    ('startup_programs',): lambda item, _: f"{item.get('location')}|{item.get('name')}",
+    ('network_info', 'connections'): lambda item, _: f"{item.get('local_address')}|{item.get('remote_address')}|{item.get('pid')}",
+    ('gpu_info',): lambda item, _: item.get('name'),
+    ('memory_info', 'memory_modules'): lambda item, _: item.get('location'),
+    ('disk_info', 'physical_disks'): _disk_key,
+}
+
+# Fields that change on every report and carry no state
+IGNORED_PATHS = {
+    ('generated_at',),
+    ('system_overview', 'current_time'),
+    ('system_overview', 'uptime'),
+    ('system_performance',),
+    ('performance_history',),
+}
+
+
+def content_hash(value):
+    """Stable hash of a JSON-compatible value"""
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ReportIndex:
+    """Per-section and per-item hashes of a report
+
+    Building the index costs one pass over the report. Keeping the index of
+    a baseline lets later diffs skip every unchanged section or list item
+    by comparing two digests instead of walking the subtree.
+    """
+
+    def __init__(self, report, list_keys=LIST_KEYS, ignored=IGNORED_PATHS):
+        """
+        Initialize the index
+
+        Args:
+            report: System report dict
+            list_keys: {path tuple: key(item, position)} for keyed lists
+            ignored: Paths excluded from hashing and diffing
+        """
+        self.report = report
+        self.list_keys = list_keys
+        self.ignored = ignored
+        self.sections = {}
+        self.items = {}
+        for name, value in report.items():
+            if (name,) in ignored:
+                continue
+            self.sections[name] = content_hash(_strip_ignored((name,), value, ignored))
+            self._index_lists((name,), value)
+
+    def _index_lists(self, path, value):
+        if isinstance(value, list) and path in self.list_keys:
+            self.items[path] = {key: content_hash(item) for key, item in _keyed(self.list_keys[path], value)}
+        elif isinstance(value, dict):
+            for key, child in value.items():
+                child_path = path + (key,)
+                if child_path in self.list_keys:
+                    self._index_lists(child_path, child)
+
+
+class ReportDiffer:
+    """Compute and apply deltas between system reports"""
+
+    def __init__(self, list_keys=LIST_KEYS, ignored=IGNORED_PATHS):
+        """
+        Initialize the differ
+
+        Args:
+            list_keys: {path tuple: key(item, position)} for keyed lists
+            ignored: Paths excluded from diffing
+        """
+        self.list_keys = list_keys
+        self.ignored = ignored
+
+    def index(self, report):
+        """Build a ReportIndex with this differ's settings"""
+        return ReportIndex(report, self.list_keys, self.ignored)
+
+    def diff(self, base, target, base_index=None, target_index=None):
+        """
+        Return only what changed from base to target
+
+        Args:
+            base: Baseline report dict (or its ReportIndex)
+            target: New report dict (or its ReportIndex)
+
+        Returns:
+            {'base_hash', 'target_hash', 'sections': {name: delta}} where a
+            delta is {'added': {...}, 'removed': [...], 'changed': {...}} for
+            dicts and keyed lists (plus 'order': [keys] when a keyed list
+            was reordered), {'old': ..., 'new': ...} for values, or
+            {'section_added': ...} / {'section_removed': True}.
+        """
+        if isinstance(base, ReportIndex):
+            base_index, base = base, base.report
+        if isinstance(target, ReportIndex):
+            target_index, target = target, target.report
+        base_index = base_index or self.index(base)
+        target_index = target_index or self.index(target)
+
+        sections = {}
+        for name in sorted(set(base_index.sections) | set(target_index.sections)):
+            old_hash = base_index.sections.get(name)
+            new_hash = target_index.sections.get(name)
+            if old_hash == new_hash:
+                continue
+            if old_hash is None:
+                sections[name] = {'section_added': target[name]}
+            elif new_hash is None:
+                sections[name] = {'section_removed': True}
+            else:
+                delta = self._diff_value((name,), base[name], target[name], base_index, target_index)
+                if delta is not None:
+                    sections[name] = delta
+
+        return {
+            'base_hash': content_hash(base_index.sections),
+            'target_hash': content_hash(target_index.sections),
+            'sections': sections,
+        }
+
+    def _diff_value(self, path, old, new, base_index, target_index):
+        if path in self.ignored:
+            return None
+        if isinstance(old, list) and isinstance(new, list) and path in self.list_keys:
+            return self._diff_keyed_list(path, old, new, base_index, target_index)
+        if isinstance(old, dict) and isinstance(new, dict):
+            added = {k: v for k, v in new.items() if k not in old and path + (k,) not in self.ignored}
+            removed = [k for k in old if k not in new and path + (k,) not in self.ignored]
+            changed = {}
+            for key in sorted(old.keys() & new.keys(), key=str):
+                if old[key] == new[key]:
+                    continue
+                delta = self._diff_value(path + (key,), old[key], new[key], base_index, target_index)
+                if delta is not None:
+                    changed[key] = delta
+            if not (added or removed or changed):
+                return None
+            return _compact({'added': added, 'removed': removed, 'changed': changed})
+        if old == new:
+            return None
+        return {'old': old, 'new': new}
+
+    def _diff_keyed_list(self, path, old, new, base_index, target_index):
+        old_items = dict(_keyed(self.list_keys[path], old))
+        new_items = dict(_keyed(self.list_keys[path], new))
+        old_hashes = base_index.items.get(path, {})
+        new_hashes = target_index.items.get(path, {})
+
+        added = {k: v for k, v in new_items.items() if k not in old_items}
+        removed = [k for k in old_items if k not in new_items]
+        changed = {}
+        for key in sorted(old_items.keys() & new_items.keys()):
+            old_hash = old_hashes.get(key)
+            if old_hash is not None and old_hash == new_hashes.get(key):
+                continue
+            delta = self._diff_value(path + (key,), old_items[key], new_items[key], base_index, target_index)
+            if delta is not None:
+                changed[key] = delta
+        # apply() keeps the base order and appends additions; record anything else
+        rebuilt = [k for k in old_items if k in new_items] + list(added)
+        order = list(new_items) if rebuilt != list(new_items) else []
+        if not (added or removed or changed or order):
+            return None
+        return _compact({'added': added, 'removed': removed, 'changed': changed, 'order': order, 'keyed': True})
+
+    def apply(self, base, delta):
+        """Rebuild the target report from a base report and a delta"""
+        result = copy.deepcopy(base)
+        for name, section_delta in delta['sections'].items():
+            if 'section_added' in section_delta:
+                result[name] = copy.deepcopy(section_delta['section_added'])
+            elif 'section_removed' in section_delta:
+                result.pop(name, None)
+            else:
+                result[name] = self._apply_value((name,), result.get(name), section_delta)
+        return result
+
+    def _apply_value(self, path, value, delta):
+        if 'new' in delta:
+            return copy.deepcopy(delta['new'])
+        if delta.get('keyed'):
+            removed = set(delta.get('removed', []))
+            changed = delta.get('changed', {})
+            items = {}
+            for key, item in _keyed(self.list_keys[path], value):
+                if key in removed:
+                    continue
+                if key in changed:
+                    item = self._apply_value(path + (key,), item, changed[key])
+                items[key] = item
+            items.update((k, copy.deepcopy(v)) for k, v in delta.get('added', {}).items())
+            if 'order' in delta:
+                return [items[key] for key in delta['order']]
+            return list(items.values())
+        value = dict(value)
+        for key in delta.get('removed', []):
+            value.pop(key, None)
+        for key, sub_delta in delta.get('changed', {}).items():
+            value[key] = self._apply_value(path + (key,), value.get(key), sub_delta)
+        for key, item in delta.get('added', {}).items():
+            value[key] = copy.deepcopy(item)
+        return value
+
+
+def _keyed(key_fn, items):
+    """
+    Return [(key, item)] for the dict items of a keyed list
+
+    Keys are unique: the second and later items with the same key get
+    '#2', '#3', ... appended, so identical items are never merged.
+    """
+    items = [item for item in items if isinstance(item, dict)]
+    counts = {}
+    used = set()
+    keyed = []
+    for position, item in enumerate(items):
+        base = key = str(key_fn(item, position))
+        while key in used:
+            counts[base] = counts.get(base, 1) + 1
+            key = f"{base}#{counts[base]}"
+        used.add(key)
+        keyed.append((key, item))
+    return keyed
+
+
+def _strip_ignored(path, value, ignored):
+    """Return value without the ignored paths below it (for hashing)"""
+    if not isinstance(value, dict) or not any(p[:len(path)] == path and len(p) > len(path) for p in ignored):
+        return value
+    return {k: _strip_ignored(path + (k,), v, ignored)
+            for k, v in value.items() if path + (k,) not in ignored}
+
+
+def _compact(delta):
+    """Drop empty parts of a delta"""
+    return {k: v for k, v in delta.items() if v}
+
+
+def diff_reports(base, target):
+    """Convenience wrapper returning ReportDiffer().diff(base, target)"""
+    return ReportDiffer().diff(base, target)
@@ -0,0 +1,194 @@
+"""
+QuantumDesk Report Export
+Streaming, optionally compressed system report writers and reader
+"""
+
+import bz2
+import gzip
+import itertools
+import json
+import lzma
+import os
+import struct
+
+FORMATS = ('json', 'jsonl', 'binary')
+
+# compression name -> (opener, file suffix)
+COMPRESSION = {
+    None: (open, ''),
+    'gzip': (gzip.open, '.gz'),
+    'bz2': (bz2.open, '.bz2'),
+    'xz': (lzma.open, '.xz'),
+}
+
+FORMAT_SUFFIX = {'json': '.json', 'jsonl': '.jsonl', 'binary': '.qdr'}
+
+# Binary format: magic + version, then per section
+# <H name length><name utf-8><I payload length><compact JSON payload utf-8>
+BINARY_MAGIC = b'QDRP\x01'
+_NAME_HEADER = struct.Struct('<H')
+_PAYLOAD_HEADER = struct.Struct('<I')
+
+# First line of a jsonl report; the section lines follow
+JSONL_MARKER = b'{"format":"quantumdesk-report","version":1}'
+
+
+def _dumps(value, indent=None):
+    separators = (',', ': ') if indent else (',', ':')
+    return json.dumps(value, indent=indent, separators=separators, ensure_ascii=False, default=str)
+
+
+def report_filename(base, fmt='json', compression=None):
+    """Return base with the suffix matching format and compression"""
+    return f"{base}{FORMAT_SUFFIX[fmt]}{COMPRESSION[compression][1]}"
+
+
+def _suffix_format(filename):
+    """Format named by the file suffix (compression suffix ignored), or None"""
+    name = os.fspath(filename).lower()
+    for _, suffix in COMPRESSION.values():
+        if suffix and name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    for fmt, suffix in FORMAT_SUFFIX.items():
+        if name.endswith(suffix):
+            return fmt
+    return None
+
+
+def _detect_compression(path):
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    if head.startswith(b'\x1f\x8b'):
+        return 'gzip'
+    if head.startswith(b'BZh'):
+        return 'bz2'
+    if head.startswith(b'\xfd7zXZ\x00'):
+        return 'xz'
+    return None
+
+
+class ReportWriter:
+    """Write report sections to a file one at a time
+
+    Sections are encoded and written as soon as they are added, so the full
+    report never has to be held in memory as one serialised document.
+    """
+
+    def __init__(self, filename, fmt='json', compression=None, indent=None):
+        """
+        Initialize the writer
+
+        Args:
+            filename: Output path
+            fmt: 'json' (one object), 'jsonl' (one line per section) or
+                 'binary' (length-prefixed sections)
+            compression: None, 'gzip', 'bz2' or 'xz'
+            indent: JSON indentation for the 'json' format (compact if None)
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown report format: {fmt}")
+        if compression not in COMPRESSION:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.filename = filename
+        self.fmt = fmt
+        self.indent = indent if fmt == 'json' else None
+        self.sections = 0
+        opener = COMPRESSION[compression][0]
+        self._file = opener(filename, 'wb')
+        if fmt == 'json':
+            self._file.write(b'{')
+        elif fmt == 'jsonl':
+            self._file.write(JSONL_MARKER + b'\n')
+        elif fmt == 'binary':
+            self._file.write(BINARY_MAGIC)
+
+    def write_section(self, name, data):
+        """Encode and write one section"""
+        if self.fmt == 'json':
+            prefix = ',' if self.sections else ''
+            if self.indent:
+                body = _dumps(data, self.indent).replace('\n', '\n' + ' ' * self.indent)
+                chunk = f"{prefix}\n{' ' * self.indent}{json.dumps(name)}: {body}"
+            else:
+                chunk = f"{prefix}{json.dumps(name)}:{_dumps(data)}"
+            self._file.write(chunk.encode('utf-8'))
+        elif self.fmt == 'jsonl':
+            line = _dumps({'section': name, 'data': data}) + '\n'
+            self._file.write(line.encode('utf-8'))
+        else:
+            name_bytes = name.encode('utf-8')
+            payload = _dumps(data).encode('utf-8')
+            self._file.write(_NAME_HEADER.pack(len(name_bytes)))
+            self._file.write(name_bytes)
+            self._file.write(_PAYLOAD_HEADER.pack(len(payload)))
+            self._file.write(payload)
+        self.sections += 1
+
+    def close(self):
+        """Finish the document and close the file"""
+        if self._file is None:
+            return
+        if self.fmt == 'json':
+            self._file.write(b'\n}\n' if self.indent else b'}\n')
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_report(sections, filename, fmt='json', compression=None, indent=None):
+    """Stream (name, data) pairs into a report file; returns the section count"""
+    with ReportWriter(filename, fmt, compression, indent) as writer:
+        for name, data in sections:
+            writer.write_section(name, data)
+        return writer.sections
+
+
+def iter_report(filename, sections=None):
+    """
+    Yield (name, data) pairs from a report written by ReportWriter
+
+    Compression is detected from the file contents, the format from the
+    binary magic or jsonl marker line (or a .jsonl suffix for jsonl files
+    without the marker). For the binary format, sections not listed in
+    `sections` are skipped without being decoded.
+    """
+    opener = COMPRESSION[_detect_compression(filename)][0]
+    wanted = set(sections) if sections else None
+    with opener(filename, 'rb') as f:
+        head = f.read(len(BINARY_MAGIC))
+        if head == BINARY_MAGIC:
+            while True:
+                header = f.read(_NAME_HEADER.size)
+                if not header:
+                    break
+                name = f.read(_NAME_HEADER.unpack(header)[0]).decode('utf-8')
+                size = _PAYLOAD_HEADER.unpack(f.read(_PAYLOAD_HEADER.size))[0]
+                if wanted is not None and name not in wanted:
+                    f.seek(size, 1)
+                    continue
+                yield name, json.loads(f.read(size).decode('utf-8'))
+            return
+
+        first = head + f.readline()
+        if first.strip() == JSONL_MARKER or _suffix_format(filename) == 'jsonl':
+            lines = f if first.strip() == JSONL_MARKER else itertools.chain([first], f)
+            for line in lines:
+                if line.strip():
+                    record = json.loads(line)
+                    if wanted is None or record['section'] in wanted:
+                        yield record['section'], record['data']
+        else:
+            for name, data in json.loads(first + f.read()).items():
+                if wanted is None or name in wanted:
+                    yield name, data
+
+
+def read_report(filename, sections=None):
+    """Read a report written by ReportWriter back into a dict"""
+    return dict(iter_report(filename, sections))
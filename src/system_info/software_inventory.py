@@ -0,0 +1,180 @@
+"""
+QuantumDesk Software Inventory
+Fast installed-software inventory read from the registry Uninstall keys
+"""
+
+import threading
+
+# (hive, key path, view label) of every Uninstall location
+UNINSTALL_LOCATIONS = (
+    ('HKLM', r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall", '64-bit'),
+    ('HKLM', r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall", '32-bit'),
+    ('HKCU', r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall", 'user'),
+)
+
+
+class WinregBackend:
+    """Registry backend using the Windows winreg module"""
+
+    def __init__(self):
+        """Initialize the backend (raises ImportError off Windows)"""
+        import winreg
+        self._winreg = winreg
+        self._hives = {
+            'HKLM': winreg.HKEY_LOCAL_MACHINE,
+            'HKCU': winreg.HKEY_CURRENT_USER,
+        }
+
+    def subkeys(self, hive, path):
+        """Return [(name, last_write_time)] for the subkeys of a key"""
+        winreg = self._winreg
+        result = []
+        try:
+            key = winreg.OpenKey(self._hives[hive], path)
+        except OSError:
+            return result
+        with key:
+            count = winreg.QueryInfoKey(key)[0]
+            for i in range(count):
+                try:
+                    name = winreg.EnumKey(key, i)
+                    with winreg.OpenKey(key, name) as subkey:
+                        result.append((name, winreg.QueryInfoKey(subkey)[2]))
+                except OSError:
+                    continue
+        return result
+
+    def values(self, hive, path):
+        """Return {value name: data} for a key"""
+        winreg = self._winreg
+        values = {}
+        try:
+            key = winreg.OpenKey(self._hives[hive], path)
+        except OSError:
+            return values
+        with key:
+            count = winreg.QueryInfoKey(key)[1]
+            for i in range(count):
+                try:
+                    name, data, _ = winreg.EnumValue(key, i)
+                    values[name] = data
+                except OSError:
+                    continue
+        return values
+
+
+class FakeRegistryBackend:
+    """In-memory registry backend for tests and non-Windows hosts"""
+
+    def __init__(self, keys=None):
+        """
+        Initialize the fake registry
+
+        Args:
+            keys: {(hive, full key path): {'last_write': int, 'values': {...}}}
+        """
+        self.keys = keys or {}
+        self.value_reads = 0
+
+    def set_key(self, hive, path, values, last_write):
+        """Create or replace a key"""
+        self.keys[(hive, path)] = {'last_write': last_write, 'values': dict(values)}
+
+    def delete_key(self, hive, path):
+        """Remove a key"""
+        self.keys.pop((hive, path), None)
+
+    def subkeys(self, hive, path):
+        """Return [(name, last_write_time)] for the subkeys of a key"""
+        prefix = path + '\\'
+        return [(key_path[len(prefix):], data['last_write'])
+                for (key_hive, key_path), data in self.keys.items()
+                if key_hive == hive and key_path.startswith(prefix) and '\\' not in key_path[len(prefix):]]
+
+    def values(self, hive, path):
+        """Return {value name: data} for a key"""
+        self.value_reads += 1
+        return dict(self.keys.get((hive, path), {}).get('values', {}))
+
+
+class SoftwareInventory:
+    """Incremental software inventory keyed by registry last-write time
+
+    Each Uninstall subkey is re-read only when its last-write time changed
+    since the previous scan; unchanged entries are served from the cache.
+    """
+
+    def __init__(self, backend, locations=UNINSTALL_LOCATIONS):
+        """
+        Initialize the inventory
+
+        Args:
+            backend: Object with subkeys(hive, path) and values(hive, path)
+            locations: Iterable of (hive, Uninstall key path, view label)
+        """
+        self.backend = backend
+        self.locations = tuple(locations)
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def scan(self):
+        """Return the installed software as a list of dicts"""
+        with self._lock:
+            seen = set()
+            software = []
+            unique = set()
+            for hive, path, view in self.locations:
+                for name, last_write in self.backend.subkeys(hive, path):
+                    cache_key = (hive, path, name)
+                    seen.add(cache_key)
+                    cached = self._cache.get(cache_key)
+                    if cached is None or cached[0] != last_write:
+                        values = self.backend.values(hive, f"{path}\\{name}")
+                        cached = (last_write, self._to_record(values, hive, view))
+                        self._cache[cache_key] = cached
+                    record = cached[1]
+                    if record is None:
+                        continue
+                    identity = (record['name'], record['version'])
+                    if identity in unique:
+                        continue
+                    unique.add(identity)
+                    software.append(dict(record))
+
+            # Forget uninstalled entries
+            for cache_key in set(self._cache) - seen:
+                del self._cache[cache_key]
+
+            software.sort(key=lambda item: item['name'].lower())
+            return software
+
+    def invalidate(self):
+        """Drop the cache so the next scan re-reads every entry"""
+        with self._lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _to_record(values, hive, view):
+        """Convert Uninstall key values to an inventory record (None to skip)"""
+        name = values.get('DisplayName')
+        if not name:
+            return None
+        # Hide system components and updates listed under their parent product
+        if values.get('SystemComponent') == 1 or values.get('ParentKeyName'):
+            return None
+        return {
+            'name': str(name).strip(),
+            'version': values.get('DisplayVersion'),
+            'vendor': values.get('Publisher'),
+            'install_date': values.get('InstallDate'),
+            'install_location': values.get('InstallLocation'),
+            'source': f"{hive} ({view})"
+        }
+
+
+def create_default_inventory():
+    """Return an inventory backed by winreg, or None off Windows"""
+    try:
+        return SoftwareInventory(WinregBackend())
+    except ImportError:
+        return None
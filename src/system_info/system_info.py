@@ -5,8 +5,6 @@ Provides comprehensive system information, hardware details, and real-time monit
 
 import psutil
 import platform
-import cpuinfo
-import GPUtil
 import socket
 import uuid
 import subprocess
@@ -15,23 +13,86 @@ import time
 import threading
 from datetime import datetime, timedelta
 import os
-import wmi
-import winreg
-from collections import defaultdict
+from pathlib import Path
+# Hardware and registry backends are optional so the module (and the WMI,
+# inventory and report modules of this package) import on any platform
+try:
+    import cpuinfo
+except ImportError:
+    cpuinfo = None
+try:
+    import GPUtil
+except ImportError:
+    GPUtil = None
+try:
+    import winreg
+except ImportError:
+    winreg = None
+from system_monitor import get_shared_process_registry, get_shared_sampler
+from system_monitor.history import MultiResolutionHistory
+from system_monitor.metrics_store import MetricsStore
+from .report_builder import ReportBuilder
+from .report_diff import ReportDiffer
+from .report_export import read_report, report_filename, write_report
+from .software_inventory import SoftwareInventory, create_default_inventory
+from .wmi_query import STATIC_HARDWARE_CLASSES, WmiQueryExecutor, create_default_executor
 
 class EliteSystemInfo:
-    def __init__(self):
-        """Initialize the Elite System Information module"""
-        self.wmi_instance = None
+    # Persistent metrics log used unless another folder (or None) is given
+    DEFAULT_METRICS_DIR = Path.home() / "QuantumDesk_Metrics"
+    
+    # Seconds each report section may take before it is abandoned
+    REPORT_TIMEOUTS = {
+        'cpu_info': 10,
+        'memory_info': 10,
+        'disk_info': 10,
+        'gpu_info': 10,
+        'network_info': 10,
+        'top_processes': 10,
+    }
+    
+    def __init__(self, max_history=100, metrics_dir=DEFAULT_METRICS_DIR, wmi_provider=None, registry_backend=None):
+        """
+        Initialize the Elite System Information module
+        
+        Args:
+            max_history: Number of monitoring samples kept in memory
+                         (e.g. 43200 keeps 24h at the 2s monitoring interval)
+            metrics_dir: Folder for the persistent metrics log (~/QuantumDesk_Metrics
+                         by default, created once monitoring records a sample);
+                         samples are only kept in memory when None
+            wmi_provider: WMI backend (e.g. StaticWmiProvider for tests);
+                          the local WMI service is used when None
+            registry_backend: Registry backend for the software inventory
+                              (e.g. FakeRegistryBackend); winreg when None
+        """
         self.system_data = {}
         self.monitoring_active = False
-        self.performance_history = defaultdict(list)
-        self.max_history = 100  # Keep last 100 data points
+        self.max_history = max_history
+        # Raw samples plus 10s / 1min min-avg-max rollups (~7 days)
+        self.performance_history = MultiResolutionHistory(['cpu', 'memory'], capacity=max_history)
+        self.sampler = get_shared_sampler()
+        self.processes = get_shared_process_registry()
+        self._monitor_handler = None
+        self._cpuinfo_cache = None
+        self.metrics_store = None
+        if metrics_dir:
+            try:
+                self.metrics_store = MetricsStore(metrics_dir)
+            except OSError as e:
+                print(f"Metrics log unavailable: {e}")
         
-        try:
-            self.wmi_instance = wmi.WMI()
-        except Exception as e:
-            print(f"WMI initialization failed: {e}")
+        # WMI queries run concurrently on a worker pool and are cached
+        if wmi_provider is not None:
+            self.wmi = WmiQueryExecutor(wmi_provider)
+        else:
+            self.wmi = create_default_executor()
+        
+        # Installed software comes from the registry Uninstall keys
+        if registry_backend is not None:
+            self.software_inventory = SoftwareInventory(registry_backend)
+        else:
+            self.software_inventory = create_default_inventory()
     
     def get_system_overview(self):
         """Get comprehensive system overview"""
@@ -56,7 +117,15 @@ class EliteSystemInfo:
     def get_cpu_info(self):
         """Get detailed CPU information"""
         try:
-            cpu_info = cpuinfo.get_cpu_info()
+            # Static CPU facts are expensive to collect, so cache them
+            if self._cpuinfo_cache is None:
+                if cpuinfo is not None:
+                    self._cpuinfo_cache = cpuinfo.get_cpu_info()
+                else:
+                    self._cpuinfo_cache = {'brand_raw': platform.processor() or 'Unknown',
+                                           'arch': platform.machine() or 'Unknown'}
+            cpu_info = self._cpuinfo_cache
+            snapshot = self.sampler.snapshot()
             cpu_data = {
                 'name': cpu_info.get('brand_raw', 'Unknown'),
                 'architecture': cpu_info.get('arch', 'Unknown'),
@@ -65,8 +134,8 @@ class EliteSystemInfo:
                 'count_logical': psutil.cpu_count(logical=True),
                 'max_frequency': f"{psutil.cpu_freq().max:.2f} MHz" if psutil.cpu_freq() else "Unknown",
                 'current_frequency': f"{psutil.cpu_freq().current:.2f} MHz" if psutil.cpu_freq() else "Unknown",
-                'usage_percent': psutil.cpu_percent(interval=1),
-                'usage_per_core': psutil.cpu_percent(interval=1, percpu=True),
+                'usage_percent': snapshot.cpu_percent,
+                'usage_per_core': list(snapshot.cpu_per_core),
                 'temperature': self.get_cpu_temperature(),
                 'cache_info': self.get_cpu_cache_info(),
                 'features': cpu_info.get('flags', [])
@@ -78,8 +147,8 @@ class EliteSystemInfo:
     def get_cpu_temperature(self):
         """Get CPU temperature (Windows specific)"""
         try:
-            if self.wmi_instance:
-                temps = self.wmi_instance.MSAcpi_ThermalZoneTemperature()
+            if self.wmi:
+                temps = self.wmi.query('MSAcpi_ThermalZoneTemperature', namespace='root\\wmi')
                 if temps:
                     # Convert from tenths of Kelvin to Celsius
                     temp_celsius = (temps[0].CurrentTemperature / 10.0) - 273.15
@@ -91,9 +160,9 @@ class EliteSystemInfo:
     def get_cpu_cache_info(self):
         """Get CPU cache information"""
         try:
-            if self.wmi_instance:
+            if self.wmi:
                 cache_info = {}
-                for cache in self.wmi_instance.Win32_CacheMemory():
+                for cache in self.wmi.query('Win32_CacheMemory'):
                     level = cache.Level
                     size = cache.MaxCacheSize
                     cache_info[f"L{level}"] = f"{size} KB" if size else "Unknown"
@@ -127,9 +196,9 @@ class EliteSystemInfo:
     def get_memory_modules(self):
         """Get physical memory module information"""
         try:
-            if self.wmi_instance:
+            if self.wmi:
                 modules = []
-                for mem in self.wmi_instance.Win32_PhysicalMemory():
+                for mem in self.wmi.query('Win32_PhysicalMemory'):
                     module = {
                         'capacity': self.bytes_to_human(int(mem.Capacity)) if mem.Capacity else "Unknown",
                         'speed': f"{mem.Speed} MHz" if mem.Speed else "Unknown",
@@ -176,9 +245,9 @@ class EliteSystemInfo:
     def get_physical_disks(self):
         """Get physical disk information"""
         try:
-            if self.wmi_instance:
+            if self.wmi:
                 disks = []
-                for disk in self.wmi_instance.Win32_DiskDrive():
+                for disk in self.wmi.query('Win32_DiskDrive'):
                     disk_data = {
                         'model': disk.Model or "Unknown",
                         'size': self.bytes_to_human(int(disk.Size)) if disk.Size else "Unknown",
@@ -201,7 +270,7 @@ class EliteSystemInfo:
             
             # Get NVIDIA GPUs
             try:
-                gpus = GPUtil.getGPUs()
+                gpus = GPUtil.getGPUs() if GPUtil is not None else []
                 for gpu in gpus:
                     gpu_data = {
                         'name': gpu.name,
@@ -218,9 +287,9 @@ class EliteSystemInfo:
                 pass
             
             # Get all GPUs via WMI
-            if self.wmi_instance:
+            if self.wmi:
                 try:
-                    for gpu in self.wmi_instance.Win32_VideoController():
+                    for gpu in self.wmi.query('Win32_VideoController'):
                         if not any(g['name'] == gpu.Name for g in gpu_info):
                             gpu_data = {
                                 'name': gpu.Name or "Unknown",
@@ -298,30 +367,36 @@ class EliteSystemInfo:
         except Exception:
             return []
     
-    def get_processes_info(self):
-        """Get detailed process information"""
+    def get_processes_info(self, limit=50, max_age=1.0):
+        """
+        Get detailed process information
+
+        Args:
+            limit: Number of processes returned (highest CPU first)
+            max_age: Reuse the shared process registry if updated this recently
+        """
         try:
             processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status', 'username']):
-                try:
-                    proc_info = proc.info
-                    proc_info['memory_mb'] = proc.memory_info().rss / 1024 / 1024
-                    processes.append(proc_info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            # Sort by CPU usage
-            processes.sort(key=lambda x: x.get('cpu_percent', 0), reverse=True)
-            return processes[:50]  # Return top 50 processes
+            for row in self.processes.top(limit, 'cpu_percent', max_age=max_age):
+                processes.append({
+                    'pid': row.pid,
+                    'name': row.name,
+                    'cpu_percent': row.cpu_percent,
+                    'memory_percent': row.memory_percent,
+                    'status': row.status,
+                    'username': row.username,
+                    'memory_mb': row.memory_rss / 1024 / 1024
+                })
+            return processes
         except Exception as e:
             return {'error': f"Failed to get process info: {e}"}
     
     def get_services_info(self):
         """Get Windows services information"""
         try:
-            if self.wmi_instance:
+            if self.wmi:
                 services = []
-                for service in self.wmi_instance.Win32_Service():
+                for service in self.wmi.query('Win32_Service'):
                     service_info = {
                         'name': service.Name,
                         'display_name': service.DisplayName,
@@ -339,6 +414,8 @@ class EliteSystemInfo:
     
     def get_startup_programs(self):
         """Get startup programs information"""
+        if winreg is None:
+            return []
         try:
             startup_programs = []
             
@@ -374,20 +451,15 @@ class EliteSystemInfo:
             return []
     
     def get_installed_software(self):
-        """Get installed software information"""
+        """Get installed software information
+        
+        Reads the registry Uninstall keys instead of enumerating Win32_Product,
+        which is very slow and triggers MSI consistency checks. Entries are
+        cached and only re-read when their key was modified.
+        """
         try:
-            if self.wmi_instance:
-                software = []
-                for product in self.wmi_instance.Win32_Product():
-                    software_info = {
-                        'name': product.Name,
-                        'version': product.Version,
-                        'vendor': product.Vendor,
-                        'install_date': product.InstallDate,
-                        'install_location': product.InstallLocation
-                    }
-                    software.append(software_info)
-                return software
+            if self.software_inventory:
+                return self.software_inventory.scan()
             return []
         except Exception:
             return []
@@ -395,28 +467,22 @@ class EliteSystemInfo:
     def get_system_performance(self):
         """Get real-time system performance metrics"""
         try:
-            performance = {
-                'cpu_percent': psutil.cpu_percent(interval=1),
-                'cpu_per_core': psutil.cpu_percent(interval=1, percpu=True),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_usage': {},
-                'network_io': psutil.net_io_counters(),
-                'disk_io': psutil.disk_io_counters(),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            # Get disk usage for each partition
-            for partition in psutil.disk_partitions():
-                try:
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    performance['disk_usage'][partition.device] = (usage.used / usage.total) * 100
-                except PermissionError:
-                    continue
-            
-            return performance
+            return self._performance_from_snapshot(self.sampler.snapshot())
         except Exception as e:
             return {'error': f"Failed to get performance info: {e}"}
     
+    def _performance_from_snapshot(self, snapshot):
+        """Convert a shared sampler snapshot into the performance dict"""
+        return {
+            'cpu_percent': snapshot.cpu_percent,
+            'cpu_per_core': list(snapshot.cpu_per_core),
+            'memory_percent': snapshot.memory.percent,
+            'disk_usage': dict(snapshot.disk_usage),
+            'network_io': snapshot.net_io,
+            'disk_io': snapshot.disk_io,
+            'timestamp': datetime.fromtimestamp(snapshot.timestamp).isoformat()
+        }
+    
     def start_monitoring(self, callback=None):
         """Start real-time system monitoring"""
         if self.monitoring_active:
@@ -424,74 +490,201 @@ class EliteSystemInfo:
         
         self.monitoring_active = True
         
-        def monitor():
-            while self.monitoring_active:
-                try:
-                    perf_data = self.get_system_performance()
-                    
-                    # Store in history
-                    if 'error' not in perf_data:
-                        self.performance_history['cpu'].append(perf_data['cpu_percent'])
-                        self.performance_history['memory'].append(perf_data['memory_percent'])
-                        self.performance_history['timestamp'].append(perf_data['timestamp'])
-                        
-                        # Limit history size
-                        if len(self.performance_history['cpu']) > self.max_history:
-                            for key in self.performance_history:
-                                self.performance_history[key].pop(0)
-                    
-                    if callback:
-                        callback(perf_data)
-                    
-                    time.sleep(2)  # Update every 2 seconds
-                except Exception as e:
-                    print(f"Monitoring error: {e}")
-                    time.sleep(5)
+        def on_snapshot(snapshot):
+            try:
+                perf_data = self._performance_from_snapshot(snapshot)
+                
+                # Store in history (the ring buffer drops the oldest sample)
+                self.performance_history.append(
+                    snapshot.timestamp,
+                    cpu=snapshot.cpu_percent,
+                    memory=snapshot.memory.percent
+                )
+                if self.metrics_store:
+                    self.metrics_store.append_snapshot(snapshot)
+                
+                if callback:
+                    callback(perf_data)
+            except Exception as e:
+                print(f"Monitoring error: {e}")
         
-        monitor_thread = threading.Thread(target=monitor, daemon=True)
-        monitor_thread.start()
+        if self.metrics_store:
+            # Compaction is housekeeping; monitoring must start even if it fails
+            try:
+                self.metrics_store.compact()
+            except Exception as e:
+                print(f"Metrics compaction error: {e}")
+        
+        # Update every 2 seconds from the shared sampler
+        self._monitor_handler = self.sampler.subscribe(on_snapshot, min_interval=2)
+        self.sampler.start()
     
     def stop_monitoring(self):
         """Stop real-time system monitoring"""
         self.monitoring_active = False
+        if self._monitor_handler:
+            self.sampler.unsubscribe(self._monitor_handler)
+            self._monitor_handler = None
+        if not self.sampler.has_subscribers():
+            self.sampler.stop()
+        if self.metrics_store:
+            self.metrics_store.close()
+    
+    def get_performance_history(self, start=None, end=None, fields=None):
+        """Get performance history data
+        
+        Without arguments returns a consistent copy of the in-memory history
+        as NumPy arrays: {'timestamp': epoch seconds, 'cpu': ..., 'memory': ...}.
+        The copy is taken under the history lock, so it is safe to hand to
+        the GUI thread while the sampler keeps appending.
+        
+        With a time range or field list the persistent metrics log is read
+        instead (only the requested columns are mapped from disk), which
+        covers samples from previous sessions as well.
+        """
+        if start is None and end is None and fields is None:
+            return self.performance_history.as_dict()
+        if self.metrics_store:
+            return self.metrics_store.query(start, end, fields)
+        
+        history = self.performance_history.as_dict()
+        timestamps = history['timestamp']
+        mask = (timestamps >= (start if start is not None else -float('inf'))) & \
+               (timestamps <= (end if end is not None else float('inf')))
+        names = ['timestamp'] + list(fields or self.performance_history.fields)
+        return {name: history[name][mask] for name in names if name in history}
     
-    def get_performance_history(self):
-        """Get performance history data"""
-        return dict(self.performance_history)
+    def get_performance_series(self, window_seconds=3600, resolution=None):
+        """Get pre-aggregated performance series for the last window_seconds
+        
+        Uses raw samples when they cover the window, otherwise the 10s or
+        1min rollups, so "last hour" or "last 7 days" never rescans raw data.
+        """
+        return self.performance_history.window(window_seconds, resolution=resolution)
     
-    def generate_system_report(self):
-        """Generate comprehensive system report"""
+    def report_builder(self, history_window=None, timeouts=None, extended=False):
+        """Create a ReportBuilder covering every system report section
+        
+        Args:
+            history_window: If set, include monitoring history for the last
+                            N seconds (e.g. 3600 or 7 * 86400)
+            timeouts: {section name: seconds} overriding REPORT_TIMEOUTS
+            extended: Also collect services, installed software and
+                      startup programs
+        """
+        # Start the slow hardware enumerations concurrently up front
+        if self.wmi:
+            self.wmi.prefetch(STATIC_HARDWARE_CLASSES)
+        
+        sections = [
+            ('system_overview', self.get_system_overview),
+            ('cpu_info', self.get_cpu_info),
+            ('memory_info', self.get_memory_info),
+            ('disk_info', self.get_disk_info),
+            ('gpu_info', self.get_gpu_info),
+            ('network_info', self.get_network_info),
+            # No slicing: an {'error': ...} dict is passed through as is
+            ('top_processes', lambda: self.get_processes_info(limit=10)),
+            ('system_performance', self.get_system_performance)
+        ]
+        if extended:
+            sections += [
+                ('services', self.get_services_info),
+                ('installed_software', self.get_installed_software),
+                ('startup_programs', self.get_startup_programs)
+            ]
+        if history_window:
+            sections.append(('performance_history', lambda: self._history_section(history_window)))
+        
+        section_timeouts = dict(self.REPORT_TIMEOUTS)
+        section_timeouts.update(timeouts or {})
+        return ReportBuilder(sections, timeouts=section_timeouts)
+    
+    def _history_section(self, history_window):
+        """Monitoring history for the report as JSON-friendly lists"""
+        series = self.get_performance_series(history_window)
+        return {
+            'resolution': series['resolution'],
+            'timestamp': series['timestamp'].tolist(),
+            **{name: {stat: values.tolist() for stat, values in series[name].items()}
+               for name in self.performance_history.fields}
+        }
+    
+    def stream_system_report(self, history_window=None, timeouts=None, extended=False):
+        """Yield (section name, data) pairs as each report section finishes"""
+        yield 'generated_at', datetime.now().isoformat()
+        yield from self.report_builder(history_window, timeouts, extended).stream()
+    
+    def generate_system_report(self, history_window=None, on_section=None, timeouts=None):
+        """Generate comprehensive system report
+        
+        Sections are collected concurrently; a section that exceeds its
+        timeout is reported as {'error': ...} instead of blocking the rest.
+        
+        Args:
+            history_window: If set, include monitoring history for the last
+                            N seconds (e.g. 3600 or 7 * 86400)
+            on_section: Optional callback(section name, data) called as soon
+                        as each section is ready, for progressive display
+            timeouts: {section name: seconds} overriding REPORT_TIMEOUTS
+        """
         try:
-            report = {
-                'generated_at': datetime.now().isoformat(),
-                'system_overview': self.get_system_overview(),
-                'cpu_info': self.get_cpu_info(),
-                'memory_info': self.get_memory_info(),
-                'disk_info': self.get_disk_info(),
-                'gpu_info': self.get_gpu_info(),
-                'network_info': self.get_network_info(),
-                'top_processes': self.get_processes_info()[:10],
-                'system_performance': self.get_system_performance()
-            }
+            report = {'generated_at': datetime.now().isoformat()}
+            report.update(self.report_builder(history_window, timeouts).build(on_section))
             return report
         except Exception as e:
             return {'error': f"Failed to generate system report: {e}"}
     
-    def export_report(self, filename=None):
-        """Export system report to JSON file"""
+    def export_report(self, filename=None, fmt='json', compression=None, indent=2, extended=False):
+        """Export system report to a file, streaming sections as they finish
+        
+        Args:
+            filename: Output path (generated with a matching suffix when None)
+            fmt: 'json', 'jsonl' (one line per section) or 'binary'
+                 (length-prefixed sections that can be skipped when reading)
+            compression: None, 'gzip', 'bz2' or 'xz'
+            indent: JSON indentation for the 'json' format (None = compact)
+            extended: Also include services, installed software and startup
+                      programs
+        """
         try:
             if not filename:
-                filename = f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                filename = report_filename(
+                    f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}", fmt, compression
+                )
             
-            report = self.generate_system_report()
+            sections = write_report(
+                self.stream_system_report(extended=extended),
+                filename, fmt=fmt, compression=compression, indent=indent
+            )
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
-            
-            return {'success': True, 'filename': filename}
+            return {'success': True, 'filename': filename, 'sections': sections}
         except Exception as e:
             return {'error': f"Failed to export report: {e}"}
     
+    def diff_system_report(self, baseline, current=None):
+        """Compute a delta report containing only what changed
+        
+        Args:
+            baseline: Earlier report dict, ReportIndex or exported report file
+            current: Report dict or exported file to compare against
+                     (a live report is generated when None)
+        
+        Returns:
+            Delta from ReportDiffer.diff: new/exited processes, changed
+            services, disk growth, new connections and other changed fields
+        """
+        try:
+            if isinstance(baseline, (str, os.PathLike)):
+                baseline = read_report(baseline)
+            if current is None:
+                current = self.generate_system_report()
+            elif isinstance(current, (str, os.PathLike)):
+                current = read_report(current)
+            return ReportDiffer().diff(baseline, current)
+        except Exception as e:
+            return {'error': f"Failed to diff system reports: {e}"}
+    
     @staticmethod
     def bytes_to_human(bytes_value):
         """Convert bytes to human readable format"""
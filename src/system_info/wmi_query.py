@@ -0,0 +1,185 @@
+"""
+QuantumDesk WMI Query Layer
+Concurrent, cached WMI class enumeration with pluggable providers
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+
+# Seconds a cached result stays valid (None = until invalidated)
+DEFAULT_TTL = {
+    'Win32_CacheMemory': None,
+    'Win32_PhysicalMemory': None,
+    'Win32_DiskDrive': 3600,
+    'Win32_VideoController': 600,
+    'Win32_Product': 3600,
+    'Win32_Service': 60,
+    'MSAcpi_ThermalZoneTemperature': 0,
+}
+
+# Classes describing hardware that is worth warming up before a report
+STATIC_HARDWARE_CLASSES = (
+    'Win32_CacheMemory',
+    'Win32_PhysicalMemory',
+    'Win32_DiskDrive',
+    'Win32_VideoController',
+)
+
+
+class WmiProvider:
+    """Enumerate WMI classes on the local machine
+
+    WMI objects are COM objects bound to the apartment of the thread that
+    created them, so every worker thread gets its own connection and the
+    results are copied into plain records before leaving the thread.
+    """
+
+    def __init__(self):
+        """Initialize the provider (raises ImportError without the wmi package)"""
+        import wmi
+        self._wmi = wmi
+        self._local = threading.local()
+
+    def _connection(self, namespace):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            try:
+                import pythoncom
+                pythoncom.CoInitialize()
+            except ImportError:
+                pass
+            connections = self._local.connections = {}
+        if namespace not in connections:
+            if namespace:
+                connections[namespace] = self._wmi.WMI(namespace=namespace)
+            else:
+                connections[namespace] = self._wmi.WMI()
+        return connections[namespace]
+
+    def query(self, class_name, namespace=None):
+        """Return every instance of class_name as a list of records"""
+        connection = self._connection(namespace)
+        records = []
+        for obj in getattr(connection, class_name)():
+            records.append(SimpleNamespace(**{name: getattr(obj, name, None) for name in obj.properties}))
+        return records
+
+
+class StaticWmiProvider:
+    """Provider serving canned records, for tests and non-Windows hosts"""
+
+    def __init__(self, classes=None, delay=0.0):
+        """
+        Initialize the static provider
+
+        Args:
+            classes: {class_name: [dict or object, ...]}
+            delay: Seconds each query sleeps, to simulate slow WMI calls
+        """
+        self.classes = classes or {}
+        self.delay = delay
+        self.calls = []
+
+    def query(self, class_name, namespace=None):
+        """Return the canned records for class_name"""
+        self.calls.append(class_name)
+        if self.delay:
+            time.sleep(self.delay)
+        return [SimpleNamespace(**r) if isinstance(r, dict) else r
+                for r in self.classes.get(class_name, [])]
+
+
+class WmiQueryExecutor:
+    """Run WMI queries on a worker pool and cache the results"""
+
+    def __init__(self, provider, max_workers=4, ttl=None, default_ttl=300):
+        """
+        Initialize the query executor
+
+        Args:
+            provider: Object with query(class_name, namespace=None)
+            max_workers: Size of the worker pool
+            ttl: {class_name: seconds or None} overriding DEFAULT_TTL
+            default_ttl: TTL for classes not listed in the TTL table
+        """
+        self.provider = provider
+        self.ttl = dict(DEFAULT_TTL)
+        self.ttl.update(ttl or {})
+        self.default_ttl = default_ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="WmiQuery")
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._inflight = {}
+
+    def submit(self, class_name, namespace=None):
+        """
+        Start (or join) a query and return a Future with its records
+
+        Cached results complete immediately; concurrent requests for the
+        same class share a single WMI enumeration.
+        """
+        key = (namespace, class_name)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                expires, records = cached
+                if expires is None or time.monotonic() < expires:
+                    return _completed(records)
+                del self._cache[key]
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._pool.submit(self._run, key)
+                self._inflight[key] = future
+            return future
+
+    def query(self, class_name, namespace=None, timeout=None):
+        """Return the records for class_name, blocking until available"""
+        return self.submit(class_name, namespace).result(timeout)
+
+    def prefetch(self, class_names, namespace=None):
+        """Start several queries concurrently; returns {class_name: Future}"""
+        return {name: self.submit(name, namespace) for name in class_names}
+
+    def invalidate(self, class_name=None, namespace=None):
+        """Drop one cached class, or everything when class_name is None"""
+        with self._lock:
+            if class_name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop((namespace, class_name), None)
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        self._pool.shutdown(wait=False)
+
+    def _run(self, key):
+        namespace, class_name = key
+        try:
+            records = self.provider.query(class_name, namespace=namespace)
+            ttl = self.ttl.get(class_name, self.default_ttl)
+            if ttl != 0:
+                expires = None if ttl is None else time.monotonic() + ttl
+                with self._lock:
+                    self._cache[key] = (expires, records)
+            return records
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+def _completed(result):
+    """Return an already finished Future holding result"""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def create_default_executor():
+    """Return an executor backed by local WMI, or None when WMI is unavailable"""
+    try:
+        return WmiQueryExecutor(WmiProvider())
+    except Exception as e:
+        print(f"WMI initialization failed: {e}")
+        return None
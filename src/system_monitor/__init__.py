@@ -0,0 +1,15 @@
+"""
+QuantumDesk System Monitor Package
+Shared metrics sampling and process tracking used by the GUI, System Info and Optimizer
+"""
+
+from .cpu_sampler import CpuDeltaSampler
+from .idle_detector import IdleDetector, create_default_providers
+from .process_index import ProcessIndex
+from .process_registry import ProcessRegistry, ProcessStats, get_shared_process_registry
+from .process_table import ProcessRow, ProcessTable, get_shared_process_table
+from .sampler import MetricsSampler, MetricsSnapshot, get_shared_sampler
+
+__all__ = ['CpuDeltaSampler', 'IdleDetector', 'MetricsSampler', 'MetricsSnapshot', 'ProcessIndex',
+           'ProcessRegistry', 'ProcessRow', 'ProcessStats', 'ProcessTable', 'create_default_providers',
+           'get_shared_process_registry', 'get_shared_process_table', 'get_shared_sampler']
@@ -0,0 +1,73 @@
+"""
+QuantumDesk CPU Delta Sampler
+Non-blocking CPU utilisation computed from consecutive cpu_times readings
+"""
+
+import psutil
+import threading
+
+
+class CpuDeltaSampler:
+    """Compute CPU utilisation from the delta between two cpu_times ticks
+
+    Unlike psutil.cpu_percent(interval=...) this never sleeps, and unlike
+    psutil.cpu_percent(interval=None) it keeps its own reference point, so
+    other callers in the process cannot reset it.
+    """
+
+    def __init__(self):
+        """Initialize the sampler with the current cpu_times as reference"""
+        self._lock = threading.Lock()
+        self._last_total = psutil.cpu_times()
+        self._last_per_core = psutil.cpu_times(percpu=True)
+        self._percent = 0.0
+        self._per_core = [0.0] * len(self._last_per_core)
+
+    def sample(self):
+        """
+        Return (total percent, per-core percents) since the previous call
+
+        Returns immediately. If no CPU time has elapsed since the previous
+        call the last computed values are returned again.
+        """
+        total = psutil.cpu_times()
+        per_core = psutil.cpu_times(percpu=True)
+
+        with self._lock:
+            percent = self._delta_percent(self._last_total, total)
+            if percent is not None:
+                self._percent = percent
+                self._last_total = total
+
+            if len(per_core) != len(self._last_per_core):
+                # CPU hotplug - restart per-core tracking
+                self._last_per_core = per_core
+                self._per_core = [0.0] * len(per_core)
+            else:
+                for i, (before, after) in enumerate(zip(self._last_per_core, per_core)):
+                    core_percent = self._delta_percent(before, after)
+                    if core_percent is not None:
+                        self._per_core[i] = core_percent
+                self._last_per_core = per_core
+
+            return self._percent, list(self._per_core)
+
+    @staticmethod
+    def _busy_and_total(times):
+        """Split a cpu_times tuple into (busy, total) seconds"""
+        total = sum(times)
+        # guest time is already accounted for in user/nice on Linux
+        total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+        busy = total - times.idle - getattr(times, 'iowait', 0)
+        return busy, total
+
+    @classmethod
+    def _delta_percent(cls, before, after):
+        """Return utilisation between two readings or None if no time passed"""
+        busy_before, total_before = cls._busy_and_total(before)
+        busy_after, total_after = cls._busy_and_total(after)
+        total_delta = total_after - total_before
+        if total_delta <= 0:
+            return None
+        busy_delta = busy_after - busy_before
+        return round(min(100.0, max(0.0, busy_delta / total_delta * 100)), 1)
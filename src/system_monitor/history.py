@@ -0,0 +1,280 @@
+"""
+QuantumDesk Metrics History
+Fixed-capacity, NumPy-backed ring buffers for performance history
+"""
+
+import threading
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity float64 ring buffer with O(1) append
+
+    Every value is written twice (at i and i + capacity) so the live window
+    is always one contiguous slice and can be returned without a copy.
+    """
+
+    def __init__(self, capacity):
+        """
+        Initialize the ring buffer
+
+        Args:
+            capacity: Maximum number of values kept
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity * 2, dtype=np.float64)
+        self._index = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        """Append a value, overwriting the oldest one when full"""
+        i = self._index
+        self._data[i] = value
+        self._data[i + self.capacity] = value
+        self._index = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def view(self):
+        """Return a read-only view of the values, oldest first
+
+        The view shares memory with the buffer and is only valid until the
+        next append: once the buffer is full an append overwrites a slot
+        inside the viewed window, leaving the newest value mid-series.
+        Copy it before any concurrent append can happen.
+        """
+        end = self._index + self.capacity
+        window = self._data[end - self._size:end]
+        window.flags.writeable = False
+        return window
+
+    def last(self, default=None):
+        """Return the most recent value"""
+        if not self._size:
+            return default
+        return float(self._data[self._index - 1 + self.capacity])
+
+    def clear(self):
+        """Drop all values"""
+        self._index = 0
+        self._size = 0
+
+
+class MetricsHistory:
+    """Set of ring buffers sharing one float64 timestamp column"""
+
+    def __init__(self, fields, capacity):
+        """
+        Initialize the metrics history
+
+        Args:
+            fields: Names of the numeric series to keep
+            capacity: Number of samples retained per series
+        """
+        self.fields = tuple(fields)
+        self.capacity = int(capacity)
+        self._lock = threading.Lock()
+        self._buffers = {name: RingBuffer(self.capacity) for name in ('timestamp',) + self.fields}
+
+    def __len__(self):
+        return len(self._buffers['timestamp'])
+
+    def append(self, timestamp, **values):
+        """Append one sample; missing fields are stored as NaN"""
+        with self._lock:
+            self._buffers['timestamp'].append(timestamp)
+            for name in self.fields:
+                self._buffers[name].append(values.get(name, np.nan))
+
+    def series(self, name):
+        """Return a copy of one series, oldest first"""
+        with self._lock:
+            return self._buffers[name].view().copy()
+
+    def as_dict(self):
+        """Return {name: array} copies of the timestamp column and every field"""
+        with self._lock:
+            return {name: buffer.view().copy() for name, buffer in self._buffers.items()}
+
+    def views(self):
+        """Return {name: view} without copying; only valid while no append runs"""
+        with self._lock:
+            return {name: buffer.view() for name, buffer in self._buffers.items()}
+
+    def clear(self):
+        """Drop all samples"""
+        with self._lock:
+            for buffer in self._buffers.values():
+                buffer.clear()
+
+
+class RollupTier:
+    """Downsampled min/avg/max buckets of a fixed resolution"""
+
+    def __init__(self, fields, resolution, capacity):
+        """
+        Initialize the rollup tier
+
+        Args:
+            fields: Names of the numeric series to aggregate
+            resolution: Bucket width in seconds
+            capacity: Number of finished buckets retained
+        """
+        self.fields = tuple(fields)
+        self.resolution = float(resolution)
+        self.capacity = int(capacity)
+        columns = [f"{name}_{stat}" for name in self.fields for stat in ('min', 'avg', 'max')]
+        self._history = MetricsHistory(columns, capacity=self.capacity)
+        self._bucket_start = None
+        self._reset_bucket()
+
+    @property
+    def retention(self):
+        """Seconds of history this tier can hold"""
+        return self.resolution * self.capacity
+
+    def _reset_bucket(self):
+        self._count = 0
+        self._min = {name: np.inf for name in self.fields}
+        self._max = {name: -np.inf for name in self.fields}
+        self._sum = {name: 0.0 for name in self.fields}
+
+    def add(self, timestamp, values):
+        """Feed one raw sample, flushing the current bucket when it closes"""
+        bucket_start = timestamp - (timestamp % self.resolution)
+        if self._bucket_start is not None and bucket_start != self._bucket_start:
+            self.flush()
+        self._bucket_start = bucket_start
+        self._count += 1
+        for name in self.fields:
+            value = values.get(name)
+            if value is None:
+                continue
+            self._sum[name] += value
+            if value < self._min[name]:
+                self._min[name] = value
+            if value > self._max[name]:
+                self._max[name] = value
+
+    def flush(self):
+        """Close the current bucket and store its aggregates"""
+        if not self._count:
+            return
+        aggregates = {}
+        for name in self.fields:
+            aggregates[f"{name}_min"] = self._min[name]
+            aggregates[f"{name}_avg"] = self._sum[name] / self._count
+            aggregates[f"{name}_max"] = self._max[name]
+        self._history.append(self._bucket_start, **aggregates)
+        self._reset_bucket()
+
+    def as_dict(self):
+        """Return {column: array} copies of the finished buckets"""
+        return self._history.as_dict()
+
+    def views(self):
+        """Return {column: view} of the finished buckets without copying"""
+        return self._history.views()
+
+
+class MultiResolutionHistory:
+    """Raw ring-buffer history with automatic 10s / 1min rollup tiers"""
+
+    DEFAULT_TIERS = (
+        (10, 8640),    # 10s buckets for 24 hours
+        (60, 10080),   # 1min buckets for 7 days
+    )
+
+    def __init__(self, fields, capacity, tiers=DEFAULT_TIERS):
+        """
+        Initialize the multi-resolution history
+
+        Args:
+            fields: Names of the numeric series to keep
+            capacity: Number of raw samples retained
+            tiers: Iterable of (resolution seconds, bucket count) rollups
+        """
+        self.fields = tuple(fields)
+        self.raw = MetricsHistory(self.fields, capacity)
+        self.tiers = [RollupTier(self.fields, resolution, count)
+                      for resolution, count in sorted(tiers)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.raw)
+
+    def append(self, timestamp, **values):
+        """Append a raw sample and feed it into every rollup tier"""
+        with self._lock:
+            self.raw.append(timestamp, **values)
+            for tier in self.tiers:
+                tier.add(timestamp, values)
+
+    def series(self, name):
+        """Return a copy of one raw series"""
+        return self.raw.series(name)
+
+    def as_dict(self):
+        """Return the raw history as {name: array} copies"""
+        return self.raw.as_dict()
+
+    def clear(self):
+        """Drop raw samples and all rollups"""
+        with self._lock:
+            self.raw.clear()
+            self.tiers = [RollupTier(self.fields, tier.resolution, tier.capacity)
+                          for tier in self.tiers]
+
+    def window(self, seconds, now=None, resolution=None):
+        """
+        Return pre-aggregated series covering the last `seconds`
+
+        Picks the raw samples if they reach back far enough, otherwise the
+        finest rollup tier whose retention covers the window. A specific
+        tier can be forced with `resolution` (0 selects the raw samples);
+        an unknown resolution raises ValueError.
+
+        Returns:
+            {'resolution': seconds per point (0 for raw),
+             'timestamp': array,
+             field: {'min': array, 'avg': array, 'max': array}, ...}
+        """
+        # Appends are excluded while the views are sliced and copied
+        with self._lock:
+            raw = self.raw.views()
+            if now is None:
+                now = raw['timestamp'][-1] if len(raw['timestamp']) else 0.0
+            start = now - seconds
+
+            tier = None
+            if resolution is None:
+                raw_ts = raw['timestamp']
+                # Raw samples suffice while they still reach back to `start`
+                if len(raw_ts) == self.raw.capacity and raw_ts[0] > start:
+                    fallback = self.tiers[-1] if self.tiers else None
+                    tier = next((t for t in self.tiers if t.retention >= seconds), fallback)
+            elif resolution:
+                tier = next((t for t in self.tiers if t.resolution == resolution), None)
+                if tier is None:
+                    valid = ', '.join(f"{t.resolution:g}" for t in self.tiers)
+                    raise ValueError(f"Unknown resolution {resolution}; valid tiers: 0 (raw), {valid}")
+
+            if tier is None:
+                first = np.searchsorted(raw['timestamp'], start, side='left')
+                result = {'resolution': 0, 'timestamp': raw['timestamp'][first:].copy()}
+                for name in self.fields:
+                    values = raw[name][first:].copy()
+                    result[name] = {'min': values, 'avg': values, 'max': values}
+                return result
+
+            columns = tier.views()
+            first = np.searchsorted(columns['timestamp'], start, side='left')
+            result = {'resolution': tier.resolution, 'timestamp': columns['timestamp'][first:].copy()}
+            for name in self.fields:
+                result[name] = {stat: columns[f"{name}_{stat}"][first:].copy() for stat in ('min', 'avg', 'max')}
+            return result
@@ -0,0 +1,225 @@
+"""
+QuantumDesk Idle Detector
+Incremental per-process idle tracking from CPU time, I/O and foreground activity
+"""
+
+import sys
+import threading
+
+from .process_registry import EXIT, TICK
+
+
+class _IdleState:
+    """Last counters and last activity of one process"""
+
+    __slots__ = ('create_time', 'cpu_time', 'io_bytes', 'sampled_at', 'active_at')
+
+    def __init__(self, row, now):
+        self.create_time = row.create_time
+        self.cpu_time = row.cpu_time
+        self.io_bytes = row.io_bytes
+        self.sampled_at = now
+        # A new process has to be observed for a whole window before it is idle
+        self.active_at = now
+
+
+def windows_foreground_pid():
+    """Return the PID owning the foreground window (None if there is none)"""
+    import ctypes
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd:
+        return None
+    pid = wintypes.DWORD()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return pid.value or None
+
+
+def windows_input_idle():
+    """Return the seconds since the last keyboard or mouse input"""
+    import ctypes
+    from ctypes import wintypes
+
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [('cbSize', wintypes.UINT), ('dwTime', wintypes.DWORD)]
+
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+        return None
+    # Both values are milliseconds since boot; GetTickCount wraps after 49.7 days
+    elapsed = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+    return elapsed / 1000.0
+
+
+def create_default_providers():
+    """Return (foreground provider, input idle provider) of this OS, None where unsupported"""
+    if sys.platform == 'win32':
+        return windows_foreground_pid, windows_input_idle
+    return None, None
+
+
+class IdleDetector:
+    """Flag processes that showed no activity for a whole window
+
+    The detector listens to the process registry and, on every tick,
+    compares each process's CPU time and I/O counters with the previous
+    tick. A process counts as active for that tick if it used more CPU or
+    I/O than the thresholds, if its counters cannot be read, or if it
+    belongs to the foreground application while the user is present. Only
+    the time of the last activity is kept per process, so each tick costs
+    one comparison per process and no history is rescanned.
+    """
+
+    def __init__(self, registry, window=300, cpu_threshold=0.5, io_threshold=64 * 1024,
+                 foreground=None, input_idle=None):
+        """
+        Initialize the idle detector
+
+        Args:
+            registry: ProcessRegistry delivering the ticks
+            window: Seconds without activity before a process is idle
+            cpu_threshold: CPU percent (of one core) that counts as activity
+            io_threshold: I/O bytes per second that count as activity
+            foreground: Optional callable returning the foreground PID
+            input_idle: Optional callable returning seconds since the last user input
+        """
+        self.registry = registry
+        self.window = window
+        self.cpu_threshold = cpu_threshold
+        self.io_threshold = io_threshold
+        self.foreground = foreground
+        self.input_idle = input_idle
+        self.updated_at = None
+        self._states = {}
+        self._lock = threading.Lock()
+        self._handler = None
+
+    # ======================
+    # LIFECYCLE
+    # ======================
+
+    @property
+    def running(self):
+        return self._handler is not None
+
+    def start(self):
+        """Subscribe to the registry and start it (no-op if already running)"""
+        if self._handler is None:
+            self._handler = self.registry.subscribe(self._on_event)
+            self.registry.start()
+
+    def stop(self):
+        """Unsubscribe from the registry; collected state is kept"""
+        if self._handler is not None:
+            self.registry.unsubscribe(self._handler)
+            self._handler = None
+
+    def _on_event(self, event, payload):
+        try:
+            if event == EXIT:
+                with self._lock:
+                    state = self._states.get(payload.pid)
+                    if state is not None and state.create_time == payload.create_time:
+                        del self._states[payload.pid]
+            elif event == TICK:
+                self.update(payload, self.registry.updated_at)
+        except Exception as e:
+            print(f"Idle detector error: {e}")
+
+    # ======================
+    # UPDATES
+    # ======================
+
+    def _foreground_pids(self, rows):
+        """PIDs of the foreground application, its ancestors and descendants"""
+        if self.foreground is None:
+            return set()
+        try:
+            if self.input_idle is not None:
+                idle = self.input_idle()
+                if idle is not None and idle >= self.window:
+                    # Nobody is using the foreground window
+                    return set()
+            pid = self.foreground()
+        except Exception:
+            return set()
+        if pid is None or pid not in rows:
+            return set()
+        pids = {row.pid for row in self.registry.lookup(max_age=None).descendants(pid, include_self=True)}
+        parent = rows[pid].ppid
+        while parent in rows and parent not in pids:
+            pids.add(parent)
+            parent = rows[parent].ppid
+        return pids
+
+    def _active(self, state, row, elapsed):
+        if row.cpu_time is None or state.cpu_time is None:
+            # Unknown usage is never treated as idle
+            return True
+        if (row.cpu_time - state.cpu_time) / elapsed * 100 > self.cpu_threshold:
+            return True
+        if row.io_bytes is not None and state.io_bytes is not None:
+            return (row.io_bytes - state.io_bytes) / elapsed > self.io_threshold
+        return False
+
+    def update(self, rows, now):
+        """
+        Account one tick
+
+        Args:
+            rows: {pid: ProcessRow} of the tick
+            now: Timestamp of the tick
+        """
+        foreground = self._foreground_pids(rows)
+        with self._lock:
+            states = self._states
+            for pid, row in rows.items():
+                state = states.get(pid)
+                if state is None or state.create_time != row.create_time:
+                    states[pid] = _IdleState(row, now)
+                    continue
+                elapsed = now - state.sampled_at
+                if elapsed <= 0:
+                    continue
+                if pid in foreground or self._active(state, row, elapsed):
+                    state.active_at = now
+                state.cpu_time = row.cpu_time
+                state.io_bytes = row.io_bytes
+                state.sampled_at = now
+            self.updated_at = now
+
+    # ======================
+    # QUERIES
+    # ======================
+
+    def idle_seconds(self, pid):
+        """Seconds since pid was last active (None if it is not tracked)"""
+        with self._lock:
+            state = self._states.get(pid)
+            if state is None:
+                return None
+            return state.sampled_at - state.active_at
+
+    def is_idle(self, pid, window=None):
+        """True if pid showed no activity for the whole window"""
+        idle = self.idle_seconds(pid)
+        return idle is not None and idle >= (self.window if window is None else window)
+
+    def idle(self, window=None):
+        """
+        Return [(ProcessRow, idle seconds)] of the processes idle for the whole window
+
+        Args:
+            window: Override of the detector window in seconds
+        """
+        window = self.window if window is None else window
+        rows = self.registry.rows(max_age=None)
+        with self._lock:
+            idle = [(rows[pid], state.sampled_at - state.active_at)
+                    for pid, state in self._states.items()
+                    if state.sampled_at - state.active_at >= window and pid in rows
+                    and rows[pid].create_time == state.create_time]
+        idle.sort(key=lambda item: item[1], reverse=True)
+        return idle
@@ -0,0 +1,401 @@
+"""
+QuantumDesk Metrics Store
+Persistent on-disk metrics log built from fixed-width columnar segments
+"""
+
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Little-endian float64, one file per column
+COLUMN_DTYPE = np.dtype('<f8')
+COLUMN_SUFFIX = '.f64'
+SEGMENT_PREFIX = 'seg_'
+# Suffixes of directories left behind by an interrupted compaction
+STALE_SUFFIXES = ('.compact', '.old')
+# Written into a segment once its writer closed it for good
+SEALED_MARKER = 'SEALED'
+# Held by the process compacting a directory; older locks are left by a crash
+COMPACT_LOCK = 'compact.lock'
+COMPACT_LOCK_STALE = 600
+
+# Columns recorded from each MetricsSnapshot
+SNAPSHOT_FIELDS = (
+    'cpu', 'memory', 'swap',
+    'disk_read_bytes', 'disk_write_bytes',
+    'net_bytes_sent', 'net_bytes_recv',
+)
+
+
+def snapshot_row(snapshot):
+    """Flatten a MetricsSnapshot into a {column: float} row"""
+    row = {
+        'cpu': snapshot.cpu_percent,
+        'memory': snapshot.memory.percent,
+        'swap': snapshot.swap.percent,
+    }
+    if snapshot.disk_io is not None:
+        row['disk_read_bytes'] = snapshot.disk_io.read_bytes
+        row['disk_write_bytes'] = snapshot.disk_io.write_bytes
+    if snapshot.net_io is not None:
+        row['net_bytes_sent'] = snapshot.net_io.bytes_sent
+        row['net_bytes_recv'] = snapshot.net_io.bytes_recv
+    return row
+
+
+class _Segment:
+    """One directory of equally long column files"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    @property
+    def columns(self):
+        return sorted(p.stem for p in self.path.glob(f"*{COLUMN_SUFFIX}"))
+
+    def column_path(self, name):
+        return self.path / f"{name}{COLUMN_SUFFIX}"
+
+    @property
+    def sealed(self):
+        """True once no writer appends to the segment any more"""
+        return (self.path / SEALED_MARKER).exists()
+
+    def seal(self):
+        (self.path / SEALED_MARKER).touch()
+
+    def rows(self):
+        """Number of complete rows (bounded by the timestamp column)"""
+        try:
+            return self.column_path('timestamp').stat().st_size // COLUMN_DTYPE.itemsize
+        except OSError:
+            return 0
+
+    def read_timestamp(self, index):
+        """Read a single timestamp without mapping the column"""
+        with open(self.column_path('timestamp'), 'rb') as f:
+            f.seek(index * COLUMN_DTYPE.itemsize)
+            return float(np.frombuffer(f.read(COLUMN_DTYPE.itemsize), dtype=COLUMN_DTYPE)[0])
+
+    def time_range(self):
+        """Return (first, last) timestamp or None for an empty segment"""
+        rows = self.rows()
+        if not rows:
+            return None
+        return self.read_timestamp(0), self.read_timestamp(rows - 1)
+
+    def map_column(self, name, rows):
+        """Memory-map the first `rows` values of a column (None if absent)"""
+        path = self.column_path(name)
+        if not rows or not path.exists() or path.stat().st_size < rows * COLUMN_DTYPE.itemsize:
+            return None
+        return np.memmap(path, dtype=COLUMN_DTYPE, mode='r', shape=(rows,))
+
+
+class MetricsStore:
+    """Append-only metrics log with memory-mapped columnar segments
+
+    Several stores (other windows, other processes) may share a directory:
+    each writes its own segments, and compaction only merges sealed ones,
+    so a segment another writer is still appending to is never touched.
+    The directory is created on the first write.
+    """
+
+    def __init__(self, directory, fields=SNAPSHOT_FIELDS, segment_rows=86400,
+                 retention_seconds=30 * 86400, flush_every=10):
+        """
+        Initialize the metrics store
+
+        Args:
+            directory: Folder holding the segment directories
+            fields: Column names written for every row
+            segment_rows: Rows per segment before rotating to a new one
+            retention_seconds: Segments entirely older than this are dropped
+            flush_every: Rows buffered before the active segment is flushed
+        """
+        self.directory = Path(directory)
+        self.fields = tuple(fields)
+        self.segment_rows = int(segment_rows)
+        self.retention_seconds = retention_seconds
+        self.flush_every = max(1, int(flush_every))
+
+        self._lock = threading.RLock()
+        self._active = None
+        self._active_rows = 0
+        self._handles = {}
+        self._pending = 0
+
+    # ======================
+    # WRITING
+    # ======================
+
+    def append(self, timestamp, **values):
+        """Append one row; missing fields are stored as NaN"""
+        with self._lock:
+            if self._active is None or self._active_rows >= self.segment_rows:
+                self._rotate(timestamp)
+            self._handles['timestamp'].write(COLUMN_DTYPE.type(timestamp).tobytes())
+            for name in self.fields:
+                value = values.get(name)
+                self._handles[name].write(COLUMN_DTYPE.type(np.nan if value is None else value).tobytes())
+            self._active_rows += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self.flush()
+
+    def append_snapshot(self, snapshot):
+        """Append a MetricsSnapshot from the shared sampler"""
+        self.append(snapshot.timestamp, **snapshot_row(snapshot))
+
+    def flush(self):
+        """Flush buffered rows of the active segment to disk"""
+        with self._lock:
+            for handle in self._handles.values():
+                handle.flush()
+            self._pending = 0
+
+    def close(self):
+        """Flush, close and seal the active segment"""
+        with self._lock:
+            self.flush()
+            for handle in self._handles.values():
+                handle.close()
+            if self._active is not None:
+                self._active.seal()
+            self._handles = {}
+            self._active = None
+            self._active_rows = 0
+
+    def _rotate(self, timestamp):
+        """Seal the active segment and start a new one"""
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{SEGMENT_PREFIX}{int(timestamp * 1000):016d}"
+        path = self.directory / name
+        suffix = 0
+        while True:
+            try:
+                # Atomic, so two writers never share a segment
+                path.mkdir()
+                break
+            except FileExistsError:
+                suffix += 1
+                path = self.directory / f"{name}_{suffix}"
+        self._active = _Segment(path)
+        self._handles = {
+            column: open(self._active.column_path(column), 'ab')
+            for column in ('timestamp',) + self.fields
+        }
+
+    # ======================
+    # READING
+    # ======================
+
+    def segments(self):
+        """Return all segments ordered by start time"""
+        return [_Segment(p) for p in sorted(self.directory.glob(f"{SEGMENT_PREFIX}*"))
+                if p.is_dir() and '.' not in p.name]
+
+    def query(self, start=None, end=None, fields=None):
+        """
+        Read rows with start <= timestamp <= end
+
+        Only the timestamp column and the requested columns are mapped, and
+        segments outside the range are skipped by their first/last rows.
+
+        Returns:
+            {'timestamp': array, field: array, ...}
+        """
+        fields = tuple(fields) if fields else self.fields
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+
+        with self._lock:
+            if self._pending:
+                self.flush()
+            # Hold the lock so compaction cannot remove mapped segments
+            parts = self._read_segments(self.segments(), start, end, fields)
+
+        result = {
+            name: np.concatenate(chunks) if chunks else np.empty(0, dtype=COLUMN_DTYPE)
+            for name, chunks in parts.items()
+        }
+        timestamps = result['timestamp']
+        if len(timestamps) > 1 and np.any(np.diff(timestamps) < 0):
+            # Segments of several writers sharing the directory overlap
+            order = np.argsort(timestamps, kind='stable')
+            result = {name: column[order] for name, column in result.items()}
+        return result
+
+    @staticmethod
+    def _read_segments(segments, start, end, fields):
+        """Collect per-column chunks of rows within [start, end]"""
+        parts = {name: [] for name in ('timestamp',) + fields}
+        for segment in segments:
+            time_range = segment.time_range()
+            if time_range is None or time_range[1] < start or time_range[0] > end:
+                continue
+            rows = segment.rows()
+            timestamps = segment.map_column('timestamp', rows)
+            first = int(np.searchsorted(timestamps, start, side='left'))
+            last = int(np.searchsorted(timestamps, end, side='right'))
+            if first >= last:
+                continue
+            parts['timestamp'].append(np.array(timestamps[first:last]))
+            for name in fields:
+                column = segment.map_column(name, rows)
+                if column is None:
+                    parts[name].append(np.full(last - first, np.nan))
+                else:
+                    parts[name].append(np.array(column[first:last]))
+                del column
+            del timestamps
+
+        return parts
+
+    # ======================
+    # MAINTENANCE
+    # ======================
+
+    def compact(self, now=None):
+        """
+        Drop expired segments and merge small sealed ones
+
+        Unsealed segments belong to a writer that is still appending (or
+        crashed); they are never merged and only dropped once expired.
+        Nothing is done while another process holds the compaction lock.
+
+        Returns:
+            {'removed': expired segments deleted, 'merged': segments merged}
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        merged = 0
+
+        with self._lock:
+            lock = self._acquire_compact_lock()
+            if lock is None:
+                return {'removed': 0, 'merged': 0}
+            try:
+                active_path = self._active.path if self._active else None
+                survivors = []
+                for segment in self.segments():
+                    time_range = segment.time_range() if segment.path != active_path else None
+                    if segment.path == active_path or (time_range is None and not segment.sealed):
+                        # Still being written: it also ends any merge run
+                        survivors.append((segment, None))
+                    elif time_range is not None and time_range[1] >= now - self.retention_seconds:
+                        survivors.append((segment, time_range if segment.sealed else None))
+                    else:
+                        # An empty unsealed segment may be one a writer just created
+                        shutil.rmtree(segment.path, ignore_errors=True)
+                        removed += 1
+                merged = self._merge_runs(survivors)
+            finally:
+                lock.unlink(missing_ok=True)
+
+        return {'removed': removed, 'merged': merged}
+
+    def _acquire_compact_lock(self):
+        """Create the compaction lock file; None if another process holds it"""
+        if not self.directory.exists():
+            return None
+        lock = self.directory / COMPACT_LOCK
+        try:
+            if time.time() - lock.stat().st_mtime > COMPACT_LOCK_STALE:
+                lock.unlink(missing_ok=True)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return None
+        # Only the lock holder may clear what an interrupted compaction left
+        self._remove_stale()
+        return lock
+
+    def _merge_runs(self, survivors):
+        """
+        Merge runs of consecutive sealed segments; returns segments merged
+
+        Args:
+            survivors: [(segment, time range)] in name order; the range is
+                       None for segments that must not be merged
+        """
+        merged = 0
+        # Greedily merge runs of consecutive segments that fit in one and
+        # follow each other in time (other writers' segments may overlap)
+        group = []
+        group_rows = 0
+        last_end = None
+        for segment, time_range in survivors + [(None, None)]:
+            rows = segment.rows() if time_range else 0
+            if (time_range and group_rows + rows <= self.segment_rows
+                    and (last_end is None or time_range[0] >= last_end)):
+                group.append(segment)
+                group_rows += rows
+                last_end = time_range[1]
+                continue
+            if len(group) > 1 and self._merge(group):
+                merged += len(group)
+            group = [segment] if time_range else []
+            group_rows = rows
+            last_end = time_range[1] if time_range else None
+        return merged
+
+    def _remove_stale(self):
+        """Delete leftovers of an interrupted compaction (never read by queries)"""
+        for path in self.directory.glob(f"{SEGMENT_PREFIX}*"):
+            if path.is_dir() and path.name.endswith(STALE_SUFFIXES):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _merge(self, group):
+        """
+        Rewrite several sealed segments as a single one
+
+        The merged copy is written next to the originals, the originals are
+        renamed aside and the copy takes the first one's name; only then
+        are the originals deleted. If a rename fails (e.g. a column is still
+        mapped on Windows) the originals are put back and nothing is lost.
+
+        Returns:
+            True if the group was merged
+        """
+        columns = sorted(set().union(*(segment.columns for segment in group)))
+        target = group[0].path.with_name(group[0].path.name + '.compact')
+        shutil.rmtree(target, ignore_errors=True)
+        target.mkdir()
+
+        for name in columns:
+            with open(target / f"{name}{COLUMN_SUFFIX}", 'wb') as out:
+                for segment in group:
+                    rows = segment.rows()
+                    column = segment.map_column(name, rows)
+                    if column is None:
+                        out.write(np.full(rows, np.nan, dtype=COLUMN_DTYPE).tobytes())
+                    else:
+                        out.write(np.asarray(column).tobytes())
+                    del column
+        (target / SEALED_MARKER).touch()
+
+        moved = []
+        try:
+            for segment in group:
+                aside = segment.path.with_name(segment.path.name + '.old')
+                os.replace(segment.path, aside)
+                moved.append((segment.path, aside))
+            os.replace(target, group[0].path)
+        except OSError:
+            for original, aside in reversed(moved):
+                if not original.exists():
+                    os.replace(aside, original)
+            shutil.rmtree(target, ignore_errors=True)
+            return False
+
+        for _, aside in moved:
+            shutil.rmtree(aside, ignore_errors=True)
+        return True
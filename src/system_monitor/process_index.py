@@ -0,0 +1,176 @@
+"""
+QuantumDesk Process Index
+Incrementally maintained lookups over the process registry
+"""
+
+import threading
+from collections import defaultdict, deque
+from operator import attrgetter
+
+
+class ProcessIndex:
+    """Name, user, parent-tree and resource views of the running processes
+
+    The registry applies only what changed on each tick (spawned, exited
+    and re-read processes), so the name, user and parent maps never need a
+    full rebuild. Sorted resource views are built at most once per tick and
+    then sliced, so "top 10 by memory" or "all chrome descendants" cost
+    O(k) in the size of the answer rather than O(all processes).
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._lock = threading.RLock()
+        self._rows = {}
+        self._by_name = defaultdict(set)
+        self._by_lower = defaultdict(set)
+        self._by_user = defaultdict(set)
+        self._children = defaultdict(set)
+        self._sorted = {}
+
+    # ======================
+    # MAINTENANCE
+    # ======================
+
+    def apply(self, added=(), removed=(), updated=()):
+        """
+        Apply one registry tick
+
+        Args:
+            added: Rows of processes seen for the first time
+            removed: Rows of processes that exited
+            updated: Fresh rows of processes that were already indexed
+        """
+        with self._lock:
+            for row in removed:
+                self._remove(row)
+            for row in added:
+                self._add(row)
+            for row in updated:
+                old = self._rows.get(row.pid)
+                if old is not None and old.ppid != row.ppid:
+                    self._discard(self._children, old.ppid, row.pid)
+                    self._children[row.ppid].add(row.pid)
+                self._rows[row.pid] = row
+            self._sorted.clear()
+
+    def _add(self, row):
+        self._rows[row.pid] = row
+        self._by_name[row.name].add(row.pid)
+        self._by_lower[row.name.lower()].add(row.pid)
+        self._by_user[row.username].add(row.pid)
+        self._children[row.ppid].add(row.pid)
+
+    def _remove(self, row):
+        old = self._rows.pop(row.pid, None)
+        if old is None:
+            return
+        self._discard(self._by_name, old.name, old.pid)
+        self._discard(self._by_lower, old.name.lower(), old.pid)
+        self._discard(self._by_user, old.username, old.pid)
+        self._discard(self._children, old.ppid, old.pid)
+
+    @staticmethod
+    def _discard(mapping, key, pid):
+        pids = mapping.get(key)
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                del mapping[key]
+
+    def _collect(self, pids):
+        return [self._rows[pid] for pid in pids if pid in self._rows]
+
+    # ======================
+    # QUERIES
+    # ======================
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get(self, pid):
+        """Return the row of pid (None if not running)"""
+        return self._rows.get(pid)
+
+    def names(self):
+        """Return {lowercase name: number of processes}"""
+        with self._lock:
+            return {name: len(pids) for name, pids in self._by_lower.items()}
+
+    def named(self, name, case_sensitive=False):
+        """Return the rows with exactly this process name"""
+        with self._lock:
+            if case_sensitive:
+                return self._collect(self._by_name.get(name, ()))
+            return self._collect(self._by_lower.get(name.lower(), ()))
+
+    def matching(self, text):
+        """Return the rows whose name contains text (case-insensitive)
+
+        Only the distinct names are scanned, not every process.
+        """
+        text = text.lower()
+        with self._lock:
+            rows = []
+            for name, pids in self._by_lower.items():
+                if text in name:
+                    rows.extend(self._collect(pids))
+            return rows
+
+    def owned_by(self, username):
+        """Return the rows of processes owned by username"""
+        with self._lock:
+            return self._collect(self._by_user.get(username, ()))
+
+    def children(self, pid):
+        """Return the direct children of pid"""
+        with self._lock:
+            return self._collect(self._children.get(pid, ()))
+
+    def descendants(self, pid, include_self=False, prune=None):
+        """
+        Return every process below pid in the parent tree (breadth first)
+
+        Args:
+            pid: Root of the tree
+            include_self: Include pid's own row
+            prune: Optional predicate(row); matching rows are left out
+                   together with everything below them
+        """
+        with self._lock:
+            rows = [self._rows[pid]] if include_self and pid in self._rows else []
+            queue = deque(self._children.get(pid, ()))
+            seen = {pid}
+            while queue:
+                child = queue.popleft()
+                if child in seen or child not in self._rows:
+                    continue
+                seen.add(child)
+                row = self._rows[child]
+                if prune is not None and prune(row):
+                    continue
+                rows.append(row)
+                queue.extend(self._children.get(child, ()))
+            return rows
+
+    def trees(self, text):
+        """Return the processes whose name contains text plus all their descendants"""
+        with self._lock:
+            result = {}
+            for row in self.matching(text):
+                if row.pid not in result:
+                    for member in self.descendants(row.pid, include_self=True):
+                        result[member.pid] = member
+            return list(result.values())
+
+    def sorted_by(self, key='memory_rss'):
+        """Return all rows sorted by a resource field, largest first"""
+        with self._lock:
+            rows = self._sorted.get(key)
+            if rows is None:
+                rows = self._sorted[key] = sorted(self._rows.values(), key=attrgetter(key), reverse=True)
+            return rows
+
+    def top(self, n, key='memory_rss'):
+        """Return the n largest rows by a resource field"""
+        return self.sorted_by(key)[:n]
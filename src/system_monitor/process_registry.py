@@ -0,0 +1,263 @@
+"""
+QuantumDesk Process Registry
+Incremental process tracking with spawn/exit events and rolling statistics
+"""
+
+import threading
+import time
+from collections import deque
+
+from .process_index import ProcessIndex
+from .process_table import get_shared_process_table
+
+SPAWN = 'spawn'
+EXIT = 'exit'
+TICK = 'tick'
+
+
+class ProcessStats:
+    """Rolling CPU/RSS statistics of one process over a sample window"""
+
+    __slots__ = ('first_seen', 'samples', '_cpu_sum', '_rss_sum')
+
+    def __init__(self, first_seen, window):
+        self.first_seen = first_seen
+        self.samples = deque(maxlen=window)
+        self._cpu_sum = 0.0
+        self._rss_sum = 0
+
+    def add(self, timestamp, cpu_percent, rss):
+        """Add one sample, evicting the oldest when the window is full"""
+        if len(self.samples) == self.samples.maxlen:
+            _, old_cpu, old_rss = self.samples[0]
+            self._cpu_sum -= old_cpu
+            self._rss_sum -= old_rss
+        self.samples.append((timestamp, cpu_percent, rss))
+        self._cpu_sum += cpu_percent
+        self._rss_sum += rss
+
+    @property
+    def count(self):
+        return len(self.samples)
+
+    @property
+    def cpu_avg(self):
+        """Mean CPU percent over the window"""
+        return self._cpu_sum / len(self.samples) if self.samples else 0.0
+
+    @property
+    def cpu_max(self):
+        return max((s[1] for s in self.samples), default=0.0)
+
+    @property
+    def rss_avg(self):
+        return self._rss_sum / len(self.samples) if self.samples else 0
+
+    @property
+    def rss_max(self):
+        return max((s[2] for s in self.samples), default=0)
+
+    @property
+    def rss_growth(self):
+        """RSS change in bytes from the oldest to the newest sample"""
+        if len(self.samples) < 2:
+            return 0
+        return self.samples[-1][2] - self.samples[0][2]
+
+    @property
+    def observed(self):
+        """Seconds the process has been tracked"""
+        return self.samples[-1][0] - self.first_seen if self.samples else 0.0
+
+    def idle_seconds(self, threshold=1.0):
+        """Seconds since the process last used more than threshold CPU percent"""
+        if not self.samples:
+            return 0.0
+        newest = self.samples[-1][0]
+        for timestamp, cpu_percent, _ in reversed(self.samples):
+            if cpu_percent > threshold:
+                return newest - timestamp
+        return newest - self.samples[0][0]
+
+
+class ProcessRegistry:
+    """Shared registry of running processes updated incrementally
+
+    Each update refreshes the process table once, diffs the set of
+    (pid, create_time) identities against the previous tick to emit spawn
+    and exit events, and appends the new readings to per-process rolling
+    statistics. Consumers query the registry instead of walking
+    psutil.process_iter themselves.
+    """
+
+    def __init__(self, table=None, interval=1.0, window=60):
+        """
+        Initialize the registry
+
+        Args:
+            table: ProcessTable to refresh (shared table if None)
+            interval: Seconds between background updates
+            window: Samples kept per process for rolling statistics
+        """
+        self.table = table or get_shared_process_table()
+        self.interval = interval
+        self.window = window
+        self._lock = threading.RLock()
+        self._rows = {}
+        self._stats = {}
+        self.index = ProcessIndex()
+        self._subscribers = []
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.updated_at = 0.0
+
+    # ======================
+    # LIFECYCLE
+    # ======================
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start background updates (no-op if already running)"""
+        with self._lock:
+            if self.running:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="ProcessRegistry", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop background updates"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=self.interval + 1)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                self.update()
+            except Exception as e:
+                print(f"Process registry error: {e}")
+            self._stop_event.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    # ======================
+    # EVENTS
+    # ======================
+
+    def subscribe(self, callback):
+        """
+        Register callback(event, payload)
+
+        SPAWN and EXIT events carry the ProcessRow; after them, one TICK
+        event per update carries the {pid: ProcessRow} of that tick.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        """Remove a previously registered callback"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    # ======================
+    # UPDATES
+    # ======================
+
+    def update(self):
+        """
+        Refresh the table and diff it against the previous tick
+
+        Returns:
+            (spawned rows, exited rows)
+        """
+        with self._lock:
+            rows = self.table.refresh()
+            now = self.table.refreshed_at
+            previous = self._rows
+            spawned = []
+            exited = []
+            added = []
+            updated = []
+
+            for pid, old in previous.items():
+                new = rows.get(pid)
+                if new is None or new.create_time != old.create_time:
+                    exited.append(old)
+                    self._stats.pop(pid, None)
+
+            for pid, row in rows.items():
+                stats = self._stats.get(pid)
+                if stats is None:
+                    stats = self._stats[pid] = ProcessStats(now, self.window)
+                    added.append(row)
+                    if previous:
+                        spawned.append(row)
+                else:
+                    updated.append(row)
+                stats.add(now, row.cpu_percent, row.memory_rss)
+
+            self.index.apply(added, exited, updated)
+            self._rows = rows
+            self.updated_at = now
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            for row in exited:
+                callback(EXIT, row)
+            for row in spawned:
+                callback(SPAWN, row)
+            callback(TICK, rows)
+        return spawned, exited
+
+    # ======================
+    # QUERIES
+    # ======================
+
+    def rows(self, max_age=1.0):
+        """Return {pid: ProcessRow}, updating first if older than max_age"""
+        if max_age is not None and time.time() - self.updated_at > max_age:
+            self.update()
+        return self._rows
+
+    def stats(self, pid):
+        """Return the ProcessStats of pid (None if not tracked)"""
+        return self._stats.get(pid)
+
+    def process(self, pid):
+        """Return the psutil.Process for pid (None if not tracked)"""
+        return self.table.process(pid)
+
+    def items(self, max_age=1.0):
+        """Return [(ProcessRow, ProcessStats)] for all tracked processes"""
+        rows = self.rows(max_age)
+        with self._lock:
+            return [(row, self._stats[pid]) for pid, row in rows.items() if pid in self._stats]
+
+    def lookup(self, max_age=1.0):
+        """Return the ProcessIndex, updating first if older than max_age"""
+        self.rows(max_age)
+        return self.index
+
+    def top(self, n, key='cpu_percent', max_age=1.0):
+        """Return the n largest rows by a ProcessRow field"""
+        return self.lookup(max_age).top(n, key)
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_process_registry():
+    """Return the process-wide registry shared by all QuantumDesk modules"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ProcessRegistry()
+        return _shared_registry
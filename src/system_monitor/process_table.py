@@ -0,0 +1,185 @@
+"""
+QuantumDesk Process Table
+Batched process sampling with persistent Process objects and delta CPU
+"""
+
+import heapq
+import threading
+import time
+from collections import namedtuple
+from operator import attrgetter
+
+import psutil
+
+ProcessRow = namedtuple('ProcessRow', [
+    'pid',
+    'ppid',
+    'name',
+    'username',
+    'status',
+    'create_time',
+    'cpu_percent',      # since the previous refresh (100 = one full core)
+    'cpu_time',         # user + system seconds
+    'memory_rss',       # bytes
+    'memory_percent',
+    'io_bytes',         # read + write bytes (None if unavailable)
+])
+
+
+class ProcessTable:
+    """Table of running processes refreshed in one batched pass
+
+    psutil.Process objects are kept between refreshes so CPU utilisation is
+    computed from cpu_times deltas (a first sighting uses the average since
+    the process started instead of psutil's meaningless first 0.0). All
+    per-process fields are read inside a single oneshot() block, and static
+    fields such as name and username are only read once per process.
+    """
+
+    def __init__(self):
+        """Initialize an empty process table"""
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._rows = {}
+        self.refreshed_at = 0.0
+
+    def refresh(self):
+        """Sample every running process; returns {pid: ProcessRow}"""
+        with self._lock:
+            now = time.time()
+            total_memory = psutil.virtual_memory().total or 1
+            live = set(psutil.pids())
+
+            for pid in set(self._entries) - live:
+                del self._entries[pid]
+
+            rows = {}
+            for pid in live:
+                entry = self._entries.get(pid)
+                if entry is not None and not self._same_process(entry['process']):
+                    # The PID was reused: start over with a fresh Process and static fields
+                    entry = None
+                if entry is None:
+                    try:
+                        entry = {'process': psutil.Process(pid), 'static': None, 'cpu_time': None, 'sampled': None}
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        continue
+                    self._entries[pid] = entry
+                row = self._sample(entry, now, total_memory)
+                if row is None:
+                    self._entries.pop(pid, None)
+                    continue
+                rows[pid] = row
+
+            self._rows = rows
+            self.refreshed_at = now
+            return rows
+
+    @staticmethod
+    def _same_process(process):
+        """False if the cached Process exited and its PID now belongs to another process
+
+        psutil caches the create time on the Process object, so reuse can only
+        be detected by is_running(), which compares it with a fresh reading.
+        """
+        try:
+            return process.is_running()
+        except psutil.AccessDenied:
+            return True
+
+    def _sample(self, entry, now, total_memory):
+        """Read one process inside oneshot(); None if it is gone"""
+        process = entry['process']
+        try:
+            with process.oneshot():
+                try:
+                    create_time = process.create_time()
+                except psutil.AccessDenied:
+                    create_time = 0.0
+                static = entry['static']
+                if static is None:
+                    try:
+                        username = process.username()
+                    except (psutil.AccessDenied, KeyError):
+                        username = None
+                    static = entry['static'] = (process.name(), username)
+                    entry['cpu_time'] = None
+                status = process.status()
+                ppid = process.ppid()
+                try:
+                    times = process.cpu_times()
+                    cpu_time = times.user + times.system
+                except psutil.AccessDenied:
+                    cpu_time = None
+                try:
+                    rss = process.memory_info().rss
+                except psutil.AccessDenied:
+                    rss = 0
+                try:
+                    io = process.io_counters()
+                    io_bytes = io.read_bytes + io.write_bytes
+                except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                    io_bytes = None
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return None
+        except psutil.AccessDenied:
+            return None
+
+        cpu_percent = 0.0
+        if cpu_time is not None:
+            if entry['cpu_time'] is not None:
+                elapsed = now - entry['sampled']
+                if elapsed > 0:
+                    cpu_percent = (cpu_time - entry['cpu_time']) / elapsed * 100
+            else:
+                lifetime = now - create_time
+                if create_time and lifetime > 0:
+                    cpu_percent = cpu_time / lifetime * 100
+            entry['cpu_time'] = cpu_time
+            entry['sampled'] = now
+
+        return ProcessRow(
+            pid=process.pid,
+            ppid=ppid,
+            name=static[0],
+            username=static[1],
+            status=status,
+            create_time=create_time,
+            cpu_percent=round(max(0.0, cpu_percent), 1),
+            cpu_time=cpu_time,
+            memory_rss=rss,
+            memory_percent=rss / total_memory * 100,
+            io_bytes=io_bytes,
+        )
+
+    def rows(self, max_age=None):
+        """
+        Return {pid: ProcessRow}, refreshing if older than max_age seconds
+
+        With max_age None the last refresh is returned as is.
+        """
+        if max_age is not None and time.time() - self.refreshed_at > max_age:
+            return self.refresh()
+        return self._rows
+
+    def process(self, pid):
+        """Return the cached psutil.Process for pid (None if unknown)"""
+        entry = self._entries.get(pid)
+        return entry['process'] if entry else None
+
+    def top(self, n, key='cpu_percent', max_age=None):
+        """Return the n largest rows by key using a heap (no full sort)"""
+        return heapq.nlargest(n, self.rows(max_age).values(), key=attrgetter(key))
+
+
+_shared_table = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_process_table():
+    """Return the process-wide table shared by all QuantumDesk modules"""
+    global _shared_table
+    with _shared_lock:
+        if _shared_table is None:
+            _shared_table = ProcessTable()
+        return _shared_table
@@ -0,0 +1,304 @@
+"""
+QuantumDesk Metrics Sampler
+Single background sampler that polls system counters once per tick and
+publishes immutable snapshots to every subscriber
+"""
+
+import psutil
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from .cpu_sampler import CpuDeltaSampler
+
+try:
+    import GPUtil
+except ImportError:
+    GPUtil = None
+
+
+MetricsSnapshot = namedtuple('MetricsSnapshot', [
+    'timestamp',        # time.time() of the sample
+    'tick',             # monotonically increasing sample counter
+    'cpu_percent',      # overall CPU utilisation
+    'cpu_per_core',     # tuple of per-core utilisation
+    'memory',           # psutil.virtual_memory() result
+    'swap',             # psutil.swap_memory() result
+    'disk_usage',       # read-only {device: percent used}
+    'disk_io',          # psutil.disk_io_counters() result or None
+    'net_io',           # psutil.net_io_counters() result or None
+    'gpu_load',         # first GPU load in percent (0 if unavailable)
+    'gpu_temperature',  # first GPU temperature in °C (0 if unavailable)
+    'battery',          # psutil.sensors_battery() result or None
+])
+
+
+class MetricsSampler:
+    """Background service that samples system metrics once per tick
+
+    The sampler never polls faster than its fastest subscriber needs:
+    the tick interval is the base interval or, if every subscriber asked
+    for fewer deliveries, the shortest subscriber min_interval. A hidden
+    monitor therefore slows the whole sampler (and its GPU and disk
+    probes) down to what the remaining consumers require.
+    """
+
+    def __init__(self, interval=0.5, gpu_every=2, disk_every=5):
+        """
+        Initialize the Metrics Sampler
+
+        Args:
+            interval: Base (fastest) seconds between samples
+            gpu_every: Sample GPU counters every N ticks
+            disk_every: Sample disk usage and battery every N ticks
+        """
+        self.base_interval = interval
+        self.interval = interval
+        self.gpu_every = max(1, gpu_every)
+        self.disk_every = max(1, disk_every)
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread = None
+        self._subscribers = {}
+        self._latest = None
+        self._tick = 0
+
+        # Slow counters are cached between refreshes
+        self._gpu = (0, 0)
+        self._disk_usage = MappingProxyType({})
+        self._battery = None
+
+        # CPU utilisation is computed from cpu_times deltas between ticks
+        self._cpu = CpuDeltaSampler()
+
+    # ======================
+    # LIFECYCLE
+    # ======================
+
+    @property
+    def running(self):
+        """True while the sampling thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the sampling thread (no-op if already running)"""
+        with self._lock:
+            if self.running:
+                return
+            self._stop_event.clear()
+            self._wake_event.clear()
+            self._thread = threading.Thread(target=self._run, name="MetricsSampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the sampling thread"""
+        self._stop_event.set()
+        self._wake_event.set()
+        thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=self.interval + 1)
+        self._thread = None
+
+    def set_interval(self, interval):
+        """Change the base (fastest) sampling interval"""
+        with self._lock:
+            self.base_interval = interval
+            self._retune()
+
+    def _retune(self):
+        """Derive the tick interval from the subscribers (called with _lock held)"""
+        interval = self.base_interval
+        if self._subscribers:
+            interval = max(interval, min(state[0] for state in self._subscribers.values()))
+        shorter = interval < self.interval
+        self.interval = interval
+        if shorter:
+            # Do not sleep out the rest of a long tick
+            self._wake_event.set()
+
+    # ======================
+    # SUBSCRIPTIONS
+    # ======================
+
+    def subscribe(self, callback, min_interval=0):
+        """
+        Register a callback that receives every new snapshot
+
+        Args:
+            callback: Function called with a MetricsSnapshot
+            min_interval: Minimum seconds between deliveries to this callback
+        """
+        with self._lock:
+            self._subscribers[callback] = [min_interval, 0.0]
+            self._retune()
+        return callback
+
+    def set_min_interval(self, callback, min_interval):
+        """
+        Change how often one subscriber receives snapshots
+
+        Other subscribers keep their rate; the sampler itself only slows
+        down when no subscriber needs the faster rate any more.
+        """
+        with self._lock:
+            state = self._subscribers.get(callback)
+            if state is not None:
+                state[0] = min_interval
+                self._retune()
+
+    def unsubscribe(self, callback):
+        """Remove a previously registered callback"""
+        with self._lock:
+            self._subscribers.pop(callback, None)
+            self._retune()
+
+    def has_subscribers(self):
+        """Return True if any callback is registered"""
+        with self._lock:
+            return bool(self._subscribers)
+
+    def latest(self):
+        """Return the most recent snapshot (None before the first tick)"""
+        return self._latest
+
+    def snapshot(self, max_age=None):
+        """
+        Return a snapshot no older than max_age seconds
+
+        Uses the cached sample while the sampler is running and only samples
+        synchronously when nothing fresh enough is available.
+        """
+        if max_age is None:
+            max_age = self.interval * 2
+        latest = self._latest
+        if latest is not None and time.time() - latest.timestamp <= max_age:
+            return latest
+        return self.sample()
+
+    # ======================
+    # SAMPLING
+    # ======================
+
+    def sample(self):
+        """Collect one snapshot immediately and publish it"""
+        with self._lock:
+            self._tick += 1
+            tick = self._tick
+
+        if tick == 1 or tick % self.gpu_every == 0:
+            self._gpu = self._sample_gpu()
+        if tick == 1 or tick % self.disk_every == 0:
+            self._disk_usage = MappingProxyType(self._sample_disk_usage())
+            self._battery = self._sample_battery()
+
+        try:
+            disk_io = psutil.disk_io_counters()
+        except Exception:
+            disk_io = None
+        try:
+            net_io = psutil.net_io_counters()
+        except Exception:
+            net_io = None
+
+        cpu_percent, cpu_per_core = self._cpu.sample()
+
+        snapshot = MetricsSnapshot(
+            timestamp=time.time(),
+            tick=tick,
+            cpu_percent=cpu_percent,
+            cpu_per_core=tuple(cpu_per_core),
+            memory=psutil.virtual_memory(),
+            swap=psutil.swap_memory(),
+            disk_usage=self._disk_usage,
+            disk_io=disk_io,
+            net_io=net_io,
+            gpu_load=self._gpu[0],
+            gpu_temperature=self._gpu[1],
+            battery=self._battery,
+        )
+        self._latest = snapshot
+        self._publish(snapshot)
+        return snapshot
+
+    def _run(self):
+        """Sampling loop executed on the background thread"""
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Metrics sampler error: {e}")
+            # Sleep until the next tick, stop() or a shorter interval
+            while not self._stop_event.is_set():
+                remaining = self.interval - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                if self._wake_event.wait(remaining):
+                    self._wake_event.clear()
+
+    def _publish(self, snapshot):
+        """Deliver a snapshot to every subscriber that is due"""
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        # Tick timestamps jitter; half a tick of slack keeps a subscriber
+        # whose min_interval equals the tick interval on every tick
+        slack = self.interval / 2
+        for callback, state in subscribers:
+            min_interval, last_delivery = state
+            if min_interval and snapshot.timestamp - last_delivery < min_interval - slack:
+                continue
+            state[1] = snapshot.timestamp
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Metrics subscriber error: {e}")
+
+    @staticmethod
+    def _sample_gpu():
+        """Return (load percent, temperature) of the first GPU"""
+        if GPUtil is None:
+            return (0, 0)
+        try:
+            gpus = GPUtil.getGPUs()
+            if gpus:
+                return (int(gpus[0].load * 100), int(gpus[0].temperature))
+        except Exception:
+            pass
+        return (0, 0)
+
+    @staticmethod
+    def _sample_disk_usage():
+        """Return {device: percent used} for all fixed drives"""
+        usage = {}
+        for part in psutil.disk_partitions(all=True):
+            if not part.fstype or part.opts.find('cdrom') != -1:
+                continue
+            try:
+                usage[part.device] = psutil.disk_usage(part.mountpoint).percent
+            except Exception:
+                usage[part.device] = 0
+        return usage
+
+    @staticmethod
+    def _sample_battery():
+        """Return the battery status or None"""
+        try:
+            return psutil.sensors_battery()
+        except Exception:
+            return None
+
+
+_shared_sampler = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_sampler():
+    """Return the process-wide sampler shared by all QuantumDesk modules"""
+    global _shared_sampler
+    with _shared_lock:
+        if _shared_sampler is None:
+            _shared_sampler = MetricsSampler()
+        return _shared_sampler
@@ -3,6 +3,16 @@ QuantumDesk System Optimizer Package
 Elite system optimization tools for Windows
 """
 
+from file_cleanup import CleanupEngine, CleanupPlan, CleanupPlanner, CleanupStats, CleanupTarget
+from .cleanup_pipeline import CleanupPipeline, PipelineStage
+from .memory_trimmer import FakeTrimBackend, LinuxCgroupTrimBackend, MemoryTrimmer, WindowsTrimBackend
+from .memory_watchdog import MemoryWatchdog, PressureTier
 from .optimizer import SystemOptimizer
+from .retention import DEFAULT_POLICIES, RetentionPolicy
+from .scheduler import PROFILES, ProcessScheduler, SchedulingProfile
+from .termination import TerminationEngine
 
-__all__ = ['SystemOptimizer']
+__all__ = ['CleanupEngine', 'CleanupPipeline', 'CleanupPlan', 'CleanupPlanner', 'CleanupStats', 'CleanupTarget',
+           'DEFAULT_POLICIES', 'FakeTrimBackend', 'LinuxCgroupTrimBackend', 'MemoryTrimmer', 'MemoryWatchdog',
+           'PROFILES', 'PipelineStage', 'PressureTier', 'ProcessScheduler', 'RetentionPolicy', 'SchedulingProfile',
+           'SystemOptimizer', 'TerminationEngine', 'WindowsTrimBackend']
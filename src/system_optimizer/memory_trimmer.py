@@ -0,0 +1,369 @@
+"""
+QuantumDesk Memory Trimmer
+Working-set trimming of other processes through pluggable OS backends
+"""
+
+import os
+import sys
+
+import psutil
+
+
+class PsutilMemoryMixin:
+    """Resident memory measurement shared by the real backends"""
+
+    def memory(self, pid):
+        """Return the resident bytes of pid (None if it is gone)"""
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+
+class WindowsTrimBackend(PsutilMemoryMixin):
+    """Trim working sets with psapi.EmptyWorkingSet"""
+
+    PROCESS_SET_QUOTA = 0x0100
+    PROCESS_QUERY_INFORMATION = 0x0400
+    TOKEN_ADJUST_PRIVILEGES = 0x0020
+    TOKEN_QUERY = 0x0008
+    SE_PRIVILEGE_ENABLED = 0x0002
+    ERROR_NOT_ALL_ASSIGNED = 1300
+
+    def __init__(self):
+        """Initialize the backend (raises OSError/AttributeError off Windows)"""
+        import ctypes
+        from ctypes import wintypes
+        self._kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self._psapi = ctypes.WinDLL('psapi', use_last_error=True)
+        self._advapi32 = ctypes.WinDLL('advapi32', use_last_error=True)
+        self._kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        self._kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+        self._kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+        self._psapi.EmptyWorkingSet.argtypes = (wintypes.HANDLE,)
+        self._psapi.EmptyWorkingSet.restype = wintypes.BOOL
+        self._kernel32.SetSystemFileCacheSize.argtypes = (ctypes.c_size_t, ctypes.c_size_t, wintypes.DWORD)
+        self._kernel32.SetSystemFileCacheSize.restype = wintypes.BOOL
+        self._advapi32.OpenProcessToken.argtypes = (wintypes.HANDLE, wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE))
+        self._advapi32.OpenProcessToken.restype = wintypes.BOOL
+        self._advapi32.LookupPrivilegeValueW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p)
+        self._advapi32.LookupPrivilegeValueW.restype = wintypes.BOOL
+        self._advapi32.AdjustTokenPrivileges.argtypes = (wintypes.HANDLE, wintypes.BOOL, ctypes.c_void_p,
+                                                         wintypes.DWORD, ctypes.c_void_p, ctypes.c_void_p)
+        self._advapi32.AdjustTokenPrivileges.restype = wintypes.BOOL
+        self._quota_privilege = None
+
+    def group(self, pid):
+        """Working sets are per process, so every process is its own group"""
+        return pid
+
+    def trim(self, pid, target_bytes=None):
+        """Move the process's pages out of its working set; True on success"""
+        access = self.PROCESS_SET_QUOTA | self.PROCESS_QUERY_INFORMATION
+        handle = self._kernel32.OpenProcess(access, False, pid)
+        if not handle:
+            return False
+        try:
+            return bool(self._psapi.EmptyWorkingSet(handle))
+        finally:
+            self._kernel32.CloseHandle(handle)
+
+    def _enable_privilege(self, name):
+        """Enable a privilege held by the process token; False if it is not held"""
+        import ctypes
+        from ctypes import wintypes
+
+        class LUID(ctypes.Structure):
+            _fields_ = [('LowPart', wintypes.DWORD), ('HighPart', wintypes.LONG)]
+
+        class LUID_AND_ATTRIBUTES(ctypes.Structure):
+            _fields_ = [('Luid', LUID), ('Attributes', wintypes.DWORD)]
+
+        class TOKEN_PRIVILEGES(ctypes.Structure):
+            _fields_ = [('PrivilegeCount', wintypes.DWORD), ('Privileges', LUID_AND_ATTRIBUTES * 1)]
+
+        token = wintypes.HANDLE()
+        if not self._advapi32.OpenProcessToken(self._kernel32.GetCurrentProcess(),
+                                               self.TOKEN_ADJUST_PRIVILEGES | self.TOKEN_QUERY,
+                                               ctypes.byref(token)):
+            return False
+        try:
+            privileges = TOKEN_PRIVILEGES(1)
+            privileges.Privileges[0].Attributes = self.SE_PRIVILEGE_ENABLED
+            if not self._advapi32.LookupPrivilegeValueW(None, name, ctypes.byref(privileges.Privileges[0].Luid)):
+                return False
+            if not self._advapi32.AdjustTokenPrivileges(token, False, ctypes.byref(privileges), 0, None, None):
+                return False
+            # AdjustTokenPrivileges also succeeds when the token lacks the privilege
+            return ctypes.get_last_error() != self.ERROR_NOT_ALL_ASSIGNED
+        finally:
+            self._kernel32.CloseHandle(token)
+
+    def trim_file_cache(self):
+        """Flush the system file cache working set (needs SeIncreaseQuotaPrivilege, i.e. elevation)"""
+        if self._quota_privilege is None:
+            # Held by administrators but disabled by default in every token
+            self._quota_privilege = self._enable_privilege('SeIncreaseQuotaPrivilege')
+        if not self._quota_privilege:
+            return False
+        return bool(self._kernel32.SetSystemFileCacheSize(-1, -1, 0))
+
+
+class LinuxCgroupTrimBackend(PsutilMemoryMixin):
+    """Proactive reclaim through the cgroup v2 memory.reclaim interface
+
+    The kernel reclaims from the process's whole cgroup (least recently
+    used pages first), so trimming one process can also shrink its
+    siblings. Processes sharing a cgroup are therefore trimmed as one
+    group with a single request; reclaimed bytes are still measured per
+    process. There is no file cache trim: clean page cache already counts
+    as available memory, so dropping it would not relieve pressure.
+    """
+
+    def __init__(self, cgroup_root='/sys/fs/cgroup', proc_root='/proc', fraction=0.25):
+        """
+        Initialize the backend
+
+        Args:
+            cgroup_root: cgroup2 mount point (hybrid hosts use root/unified)
+            proc_root: procfs mount point
+            fraction: Share of the process's RSS requested when no target is given
+        """
+        self.cgroup_root = cgroup_root
+        self.proc_root = proc_root
+        self.fraction = fraction
+
+    def cgroup_path(self, pid):
+        """Return the memory.reclaim file of pid's cgroup (None if unsupported)"""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), 'cgroup')) as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        for line in lines:
+            hierarchy, _, path = line.split(':', 2)
+            if hierarchy != '0':
+                continue
+            for mount in (self.cgroup_root, os.path.join(self.cgroup_root, 'unified')):
+                reclaim = os.path.join(mount, path.lstrip('/'), 'memory.reclaim')
+                if os.path.exists(reclaim):
+                    return reclaim
+        return None
+
+    def group(self, pid):
+        """Processes sharing a memory.reclaim file are reclaimed together (None if unsupported)"""
+        return self.cgroup_path(pid)
+
+    def trim(self, pid, target_bytes=None):
+        """Ask the kernel to reclaim target_bytes from pid's cgroup; True if accepted"""
+        return self.trim_group([pid], target_bytes)
+
+    def trim_group(self, pids, target_bytes=None):
+        """
+        Reclaim once from the cgroup shared by pids; True if accepted
+
+        Without target_bytes the request is fraction of the processes' combined RSS.
+        """
+        reclaim = self.cgroup_path(pids[0])
+        if reclaim is None:
+            return False
+        if target_bytes is None:
+            rss = sum(self.memory(pid) or 0 for pid in pids)
+            target_bytes = int(rss * self.fraction)
+        if target_bytes <= 0:
+            return False
+        try:
+            with open(reclaim, 'w') as f:
+                f.write(str(target_bytes))
+            return True
+        except BlockingIOError:
+            # EAGAIN: the kernel reclaimed less than requested
+            return True
+        except OSError:
+            return False
+
+
+class FakeTrimBackend:
+    """In-memory backend for tests and unsupported hosts"""
+
+    def __init__(self, resident=None, reclaim_ratio=0.5, failing=(), groups=None):
+        """
+        Initialize the fake backend
+
+        Args:
+            resident: {pid: resident bytes}
+            reclaim_ratio: Share of a process's memory released by trim()
+            failing: PIDs whose trim() fails
+            groups: {pid: group key} of processes reclaimed together
+        """
+        self.resident = dict(resident or {})
+        self.reclaim_ratio = reclaim_ratio
+        self.failing = set(failing)
+        self.groups = dict(groups or {})
+        self.trimmed = []
+        self.group_trims = []
+        self.cache_trims = 0
+
+    def memory(self, pid):
+        return self.resident.get(pid)
+
+    def group(self, pid):
+        return self.groups.get(pid, pid)
+
+    def trim_group(self, pids, target_bytes=None):
+        self.group_trims.append(list(pids))
+        results = [self.trim(pid) for pid in pids]
+        return all(results)
+
+    def trim(self, pid, target_bytes=None):
+        if pid in self.failing or pid not in self.resident:
+            return False
+        released = int(self.resident[pid] * self.reclaim_ratio)
+        if target_bytes is not None:
+            released = min(released, target_bytes)
+        self.resident[pid] -= released
+        self.trimmed.append(pid)
+        return True
+
+    def trim_file_cache(self):
+        self.cache_trims += 1
+        return True
+
+
+def create_default_backend():
+    """Return the trim backend of this OS, or None if there is none"""
+    try:
+        if sys.platform == 'win32':
+            return WindowsTrimBackend()
+        if sys.platform.startswith('linux'):
+            backend = LinuxCgroupTrimBackend()
+            reclaim = backend.cgroup_path(os.getpid())
+            # memory.reclaim is root-owned outside delegated cgroups
+            if reclaim is not None and os.access(reclaim, os.W_OK):
+                return backend
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+class MemoryTrimmer:
+    """Rank processes and reclaim their memory through a trim backend
+
+    Candidates come from the shared process registry: processes whose RSS
+    grew over the registry window, or that have been idle while holding a
+    lot of memory, are trimmed first. Candidates the backend reclaims
+    together (one cgroup on Linux) are trimmed with one request per group.
+    Reclaimed memory is measured from per-process snapshots taken before
+    and after trimming.
+    """
+
+    def __init__(self, backend, registry, min_rss=50 * 1024 * 1024, idle_threshold=1.0, protected=()):
+        """
+        Initialize the trimmer
+
+        Args:
+            backend: Object with group(pid), trim(pid, target_bytes=None),
+                     trim_group(pids) (for groups of several processes),
+                     memory(pid) and, where the OS has one, trim_file_cache()
+            registry: ProcessRegistry providing rows and rolling statistics
+            min_rss: Ignore processes smaller than this many bytes
+            idle_threshold: CPU percent under which a process counts as idle
+            protected: Lowercase process names never trimmed
+        """
+        self.backend = backend
+        self.registry = registry
+        self.min_rss = min_rss
+        self.idle_threshold = idle_threshold
+        self.protected = {name.lower() for name in protected}
+
+    def candidates(self, limit=10):
+        """
+        Return [(score, ProcessRow, ProcessStats)] best candidates first
+
+        score = RSS growth over the window + RSS x share of the window idle
+        """
+        own_pid = os.getpid()
+        ranked = []
+        for row, stats in self.registry.items():
+            if row.pid == own_pid or row.memory_rss < self.min_rss or row.name.lower() in self.protected:
+                continue
+            window = max(stats.samples[-1][0] - stats.samples[0][0], 1.0) if stats.samples else 1.0
+            idle_share = min(stats.idle_seconds(self.idle_threshold) / window, 1.0)
+            score = max(stats.rss_growth, 0) + row.memory_rss * idle_share
+            if score > 0:
+                ranked.append((score, row, stats))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return ranked[:limit]
+
+    @property
+    def supports_file_cache(self):
+        """True if the backend can release the OS file cache"""
+        return hasattr(self.backend, 'trim_file_cache')
+
+    def trim_file_cache(self):
+        """
+        Ask the OS to release its file cache
+
+        Returns:
+            {'success': bool, 'available_before': bytes, 'available_after': bytes}
+        """
+        available_before = psutil.virtual_memory().available
+        success = self.backend.trim_file_cache() if self.supports_file_cache else False
+        return {
+            'success': success,
+            'available_before': available_before,
+            'available_after': psutil.virtual_memory().available,
+        }
+
+    def trim(self, limit=10):
+        """
+        Trim the top candidates
+
+        Returns:
+            {'processes': [{'pid', 'name', 'before', 'after', 'reclaimed'}],
+             'reclaimed': bytes, 'trimmed': count, 'failed': count,
+             'available_before': bytes, 'available_after': bytes}
+        """
+        available_before = psutil.virtual_memory().available
+        before = {}
+        for _, row, _ in self.candidates(limit):
+            resident = self.backend.memory(row.pid)
+            if resident is not None:
+                before[row.pid] = (row, resident)
+
+        groups = {}
+        for pid in before:
+            groups.setdefault(self.backend.group(pid), []).append(pid)
+
+        failed = 0
+        for key, pids in groups.items():
+            if key is None:
+                success = False
+            elif len(pids) == 1:
+                success = self.backend.trim(pids[0])
+            else:
+                success = self.backend.trim_group(pids)
+            if not success:
+                failed += len(pids)
+
+        processes = []
+        total = 0
+        for pid, (row, resident) in before.items():
+            after = self.backend.memory(pid)
+            if after is None:
+                continue
+            reclaimed = max(0, resident - after)
+            total += reclaimed
+            processes.append({'pid': pid, 'name': row.name, 'before': resident,
+                              'after': after, 'reclaimed': reclaimed})
+        processes.sort(key=lambda item: item['reclaimed'], reverse=True)
+
+        return {
+            'processes': processes,
+            'reclaimed': total,
+            'trimmed': len(before) - failed,
+            'failed': failed,
+            'available_before': available_before,
+            'available_after': psutil.virtual_memory().available,
+        }
@@ -0,0 +1,209 @@
+"""
+QuantumDesk Memory Watchdog
+Background memory-pressure tiers with hysteresis on the shared sampler
+"""
+
+import sys
+import threading
+import time
+from collections import namedtuple
+
+# A tier is entered when available memory drops below enter_available
+# (percent) or swap traffic exceeds enter_swap_rate (bytes/s), and left
+# only once available memory is back above exit_available and swap
+# traffic below half the entry rate. The gap between the two is the
+# hysteresis that keeps the watchdog from flapping at a threshold.
+PressureTier = namedtuple('PressureTier', ['level', 'name', 'enter_available', 'exit_available', 'enter_swap_rate'])
+
+DEFAULT_TIERS = (
+    PressureTier(1, 'trim_caches', 20.0, 25.0, None),
+    PressureTier(2, 'trim_idle', 10.0, 15.0, 10 * 1024 * 1024),
+    PressureTier(3, 'suggest_termination', 5.0, 8.0, 50 * 1024 * 1024),
+)
+
+# psutil reports swap-in/out bytes on Linux and macOS; on Windows sin/sout
+# are always 0, so only available memory drives the tiers there
+SWAP_TRAFFIC_REPORTED = sys.platform != 'win32'
+
+
+class MemoryWatchdog:
+    """Escalate through memory-pressure tiers and run their actions
+
+    The watchdog subscribes to the shared metrics sampler. A higher tier is
+    only entered after its condition held for `sustain` consecutive
+    snapshots, and a tier is only left once its exit condition holds, so
+    brief spikes and values hovering at a threshold do not trigger actions.
+    Every tier up to the current one runs its action on entry and then at
+    most once per `cooldown` seconds, on a separate thread so the sampler
+    is never blocked. Swap-rate thresholds are ignored where the OS does not
+    report swap traffic (see SWAP_TRAFFIC_REPORTED).
+    """
+
+    def __init__(self, sampler, actions, tiers=DEFAULT_TIERS, sustain=3, cooldown=60,
+                 interval=2, on_event=None, swap_traffic=SWAP_TRAFFIC_REPORTED):
+        """
+        Initialize the watchdog
+
+        Args:
+            sampler: MetricsSampler delivering snapshots
+            actions: {tier level: callable returning a result dict}
+            tiers: PressureTier tuple ordered by level
+            sustain: Consecutive snapshots required before escalating
+            cooldown: Minimum seconds between two runs of the same action
+            interval: Minimum seconds between evaluated snapshots
+            on_event: Optional callback(event dict) for tier changes and actions
+            swap_traffic: False to drop the tiers' swap-rate thresholds
+        """
+        self.sampler = sampler
+        self.actions = dict(actions)
+        if not swap_traffic:
+            tiers = [tier._replace(enter_swap_rate=None) for tier in tiers]
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier.level))
+        self.sustain = sustain
+        self.cooldown = cooldown
+        self.interval = interval
+        self.on_event = on_event
+        self.level = 0
+        self.swap_rate = 0.0
+        self._pending_level = 0
+        self._pending_count = 0
+        self._last_swap = None
+        self._last_run = {}
+        self._action_thread = None
+        self._handler = None
+
+    # ======================
+    # LIFECYCLE
+    # ======================
+
+    @property
+    def running(self):
+        return self._handler is not None
+
+    def start(self):
+        """Subscribe to the sampler (no-op if already running)"""
+        if self._handler is None:
+            self._handler = self.sampler.subscribe(self._on_snapshot, min_interval=self.interval)
+            self.sampler.start()
+
+    def stop(self):
+        """Unsubscribe; the sampler stops if nothing else uses it"""
+        if self._handler is not None:
+            self.sampler.unsubscribe(self._handler)
+            self._handler = None
+            if not self.sampler.has_subscribers():
+                self.sampler.stop()
+
+    def _on_snapshot(self, snapshot):
+        try:
+            self.evaluate(snapshot)
+        except Exception as e:
+            print(f"Memory watchdog error: {e}")
+
+    # ======================
+    # EVALUATION
+    # ======================
+
+    def tier(self, level):
+        """Return the PressureTier of a level (None for level 0)"""
+        for tier in self.tiers:
+            if tier.level == level:
+                return tier
+        return None
+
+    def _swap_rate(self, snapshot):
+        """Swap-in plus swap-out bytes per second since the previous snapshot"""
+        swapped = snapshot.swap.sin + snapshot.swap.sout
+        previous, self._last_swap = self._last_swap, (snapshot.timestamp, swapped)
+        if previous is None or snapshot.timestamp <= previous[0]:
+            return 0.0
+        return max(0.0, (swapped - previous[1]) / (snapshot.timestamp - previous[0]))
+
+    def _target_level(self, available, swap_rate):
+        """Highest tier whose entry condition holds"""
+        target = 0
+        for tier in self.tiers:
+            if available < tier.enter_available or (tier.enter_swap_rate and swap_rate > tier.enter_swap_rate):
+                target = tier.level
+        return target
+
+    def _holds(self, tier, available, swap_rate):
+        """True while the tier's exit condition is not met yet"""
+        swap_high = tier.enter_swap_rate and swap_rate > tier.enter_swap_rate / 2
+        return available < tier.exit_available or bool(swap_high)
+
+    def evaluate(self, snapshot):
+        """
+        Update the pressure level from one snapshot and run due actions
+
+        Returns:
+            The current tier level (0 when there is no pressure)
+        """
+        available = 100.0 - snapshot.memory.percent
+        swap_rate = self.swap_rate = self._swap_rate(snapshot)
+        target = self._target_level(available, swap_rate)
+
+        if target > self.level:
+            # Escalate only once the condition is sustained
+            if target == self._pending_level:
+                self._pending_count += 1
+            else:
+                self._pending_level, self._pending_count = target, 1
+            if self._pending_count >= self.sustain:
+                self._change_level(target, available, swap_rate)
+        else:
+            self._pending_level, self._pending_count = 0, 0
+            # De-escalate tier by tier once each exit condition is met
+            level = self.level
+            while level > 0 and not self._holds(self.tier(level), available, swap_rate):
+                level -= 1
+            if level != self.level:
+                self._change_level(level, available, swap_rate)
+
+        if self.level:
+            self._run_due_actions(available, swap_rate)
+        return self.level
+
+    def _change_level(self, level, available, swap_rate):
+        previous, self.level = self.level, level
+        self._pending_level, self._pending_count = 0, 0
+        if level < previous:
+            # Actions run again immediately on the next escalation
+            for stale in range(level + 1, previous + 1):
+                self._last_run.pop(stale, None)
+        tier = self.tier(level)
+        self._emit({'event': 'tier', 'level': level, 'previous': previous,
+                    'name': tier.name if tier else 'normal',
+                    'available_percent': available, 'swap_rate': swap_rate})
+
+    def _run_due_actions(self, available, swap_rate):
+        """Start the due actions of every tier up to the current level"""
+        if self._action_thread is not None and self._action_thread.is_alive():
+            return
+        now = time.monotonic()
+        due = [tier for tier in self.tiers
+               if tier.level <= self.level and tier.level in self.actions
+               and now - self._last_run.get(tier.level, float('-inf')) >= self.cooldown]
+        if not due:
+            return
+        for tier in due:
+            self._last_run[tier.level] = now
+
+        def run():
+            for tier in due:
+                try:
+                    result = self.actions[tier.level]()
+                except Exception as e:
+                    result = {"status": "error", "message": f"Error: {str(e)}"}
+                self._emit({'event': 'action', 'level': tier.level, 'name': tier.name,
+                            'available_percent': available, 'swap_rate': swap_rate, 'result': result})
+
+        self._action_thread = threading.Thread(target=run, name="MemoryWatchdogAction", daemon=True)
+        self._action_thread.start()
+
+    def _emit(self, event):
+        if self.on_event:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                print(f"Memory watchdog callback error: {e}")
@@ -7,16 +7,45 @@ import psutil
 import subprocess
 import os
 import gc
-import winreg
 import shutil
 import tempfile
 from pathlib import Path
 import threading
+import atexit
 import time
+import weakref
+# winreg is only needed by scan_startup; the package must import off Windows
+try:
+    import winreg
+except ImportError:
+    winreg = None
+from system_monitor import IdleDetector, create_default_providers, get_shared_process_registry, get_shared_sampler
+from file_cleanup import CleanupEngine, CleanupPlan, CleanupTarget, summarize
+from .cleanup_pipeline import CleanupPipeline, PipelineStage
+from .memory_trimmer import MemoryTrimmer, create_default_backend
+from .memory_watchdog import MemoryWatchdog
+from .retention import DEFAULT_POLICIES
+from .scheduler import ProcessScheduler
+from .termination import TerminationEngine
 
 class SystemOptimizer:
     """Elite System Optimizer with advanced Windows optimization tools"""
     
+    # Processes never terminated by the optimizer
+    PROTECTED_PROCESSES = frozenset({
+        'system', 'dwm.exe', 'explorer.exe', 'winlogon.exe', 
+        'csrss.exe', 'smss.exe', 'wininit.exe', 'services.exe',
+        'lsass.exe', 'svchost.exe'
+    })
+    
+    # Cleanup operations; earlier ones own the directories they share with later ones
+    CLEANUP_OPERATIONS = ('temp', 'cache', 'prefetch')
+    
+    # Live optimizers, shut down by one exit handler registered with the first
+    _instances = weakref.WeakSet()
+    _exit_handler_registered = False
+    _exit_lock = threading.Lock()
+    
     def __init__(self, log_callback=None):
         """
         Initialize the System Optimizer
@@ -26,6 +55,40 @@ class SystemOptimizer:
         """
         self.log_callback = log_callback
         self.optimization_running = False
+        self.sampler = get_shared_sampler()
+        self.processes = get_shared_process_registry()
+        self.processes.start()
+        self.cleanup = CleanupEngine(log_callback=log_callback)
+        self.cleanup_plans = {}
+        self.retention_policies = dict(DEFAULT_POLICIES)
+        
+        # Working-set trimming of other processes (None if the OS has no backend)
+        trim_backend = create_default_backend()
+        self.memory_trimmer = MemoryTrimmer(
+            trim_backend, self.processes,
+            protected={'system', 'csrss.exe', 'smss.exe', 'wininit.exe', 'winlogon.exe', 'lsass.exe', 'services.exe'}
+        ) if trim_backend else None
+        self.memory_watchdog = None
+        self.terminator = TerminationEngine(self.processes, protected=self.PROTECTED_PROCESSES)
+        
+        # Idle history accumulates from startup so end_idle_apps can judge a full window
+        foreground, input_idle = create_default_providers()
+        self.idle_detector = IdleDetector(self.processes, foreground=foreground, input_idle=input_idle)
+        self.idle_detector.start()
+        self.scheduler = ProcessScheduler(self.processes, protected=self.PROTECTED_PROCESSES, foreground=foreground)
+        # Leaving QuantumDesk ends game mode / priority boost and the watchdog too
+        with SystemOptimizer._exit_lock:
+            SystemOptimizer._instances.add(self)
+            if not SystemOptimizer._exit_handler_registered:
+                atexit.register(SystemOptimizer._shutdown_all)
+                SystemOptimizer._exit_handler_registered = True
+        
+    @classmethod
+    def _shutdown_all(cls):
+        """Exit handler: restore scheduling and stop the watchdog of every optimizer"""
+        for optimizer in list(cls._instances):
+            optimizer.stop_memory_watchdog()
+            optimizer.normal_mode()
         
     def log(self, message):
         """Log a message using the callback if available"""
@@ -36,46 +99,50 @@ class SystemOptimizer:
     # MEMORY OPTIMIZATION
     # ======================
     
-    def free_ram(self):
-        """Force garbage collection and free up RAM"""
+    def free_ram(self, limit=10):
+        """
+        Trim the working sets of the processes holding the most reclaimable RAM
+        
+        Args:
+            limit: Maximum number of processes trimmed
+        """
         try:
             gc.collect()
-            mem_before = psutil.virtual_memory().available
-            
-            # Force Python garbage collection
-            for i in range(3):
-                gc.collect()
+            if self.memory_trimmer is None:
+                self.log("RAM optimization: working-set trimming not supported on this system")
+                return {"status": "warning", "message": "Working-set trimming is not supported on this system"}
             
-            mem_after = psutil.virtual_memory().available
-            freed_mb = (mem_after - mem_before) // (1024 * 1024)
+            report = self.memory_trimmer.trim(limit)
+            freed_mb = report['reclaimed'] // (1024 * 1024)
             
-            self.log(f"RAM optimization completed - {freed_mb}MB freed")
-            return {"status": "success", "message": f"RAM freed successfully! {freed_mb}MB recovered"}
+            self.log(f"RAM optimization completed - {freed_mb}MB freed from {report['trimmed']} processes")
+            return {"status": "success",
+                    "message": f"RAM freed successfully! {freed_mb}MB recovered from {report['trimmed']} processes",
+                    "report": report}
         except Exception as e:
             self.log(f"RAM optimization error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
     
-    def clear_cache(self):
-        """Clear system cache and temporary files"""
+    def clear_cache(self, dry_run=False, progress=None):
+        """
+        Clear system cache and temporary files
+
+        Args:
+            dry_run: Only plan the cleanup and report what would be removed
+            progress: Optional callback(seen=, files=, bytes=) for progress
+        """
         try:
-            temp_dir = os.environ.get('TEMP', 'C:\\temp')
-            cache_cleared = 0
-            total_size = 0
-            
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    try:
-                        file_path = os.path.join(root, file)
-                        file_size = os.path.getsize(file_path)
-                        os.remove(file_path)
-                        cache_cleared += 1
-                        total_size += file_size
-                    except:
-                        pass
-            
-            size_mb = total_size // (1024 * 1024)
-            self.log(f"Cache cleanup: {cache_cleared} files removed ({size_mb}MB)")
-            return {"status": "success", "message": f"Cache cleared! {cache_cleared} files removed ({size_mb}MB)"}
+            plan, results = self._run_cleanup('cache', dry_run, progress)
+            if results is None:
+                size_mb = plan.total_bytes // (1024 * 1024)
+                return {"status": "success", "message": f"Cache: {plan.total_files} files can be removed ({size_mb}MB)",
+                        "plan": plan.summary()}
+            total = summarize(results)
+            
+            size_mb = total.bytes // (1024 * 1024)
+            self.log(f"Cache cleanup: {total.files} files removed ({size_mb}MB)")
+            return {"status": "success", "message": f"Cache cleared! {total.files} files removed ({size_mb}MB)",
+                    "categories": {name: stats.as_dict() for name, stats in results.items()}}
         except Exception as e:
             self.log(f"Cache clear error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
@@ -87,82 +154,164 @@ class SystemOptimizer:
             for i in range(3):
                 gc.collect()
             
+            # Trim a wider set of candidates than free_ram
+            reclaimed_mb = 0
+            if self.memory_trimmer is not None:
+                report = self.memory_trimmer.trim(limit=25)
+                reclaimed_mb = report['reclaimed'] // (1024 * 1024)
+            
             # Get memory info
             mem = psutil.virtual_memory()
             available_gb = mem.available // (1024 * 1024 * 1024)
             used_percent = mem.percent
             
-            self.log("Memory optimization completed")
+            self.log(f"Memory optimization completed - {reclaimed_mb}MB reclaimed")
             return {
                 "status": "success", 
-                "message": f"Memory optimized! Available: {available_gb}GB ({100-used_percent:.1f}% free)"
+                "message": f"Memory optimized! {reclaimed_mb}MB reclaimed. Available: {available_gb}GB ({100-used_percent:.1f}% free)"
             }
         except Exception as e:
             self.log(f"Memory optimization error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
     
+    def trim_caches(self):
+        """Release the OS file cache (first memory-pressure tier)"""
+        try:
+            gc.collect()
+            if self.memory_trimmer is None or not self.memory_trimmer.supports_file_cache:
+                return {"status": "warning", "message": "Cache trimming is not supported on this system"}
+            report = self.memory_trimmer.trim_file_cache()
+            if not report['success']:
+                return {"status": "warning", "message": "Cache trimming was refused (insufficient privileges)"}
+            freed_mb = max(0, report['available_after'] - report['available_before']) // (1024 * 1024)
+            self.log(f"File cache trimmed - {freed_mb}MB available")
+            return {"status": "success", "message": f"File cache trimmed! {freed_mb}MB made available", "report": report}
+        except Exception as e:
+            self.log(f"Cache trim error: {str(e)}")
+            return {"status": "error", "message": f"Error: {str(e)}"}
+    
+    def suggest_termination(self, limit=5):
+        """List the largest unprotected processes as termination suggestions (nothing is killed)"""
+        try:
+            protected = self.memory_trimmer.protected if self.memory_trimmer else set()
+            suggestions = []
+            for row in self.processes.lookup().sorted_by('memory_rss'):
+                if len(suggestions) >= limit:
+                    break
+                if row.pid == os.getpid() or row.name.lower() in protected:
+                    continue
+                suggestions.append({"pid": row.pid, "name": row.name, "memory_mb": row.memory_rss // (1024 * 1024)})
+            
+            result_text = "Memory critical! Consider closing:\n"
+            result_text += "\n".join(f"{item['name']} ({item['memory_mb']}MB)" for item in suggestions)
+            self.log(f"Memory critical - suggested closing {len(suggestions)} processes")
+            return {"status": "warning", "message": result_text, "suggestions": suggestions}
+        except Exception as e:
+            self.log(f"Termination suggestion error: {str(e)}")
+            return {"status": "error", "message": f"Error: {str(e)}"}
+    
+    def start_memory_watchdog(self, on_event=None):
+        """
+        Start the background memory-pressure watchdog
+        
+        Tiers: trim caches, then trim idle processes, then suggest termination.
+        Tier 1 has no action where the OS cannot trim its file cache (Linux:
+        page cache already counts as available memory). The watchdog is
+        stopped at exit.
+        
+        Args:
+            on_event: Optional callback(event dict) for tier changes and actions
+        """
+        if self.memory_watchdog is None:
+            def handle(event):
+                if event['event'] == 'tier':
+                    self.log(f"Memory pressure: {event['name']} ({event['available_percent']:.1f}% available)")
+                if on_event:
+                    on_event(event)
+            
+            actions = {2: self.free_ram, 3: self.suggest_termination}
+            if self.memory_trimmer is not None and self.memory_trimmer.supports_file_cache:
+                actions[1] = self.trim_caches
+            self.memory_watchdog = MemoryWatchdog(self.sampler, actions=actions, on_event=handle)
+        self.memory_watchdog.start()
+        return {"status": "success", "message": "Memory watchdog active"}
+    
+    def stop_memory_watchdog(self):
+        """Stop the memory-pressure watchdog"""
+        if self.memory_watchdog is not None:
+            self.memory_watchdog.stop()
+        return {"status": "success", "message": "Memory watchdog stopped"}
+    
+    @property
+    def memory_watchdog_running(self):
+        return self.memory_watchdog is not None and self.memory_watchdog.running
+    
     # ======================
     # PROCESS MANAGEMENT
     # ======================
     
-    def kill_heavy_processes(self):
-        """Terminate processes using excessive RAM"""
+    def _terminate(self, pid):
+        """Terminate a registry process; returns True if the signal was sent"""
+        proc = self.processes.process(pid)
+        if proc is None:
+            return False
         try:
-            heavy_processes = []
-            killed_processes = []
-            
-            # Protected system processes
-            protected = {
-                'system', 'dwm.exe', 'explorer.exe', 'winlogon.exe', 
-                'csrss.exe', 'smss.exe', 'wininit.exe', 'services.exe',
-                'lsass.exe', 'svchost.exe'
-            }
+            proc.terminate()
+            return True
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+    
+    def kill_heavy_processes(self, min_percent=10):
+        """
+        Terminate the process trees holding excessive RAM
+        
+        Args:
+            min_percent: Share of total memory a process tree must hold
+        """
+        try:
+            total_memory = psutil.virtual_memory().total or 1
+            trees = self.terminator.rank(min_percent=min_percent)
+            heavy_processes = [
+                f"{root.name} (+{len(members) - 1} children) - {reclaimable / total_memory * 100:.1f}%"
+                if len(members) > 1 else f"{root.name} - {reclaimable / total_memory * 100:.1f}%"
+                for reclaimable, root, members in trees
+            ]
             
-            for proc in psutil.process_iter(['pid', 'name', 'memory_percent']):
-                try:
-                    if proc.info['memory_percent'] > 10:  # More than 10% RAM
-                        proc_name = proc.info['name'].lower()
-                        heavy_processes.append(f"{proc.info['name']} - {proc.info['memory_percent']:.1f}%")
-                        
-                        if proc_name not in protected:
-                            proc.terminate()
-                            killed_processes.append(proc.info['name'])
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            # Signal every tree member at once, then wait and escalate
+            report = self.terminator.terminate([member for _, _, members in trees for member in members])
+            freed_mb = report['freed'] // (1024 * 1024)
             
-            result_text = f"Terminated {len(killed_processes)} heavy processes:\n"
+            result_text = f"Terminated {len(trees)} heavy process trees ({freed_mb}MB freed):\n"
             result_text += "\n".join(heavy_processes[:10])
+            if report['survivors']:
+                result_text += f"\n{len(report['survivors'])} processes could not be stopped"
             
-            self.log(f"Killed {len(killed_processes)} heavy processes")
-            return {"status": "success", "message": result_text, "processes": heavy_processes}
+            self.log(f"Killed {len(trees)} heavy process trees - {freed_mb}MB freed")
+            return {"status": "success", "message": result_text, "processes": heavy_processes, "report": report}
         except Exception as e:
             self.log(f"Process termination error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
     
-    def end_idle_apps(self):
-        """End applications with low CPU usage"""
+    def end_idle_apps(self, window=None):
+        """
+        End applications that showed no CPU, I/O or foreground activity
+        
+        Args:
+            window: Seconds a process must have been idle (detector default if None)
+        """
         try:
             idle_apps = []
             killed_apps = []
             
-            # Protected system processes
-            protected = {
-                'system.exe', 'dwm.exe', 'explorer.exe', 'winlogon.exe',
-                'csrss.exe', 'smss.exe', 'wininit.exe', 'services.exe',
-                'lsass.exe', 'svchost.exe'
-            }
-            
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
-                try:
-                    if (proc.info['cpu_percent'] < 0.1 and 
-                        proc.info['name'].endswith('.exe') and
-                        proc.info['name'].lower() not in protected):
-                        
-                        idle_apps.append(proc.info['name'])
-                        proc.terminate()
-                        killed_apps.append(proc.info['name'])
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            # Only processes idle for the whole window, tracked tick by tick
+            for row, _ in self.idle_detector.idle(window):
+                if (row.name.endswith('.exe') and
+                    row.name.lower() not in self.PROTECTED_PROCESSES and
+                    row.pid != os.getpid()):
+                    
+                    idle_apps.append(row.name)
+                    if self._terminate(row.pid):
+                        killed_apps.append(row.name)
             
             result_text = f"Ended {len(killed_apps)} idle applications"
             self.log(f"Ended {len(killed_apps)} idle applications")
@@ -174,19 +323,15 @@ class SystemOptimizer:
     def clean_chrome(self):
         """Terminate all Chrome processes"""
         try:
-            chrome_killed = 0
-            chrome_processes = []
-            
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    if 'chrome' in proc.info['name'].lower():
-                        chrome_processes.append(proc.info['name'])
-                        proc.terminate()
-                        chrome_killed += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            result_text = f"Chrome cleanup: {chrome_killed} processes terminated"
+            # Only Chrome's own processes; helpers, native-messaging hosts and
+            # programs launched from the browser have other names and are kept
+            rows = [row for row in self.processes.lookup().matching('chrome')
+                    if row.name.lower() not in self.PROTECTED_PROCESSES]
+            chrome_processes = [row.name for row in rows]
+            report = self.terminator.terminate(rows)
+            chrome_killed = len(report['terminated']) + len(report['killed'])
+            
+            result_text = f"Chrome cleanup: {chrome_killed} processes terminated ({report['freed'] // (1024 * 1024)}MB freed)"
             self.log(f"Chrome cleanup: {chrome_killed} processes killed")
             return {"status": "success", "message": result_text, "processes": chrome_processes}
         except Exception as e:
@@ -199,6 +344,8 @@ class SystemOptimizer:
     
     def scan_startup(self):
         """Scan Windows startup programs"""
+        if winreg is None:
+            return {"status": "warning", "message": "Startup scan requires the Windows registry"}
         try:
             startup_items = []
             
@@ -269,37 +416,121 @@ class SystemOptimizer:
     # SYSTEM CLEANUP
     # ======================
     
-    def clean_temp(self):
-        """Clean temporary files from multiple locations"""
-        try:
-            temp_dirs = [
-                os.environ.get('TEMP'), 
-                os.environ.get('TMP'), 
-                'C:\\Windows\\Temp',
-                'C:\\Windows\\SoftwareDistribution\\Download',
-                'C:\\Windows\\Logs'
+    # Cleanup targets per operation; cache and temp overlap on purpose, the
+    # planner scans each directory once and merged plans count files once
+    @staticmethod
+    def _operation_targets(operation):
+        """Return the CleanupTarget list of a cleanup operation without policies"""
+        local_app_data = os.environ.get('LOCALAPPDATA')
+        if operation == 'temp':
+            targets = [
+                CleanupTarget('user_temp', os.environ.get('TEMP')), 
+                CleanupTarget('user_temp', os.environ.get('TMP')), 
+                CleanupTarget('windows_temp', 'C:\\Windows\\Temp'),
+                CleanupTarget('update_downloads', 'C:\\Windows\\SoftwareDistribution\\Download'),
+                CleanupTarget('windows_logs', 'C:\\Windows\\Logs')
             ]
-            
-            total_cleaned = 0
-            total_size = 0
-            
-            for temp_dir in temp_dirs:
-                if temp_dir and os.path.exists(temp_dir):
-                    for root, dirs, files in os.walk(temp_dir):
-                        for file in files:
-                            try:
-                                file_path = os.path.join(root, file)
-                                file_size = os.path.getsize(file_path)
-                                os.remove(file_path)
-                                total_cleaned += 1
-                                total_size += file_size
-                            except:
-                                pass
-            
-            size_mb = total_size // (1024 * 1024)
-            result_text = f"Temp cleanup: {total_cleaned} files removed ({size_mb}MB)"
-            self.log(f"Temp files cleaned: {total_cleaned} files ({size_mb}MB)")
-            return {"status": "success", "message": result_text}
+        elif operation == 'cache':
+            targets = [
+                CleanupTarget('cache', os.environ.get('TEMP', 'C:\\temp')),
+                CleanupTarget('cache', local_app_data and os.path.join(local_app_data, 'Microsoft', 'Windows', 'INetCache')),
+                CleanupTarget('cache', local_app_data and os.path.join(local_app_data, 'D3DSCache'))
+            ]
+        elif operation == 'prefetch':
+            targets = [CleanupTarget('prefetch', 'C:\\Windows\\Prefetch', recursive=False)]
+        else:
+            raise ValueError(f"Unknown cleanup operation: {operation}")
+        return targets
+    
+    def _cleanup_targets(self, operation):
+        """
+        Return the CleanupTarget list of a cleanup operation with its retention policies
+
+        Every directory has exactly one policy. A directory listed by several
+        operations (TEMP is cleaned by both 'temp' and 'cache') keeps the
+        category of the first operation in CLEANUP_OPERATIONS listing it, so
+        the cache policy never empties files the user_temp policy protects.
+        Directories nested in another target are planned under their own
+        category (see CleanupPlanner.plan).
+        """
+        owners = {}
+        for name in self.CLEANUP_OPERATIONS:
+            for target in self._operation_targets(name):
+                if target.path:
+                    owners.setdefault(os.path.normcase(os.path.abspath(target.path)), target.category)
+        targets = []
+        for target in self._operation_targets(operation):
+            if target.path:
+                target = target._replace(category=owners[os.path.normcase(os.path.abspath(target.path))])
+            targets.append(target._replace(policy=self.retention_policies.get(target.category)))
+        return targets
+    
+    def set_retention_policy(self, category, policy):
+        """
+        Set the retention policy of a cleanup category
+        
+        Args:
+            category: Category name (e.g. 'user_temp', 'cache', 'prefetch')
+            policy: RetentionPolicy, or None to delete everything
+        """
+        self.retention_policies[category] = policy
+        self.cleanup_plans.clear()
+    
+    def plan_cleanup(self, operations=('temp', 'cache', 'prefetch'), progress=None):
+        """
+        Scan without deleting and cache the plans
+
+        Re-scans only re-list directories whose mtime changed.
+
+        Returns:
+            Merged CleanupPlan of the operations
+        """
+        merged = CleanupPlan()
+        for operation in operations:
+            plan = self.cleanup.plan(self._cleanup_targets(operation), progress)
+            self.cleanup_plans[operation] = plan
+            merged = merged.merge(plan)
+        return merged
+    
+    def reclaimable_space(self):
+        """Return {operation: bytes} from the cached plans (no scanning)"""
+        return {operation: plan.total_bytes for operation, plan in self.cleanup_plans.items()}
+    
+    def _run_cleanup(self, operation, dry_run, progress=None):
+        """Plan an operation and execute it unless dry_run; returns (plan, results or None)"""
+        plan = self.plan_cleanup((operation,), progress)
+        if dry_run:
+            return plan, None
+        results = self.cleanup.execute(plan, progress=progress)
+        self.cleanup_plans.pop(operation, None)
+        return plan, results
+    
+    def clean_temp(self, dry_run=False, progress=None):
+        """
+        Clean temporary files from multiple locations
+
+        Args:
+            dry_run: Only plan the cleanup and report what would be removed
+            progress: Optional callback(seen=, files=, bytes=) for progress
+        """
+        try:
+            plan, results = self._run_cleanup('temp', dry_run, progress)
+            if results is None:
+                size_mb = plan.total_bytes // (1024 * 1024)
+                return {"status": "success", "message": f"Temp cleanup: {plan.total_files} files can be removed ({size_mb}MB)",
+                        "plan": plan.summary()}
+            total = summarize(results)
+            
+            size_mb = total.bytes // (1024 * 1024)
+            result_text = f"Temp cleanup: {total.files} files removed ({size_mb}MB)"
+            if total.skipped or total.errors:
+                result_text += f"\n{total.skipped} in use or gone, {total.errors} errors"
+            kept = sum(category.kept_files for category in plan.categories.values())
+            if kept:
+                result_text += f"\n{kept} recent files kept by retention policy"
+            self.log(f"Temp files cleaned: {total.files} files ({size_mb}MB)")
+            return {"status": "success", "message": result_text,
+                    "categories": {name: stats.as_dict() for name, stats in results.items()}}
         except Exception as e:
             self.log(f"Temp cleanup error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
@@ -318,28 +549,29 @@ class SystemOptimizer:
             self.log(f"Recycle bin error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
     
-    def clear_prefetch(self):
-        """Clear Windows prefetch files"""
+    def clear_prefetch(self, dry_run=False, progress=None):
+        """
+        Clear Windows prefetch files
+
+        Args:
+            dry_run: Only plan the cleanup and report what would be removed
+            progress: Optional callback(seen=, files=, bytes=) for progress
+        """
         try:
             prefetch_dir = 'C:\\Windows\\Prefetch'
             if os.path.exists(prefetch_dir):
-                files_removed = 0
-                total_size = 0
+                plan, results = self._run_cleanup('prefetch', dry_run, progress)
+                if results is None:
+                    size_mb = plan.total_bytes // (1024 * 1024)
+                    return {"status": "success", "message": f"Prefetch: {plan.total_files} files can be removed ({size_mb}MB)",
+                            "plan": plan.summary()}
+                total = summarize(results)
                 
-                for file in os.listdir(prefetch_dir):
-                    try:
-                        file_path = os.path.join(prefetch_dir, file)
-                        file_size = os.path.getsize(file_path)
-                        os.remove(file_path)
-                        files_removed += 1
-                        total_size += file_size
-                    except:
-                        pass
-                
-                size_mb = total_size // (1024 * 1024)
-                result_text = f"Prefetch cleared: {files_removed} files ({size_mb}MB)"
-                self.log(f"Prefetch cleanup: {files_removed} files ({size_mb}MB)")
-                return {"status": "success", "message": result_text}
+                size_mb = total.bytes // (1024 * 1024)
+                result_text = f"Prefetch cleared: {total.files} files ({size_mb}MB)"
+                self.log(f"Prefetch cleanup: {total.files} files ({size_mb}MB)")
+                return {"status": "success", "message": result_text,
+                        "categories": {name: stats.as_dict() for name, stats in results.items()}}
             else:
                 return {"status": "warning", "message": "Prefetch directory not found"}
         except Exception as e:
@@ -368,29 +600,56 @@ class SystemOptimizer:
             self.log(f"Disk cleanup error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
     
-    def full_system_clean(self):
-        """Perform comprehensive system cleanup"""
+    def cleanup_stages(self):
+        """Return the PipelineStage list of a full system cleanup"""
+        return [
+            # Cache shares the temp folder, so it runs after the temp stage
+            PipelineStage("Temp Files", self.clean_temp, 'disk', progress=True),
+            PipelineStage("Cache", self.clear_cache, 'disk', after=("Temp Files",), progress=True),
+            PipelineStage("Recycle Bin", self.empty_recycle, 'system'),
+            PipelineStage("Prefetch", self.clear_prefetch, 'disk', progress=True)
+        ]
+    
+    def run_pipeline(self, stages, on_progress=None, limits=None):
+        """
+        Run PipelineStage objects concurrently
+        
+        Args:
+            stages: PipelineStage list (see cleanup_stages)
+            on_progress: Optional callback(event dict) called from worker threads
+            limits: {resource: concurrent stages} overriding the defaults
+        
+        Returns:
+            {stage name: result dict}
+        """
+        return CleanupPipeline(limits, on_progress).run(stages)
+    
+    def full_system_clean(self, dry_run=False, on_progress=None):
+        """
+        Perform comprehensive system cleanup
+
+        Independent stages run concurrently through a CleanupPipeline.
+
+        Args:
+            dry_run: Only plan the file cleanups and report the reclaimable space
+            on_progress: Optional callback(event dict) streamed from the pipeline
+        """
         try:
-            results = []
-            
-            # Run multiple cleanup operations
-            operations = [
-                ("Temp Files", self.clean_temp),
-                ("Cache", self.clear_cache),
-                ("Recycle Bin", self.empty_recycle),
-                ("Prefetch", self.clear_prefetch)
-            ]
-            
-            for name, operation in operations:
-                try:
-                    result = operation()
-                    results.append(f"{name}: {result['status']}")
-                except:
-                    results.append(f"{name}: failed")
-            
+            if dry_run:
+                plan = self.plan_cleanup()
+                size_mb = plan.total_bytes // (1024 * 1024)
+                result_text = f"Full system cleanup can remove {plan.total_files} files ({size_mb}MB)"
+                result_text += "\n(Recycle Bin not included)"
+                return {"status": "success", "message": result_text, "plan": plan.summary()}
+            
+            started = time.time()
+            stage_results = self.run_pipeline(self.cleanup_stages(), on_progress)
+            results = [f"{name}: {result.get('status', 'failed')}" for name, result in stage_results.items()]
+            
+            elapsed = time.time() - started
             result_text = "Full system cleanup completed!\n" + "\n".join(results)
-            self.log("Full system cleanup completed")
-            return {"status": "success", "message": result_text}
+            self.log(f"Full system cleanup completed in {elapsed:.1f}s")
+            return {"status": "success", "message": result_text, "stages": stage_results}
         except Exception as e:
             self.log(f"Full system cleanup error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
@@ -399,17 +658,29 @@ class SystemOptimizer:
     # PERFORMANCE BOOST
     # ======================
     
-    def game_mode(self):
-        """Activate game mode with high priority"""
+    def _apply_profile(self, profile, pid):
+        """Apply a scheduling profile and return (report, summary line)"""
+        report = self.scheduler.apply(profile, pid)
+        cpus = ', '.join(str(cpu) for cpu in report['cpus']) or 'all'
+        summary = (f"{report['workload']} ({len(report['foreground'])} processes) on CPUs {cpus}, "
+                   f"{report['demoted']} background processes lowered")
+        return report, summary
+    
+    def game_mode(self, pid=None):
+        """
+        Activate game mode: the workload gets high priority on dedicated CPUs
+        
+        Args:
+            pid: Workload process (foreground window or busiest process if None)
+        """
         try:
-            # Set high priority for current process
-            subprocess.run(['wmic', 'process', 'where', 'name="python.exe"', 
-                          'CALL', 'setpriority', '"high priority"'], 
-                          capture_output=True, text=True)
+            report, summary = self._apply_profile('game', pid)
             
-            result_text = "Game Mode: ACTIVATED! 🎮"
-            self.log("Game mode activated")
-            return {"status": "success", "message": result_text}
+            result_text = f"Game Mode: ACTIVATED! 🎮\n{summary}"
+            self.log(f"Game mode activated: {summary}")
+            return {"status": "success", "message": result_text, "report": report}
+        except LookupError:
+            return {"status": "warning", "message": "Game Mode: no workload process found"}
         except Exception as e:
             self.log(f"Game mode error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
@@ -428,17 +699,41 @@ class SystemOptimizer:
             self.log(f"High performance error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
     
-    def priority_boost(self):
-        """Apply system-wide priority boost"""
+    def priority_boost(self, pid=None):
+        """
+        Raise the workload's priority and lower background processes
+        
+        Args:
+            pid: Workload process (foreground window or busiest process if None)
+        """
         try:
-            # System priority boost simulation
-            result_text = "Priority Boost: APPLIED! 🚀"
-            self.log("System priority boost applied")
-            return {"status": "success", "message": result_text}
+            report, summary = self._apply_profile('boost', pid)
+            
+            result_text = f"Priority Boost: APPLIED! 🚀\n{summary}"
+            self.log(f"Priority boost applied: {summary}")
+            return {"status": "success", "message": result_text, "report": report}
+        except LookupError:
+            return {"status": "warning", "message": "Priority Boost: no workload process found"}
         except Exception as e:
             self.log(f"Priority boost error: {str(e)}")
             return {"status": "error", "message": f"Error: {str(e)}"}
     
+    def normal_mode(self):
+        """Restore the priorities and CPU affinities changed by game mode or priority boost"""
+        try:
+            if self.scheduler.active is None:
+                return {"status": "success", "message": "Performance: Normal"}
+            report = self.scheduler.restore()
+            
+            result_text = f"Performance: Normal ({report['restored']} processes restored)"
+            if report['failed']:
+                result_text += f"\n{len(report['failed'])} processes could not be restored"
+            self.log(f"{report['profile']} mode ended: {report['restored']} restored, {len(report['failed'])} failed")
+            return {"status": "success", "message": result_text, "report": report}
+        except Exception as e:
+            self.log(f"Normal mode error: {str(e)}")
+            return {"status": "error", "message": f"Error: {str(e)}"}
+    
     # ======================
     # ADVANCED FEATURES
     # ======================
@@ -446,11 +741,10 @@ class SystemOptimizer:
     def get_system_health(self):
         """Get comprehensive system health report"""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            
-            # Memory usage
-            memory = psutil.virtual_memory()
+            # CPU and memory usage from the shared sampler
+            snapshot = self.sampler.snapshot()
+            cpu_percent = snapshot.cpu_percent
+            memory = snapshot.memory
             
             # Disk usage
             disk = psutil.disk_usage('/')
@@ -503,6 +797,10 @@ class SystemOptimizer:
                 result = self.clean_temp()
                 results.append(f"Temp: {result['status']}")
             
+            # Keep watching memory pressure in the background from now on
+            result = self.start_memory_watchdog()
+            results.append(f"Watchdog: {result['status']}")
+            
             self.optimization_running = False
             result_text = "Auto-optimization completed!\n" + "\n".join(results)
             self.log("Auto-optimization completed")
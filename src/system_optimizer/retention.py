@@ -0,0 +1,98 @@
+"""
+QuantumDesk Retention Policies
+Age, size and exclusion rules deciding which planned files may be deleted
+"""
+
+import fnmatch
+import os
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class RetentionPolicy:
+    """Per-directory retention rules evaluated on a plan's stat results
+
+    Files matching an exclusion glob are always kept. Files used more
+    recently than min_age are kept, so cleanup never races applications
+    writing to their temp or cache folders. With max_total_size the
+    directory is only trimmed back to that size, least recently used files
+    first, instead of being emptied; caches stay warm and are not rebuilt
+    at I/O cost right after every cleanup.
+    """
+
+    def __init__(self, min_age=0, max_total_size=None, exclude=(), use_atime=True):
+        """
+        Initialize the policy
+
+        Args:
+            min_age: Seconds since last use before a file may be deleted
+            max_total_size: Bytes the directory may keep (None empties it)
+            exclude: Glob patterns matched against file names and full paths
+            use_atime: Treat access time as use (otherwise mtime only)
+        """
+        self.min_age = min_age
+        self.max_total_size = max_total_size
+        self.exclude = tuple(os.path.normcase(pattern) for pattern in exclude)
+        self.use_atime = use_atime
+
+    def last_used(self, entry):
+        """Return the time a PlanEntry was last used"""
+        return max(entry.mtime, entry.atime) if self.use_atime else entry.mtime
+
+    def excluded(self, path):
+        """True if path matches an exclusion glob"""
+        if not self.exclude:
+            return False
+        path = os.path.normcase(path)
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern)
+                   for pattern in self.exclude)
+
+    def select(self, entries, now):
+        """
+        Split the PlanEntry list of one directory tree
+
+        Returns:
+            (entries to delete, entries kept)
+        """
+        kept = []
+        candidates = []
+        cutoff = now - self.min_age
+        for entry in entries:
+            if self.excluded(entry.path) or self.last_used(entry) > cutoff:
+                kept.append(entry)
+            else:
+                candidates.append(entry)
+
+        if self.max_total_size is None:
+            return candidates, kept
+
+        # Trim least recently used first until the tree fits the budget
+        total = sum(entry.size for entry in entries)
+        candidates.sort(key=self.last_used)
+        delete = []
+        for index, entry in enumerate(candidates):
+            if total <= self.max_total_size:
+                kept.extend(candidates[index:])
+                break
+            delete.append(entry)
+            total -= entry.size
+        return delete, kept
+
+    def __repr__(self):
+        return (f"RetentionPolicy(min_age={self.min_age}, max_total_size={self.max_total_size}, "
+                f"exclude={self.exclude}, use_atime={self.use_atime})")
+
+
+# Defaults per cleanup category; anything not listed is emptied. A directory
+# has one category, so exactly one of these applies to it (TEMP is user_temp
+# even when the cache operation cleans it)
+DEFAULT_POLICIES = {
+    'user_temp': RetentionPolicy(min_age=DAY),
+    'cache': RetentionPolicy(min_age=HOUR, max_total_size=256 * 1024 * 1024),
+    'windows_temp': RetentionPolicy(min_age=DAY),
+    'update_downloads': RetentionPolicy(min_age=7 * DAY),
+    'windows_logs': RetentionPolicy(min_age=7 * DAY),
+    'prefetch': RetentionPolicy(min_age=30 * DAY, exclude=('layout.ini',)),
+}
@@ -0,0 +1,387 @@
+"""
+QuantumDesk Process Scheduler
+Profile-driven CPU affinity and priority changes with exact restoration
+"""
+
+import os
+import sys
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+from .termination import untouchable_pids
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# foreground_priority: level given to the workload and its children;
+# dedicated_share: share of the logical CPUs the workload is pinned to;
+# background_priority / background_io: levels other processes are lowered to;
+# isolate_background: keep other processes off the dedicated CPUs.
+# Levels are portable names mapped to priority classes or nice values below.
+SchedulingProfile = namedtuple('SchedulingProfile', [
+    'name', 'foreground_priority', 'dedicated_share', 'background_priority', 'background_io', 'isolate_background',
+], defaults=(None, None, None, None, False))
+
+PROFILES = {
+    'game': SchedulingProfile('game', foreground_priority='high', dedicated_share=0.5,
+                              background_priority='below_normal', background_io='low', isolate_background=True),
+    'boost': SchedulingProfile('boost', foreground_priority='above_normal',
+                               background_priority='below_normal'),
+}
+
+if sys.platform == 'win32':
+    PRIORITY_LEVELS = {
+        'idle': psutil.IDLE_PRIORITY_CLASS,
+        'below_normal': psutil.BELOW_NORMAL_PRIORITY_CLASS,
+        'normal': psutil.NORMAL_PRIORITY_CLASS,
+        'above_normal': psutil.ABOVE_NORMAL_PRIORITY_CLASS,
+        'high': psutil.HIGH_PRIORITY_CLASS,
+    }
+    IO_LEVELS = {
+        'idle': psutil.IOPRIO_VERYLOW,
+        'low': psutil.IOPRIO_LOW,
+        'normal': psutil.IOPRIO_NORMAL,
+    }
+    _PRIORITY_RANK = {value: rank for rank, value in enumerate(PRIORITY_LEVELS.values())}
+    _PRIORITY_RANK[psutil.REALTIME_PRIORITY_CLASS] = len(_PRIORITY_RANK)
+else:
+    # Nice values; raising priority above normal needs CAP_SYS_NICE
+    PRIORITY_LEVELS = {
+        'idle': 19,
+        'below_normal': 10,
+        'normal': 0,
+        'above_normal': -5,
+        'high': -10,
+    }
+    # (ioclass, value) for psutil.Process.ionice on Linux
+    IO_LEVELS = {
+        'idle': (getattr(psutil, 'IOPRIO_CLASS_IDLE', 3), None),
+        'low': (getattr(psutil, 'IOPRIO_CLASS_BE', 2), 7),
+        'normal': (getattr(psutil, 'IOPRIO_CLASS_BE', 2), 4),
+    }
+
+
+def _priority_rank(value):
+    """Comparable priority, higher means more CPU time"""
+    if sys.platform == 'win32':
+        return _PRIORITY_RANK.get(value, _PRIORITY_RANK[psutil.NORMAL_PRIORITY_CLASS])
+    return -value
+
+
+def _io_rank(value):
+    """Comparable I/O priority, higher means more I/O bandwidth"""
+    if sys.platform == 'win32':
+        return value
+    ioclass, level = value
+    if ioclass == getattr(psutil, 'IOPRIO_CLASS_IDLE', 3):
+        return 0
+    if ioclass == getattr(psutil, 'IOPRIO_CLASS_RT', 1):
+        return 20 - level
+    # Best effort; class NONE behaves like best effort level 4
+    return 10 - (level if ioclass == getattr(psutil, 'IOPRIO_CLASS_BE', 2) else 4)
+
+
+def nice_floor():
+    """
+    Return the lowest nice value this process may set (None if unrestricted)
+
+    Lowering a nice value, which is what restoring a demoted process does,
+    needs root or an RLIMIT_NICE soft limit reaching that value.
+    """
+    if sys.platform == 'win32' or resource is None or os.geteuid() == 0:
+        return None
+    limit = resource.getrlimit(resource.RLIMIT_NICE)[0]
+    if limit == resource.RLIM_INFINITY:
+        return None
+    # RLIMIT_NICE is expressed as 20 - nice
+    return 20 - limit
+
+
+def _set_ionice(process, value):
+    if sys.platform == 'win32':
+        process.ionice(value)
+        return
+    ioclass, level = value
+    # psutil rejects a value for the NONE and IDLE classes
+    if ioclass in (getattr(psutil, 'IOPRIO_CLASS_RT', 1), getattr(psutil, 'IOPRIO_CLASS_BE', 2)):
+        process.ionice(ioclass, level)
+    else:
+        process.ionice(ioclass)
+
+
+class _Saved:
+    """Original settings of one process changed by a profile"""
+
+    __slots__ = ('process', 'name', 'nice', 'ionice', 'affinity')
+
+    def __init__(self, process, name):
+        self.process = process
+        self.name = name
+        self.nice = None
+        self.ionice = None
+        self.affinity = None
+
+
+class ProcessScheduler:
+    """Apply scheduling profiles and restore the original settings
+
+    A profile raises the priority of a workload's process tree and pins it
+    to dedicated CPUs, while every other process is lowered in CPU and I/O
+    priority and optionally kept off those CPUs. Settings are only ever
+    moved in the profile's direction, and the original value of every
+    attribute actually changed is saved with its psutil.Process, so
+    restore() puts back exactly what was there and never touches a reused
+    PID. On Linux, a nice value is only demoted when this process may put
+    it back (root, or RLIMIT_NICE allows it); otherwise only the I/O
+    priority and affinity are changed. Processes that still cannot be
+    restored are reported.
+    """
+
+    def __init__(self, registry, protected=(), foreground=None, max_workers=8):
+        """
+        Initialize the scheduler
+
+        Args:
+            registry: ProcessRegistry providing rows, the index and Process objects
+            protected: Lowercase process names never changed
+            foreground: Optional callable returning the foreground PID
+            max_workers: Threads applying the changes
+        """
+        self.registry = registry
+        self.protected = {name.lower() for name in protected}
+        self.foreground = foreground
+        self.max_workers = max_workers
+        self.active = None
+        self._saved = {}
+        self._lock = threading.Lock()
+        # Held by worker threads while apply() holds _lock
+        self._saved_lock = threading.Lock()
+
+    def workload(self, pid=None):
+        """
+        Return the root ProcessRow of the workload to favour
+
+        The explicit pid wins, then the foreground window's process; when
+        QuantumDesk itself is in front (its button was just clicked) the
+        process with the highest average CPU over the registry window is used.
+        """
+        rows = self.registry.rows()
+        untouchable = untouchable_pids()
+        if pid is None and self.foreground is not None:
+            try:
+                pid = self.foreground()
+            except Exception:
+                pid = None
+            if pid in untouchable:
+                pid = None
+        if pid is not None:
+            return rows.get(pid)
+        busiest = None
+        for row, stats in self.registry.items(max_age=None):
+            if row.pid in untouchable or row.name.lower() in self.protected:
+                continue
+            if busiest is None or stats.cpu_avg > busiest[0]:
+                busiest = (stats.cpu_avg, row)
+        return busiest[1] if busiest else None
+
+    def dedicated_cpus(self, process, share):
+        """Pick the highest-numbered share of the CPUs the process may use"""
+        try:
+            allowed = sorted(process.cpu_affinity())
+        except (AttributeError, psutil.Error):
+            return []
+        count = min(len(allowed) - 1, max(1, int(len(allowed) * share)))
+        # CPU 0 services most interrupts, so dedicate from the top
+        return allowed[-count:] if count > 0 else []
+
+    # ======================
+    # APPLY / RESTORE
+    # ======================
+
+    def apply(self, profile, pid=None):
+        """
+        Apply a profile (restoring any active one first)
+
+        Args:
+            profile: SchedulingProfile or a PROFILES name
+            pid: Workload root PID (foreground or busiest process if None)
+
+        Returns:
+            {'profile', 'workload': name, 'foreground': [names], 'cpus': [ids],
+             'boosted': count, 'demoted': count, 'denied': count}
+        """
+        if isinstance(profile, str):
+            profile = PROFILES[profile]
+        with self._lock:
+            if self.active is not None:
+                self._restore()
+            root = self.workload(pid)
+            if root is None:
+                raise LookupError("No workload process found")
+
+            index = self.registry.lookup(max_age=None)
+            untouchable = untouchable_pids()
+            foreground = [row for row in index.descendants(root.pid, include_self=True,
+                                                           prune=lambda row: row.pid in untouchable)
+                          if row.pid not in untouchable]
+            foreground_pids = {row.pid for row in foreground}
+            background = [row for pid_, row in self.registry.rows(max_age=None).items()
+                          if pid_ not in foreground_pids and pid_ not in untouchable
+                          and row.name.lower() not in self.protected]
+
+            cpus = []
+            root_process = self.registry.process(root.pid)
+            if profile.dedicated_share and root_process is not None:
+                cpus = self.dedicated_cpus(root_process, profile.dedicated_share)
+            cpu_set = set(cpus)
+
+            fg_priority = PRIORITY_LEVELS.get(profile.foreground_priority)
+            bg_priority = PRIORITY_LEVELS.get(profile.background_priority)
+            bg_io = IO_LEVELS.get(profile.background_io)
+
+            floor = nice_floor()
+
+            def boost(row):
+                return self._change(row, priority=fg_priority, raise_priority=True,
+                                    affinity=cpus or None)
+
+            def demote(row):
+                return self._change(row, priority=bg_priority, raise_priority=False, io=bg_io,
+                                    exclude_cpus=cpu_set if profile.isolate_background else None,
+                                    restore_floor=floor)
+
+            # Active before the first change so restore() always finds it
+            self.active = profile.name
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Scheduler") as pool:
+                    boosted = list(pool.map(boost, foreground))
+                    demoted = list(pool.map(demote, background))
+            except BaseException:
+                self._restore()
+                raise
+
+            return {
+                'profile': profile.name,
+                'workload': root.name,
+                'foreground': [row.name for row in foreground],
+                'cpus': cpus,
+                'boosted': boosted.count(True),
+                'demoted': demoted.count(True),
+                'denied': boosted.count(None) + demoted.count(None),
+            }
+
+    def _change(self, row, priority=None, raise_priority=False, io=None, affinity=None, exclude_cpus=None,
+                restore_floor=None):
+        """
+        Move one process's settings in the profile's direction
+
+        A lowered nice value is only changed if it is not below restore_floor
+        (see nice_floor), so it can be put back.
+
+        Returns:
+            True if something changed, False if nothing had to, None if access was denied
+        """
+        process = self.registry.process(row.pid)
+        if process is None:
+            return False
+        saved = _Saved(process, row.name)
+        denied = False
+
+        def remember(attribute, value):
+            # Saved as soon as it changed, so a later failure can still undo it
+            setattr(saved, attribute, value)
+            with self._saved_lock:
+                self._saved[row.pid] = saved
+
+        try:
+            if priority is not None:
+                try:
+                    current = process.nice()
+                    higher = _priority_rank(priority) > _priority_rank(current)
+                    restorable = raise_priority or restore_floor is None or current >= restore_floor
+                    if current != priority and higher == raise_priority and restorable:
+                        process.nice(priority)
+                        remember('nice', current)
+                except psutil.AccessDenied:
+                    denied = True
+
+            if io is not None:
+                try:
+                    current = process.ionice()
+                    if sys.platform != 'win32':
+                        current = (current.ioclass, current.value)
+                    if _io_rank(io) < _io_rank(current):
+                        _set_ionice(process, io)
+                        remember('ionice', current)
+                except AttributeError:
+                    pass
+                except psutil.AccessDenied:
+                    denied = True
+
+            if affinity or exclude_cpus:
+                try:
+                    current = process.cpu_affinity()
+                    if affinity:
+                        target = sorted(affinity)
+                    else:
+                        target = [cpu for cpu in current if cpu not in exclude_cpus]
+                    if target and sorted(target) != sorted(current):
+                        process.cpu_affinity(target)
+                        remember('affinity', current)
+                except (AttributeError, psutil.AccessDenied):
+                    pass
+        except psutil.NoSuchProcess:
+            return False
+
+        if saved.nice is None and saved.ionice is None and saved.affinity is None:
+            return None if denied else False
+        return True
+
+    def restore(self):
+        """
+        Restore every setting changed by the active profile
+
+        Returns:
+            {'profile', 'restored': count, 'gone': count, 'failed': [names]}
+        """
+        with self._lock:
+            return self._restore()
+
+    def _restore(self):
+        saved, self._saved = self._saved, {}
+        profile, self.active = self.active, None
+
+        def put_back(entry):
+            process = entry.process
+            try:
+                # is_running() also detects a reused PID
+                if not process.is_running():
+                    return 'gone'
+                ok = True
+                for attribute, setter in (('affinity', process.cpu_affinity), ('nice', process.nice),
+                                          ('ionice', lambda value: _set_ionice(process, value))):
+                    value = getattr(entry, attribute)
+                    if value is None:
+                        continue
+                    try:
+                        setter(value)
+                    except psutil.AccessDenied:
+                        ok = False
+                return 'restored' if ok else 'failed'
+            except psutil.NoSuchProcess:
+                return 'gone'
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Scheduler") as pool:
+            outcomes = list(pool.map(put_back, saved.values()))
+
+        return {
+            'profile': profile,
+            'restored': outcomes.count('restored'),
+            'gone': outcomes.count('gone'),
+            'failed': [entry.name for entry, outcome in zip(saved.values(), outcomes) if outcome == 'failed'],
+        }
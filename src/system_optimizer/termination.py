@@ -0,0 +1,173 @@
+"""
+QuantumDesk Termination Engine
+Process-tree aware termination with a grace period and measured results
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+
+def untouchable_pids():
+    """PIDs never changed or terminated: pid 0, QuantumDesk itself and its ancestors"""
+    pids = {0, os.getpid()}
+    try:
+        pids.update(parent.pid for parent in psutil.Process().parents())
+    except psutil.Error:
+        pass
+    return pids
+
+
+class TerminationEngine:
+    """Rank and terminate whole process trees
+
+    Candidates are ranked by the memory their entire tree would release,
+    so a launcher with many heavy children is seen as the single large
+    consumer it is. All members of the selected trees are signalled at
+    once, given a grace period through psutil.wait_procs, and the
+    survivors are killed. A tree stops at protected and untouchable
+    processes: neither they nor anything they started belong to it, so a
+    restarted shell never turns a small tool into the root of every user
+    application. Freed memory is the resident size of the processes that
+    exited after being signalled.
+    """
+
+    def __init__(self, registry, protected=(), timeout=5, kill_timeout=2, max_workers=8):
+        """
+        Initialize the termination engine
+
+        Args:
+            registry: ProcessRegistry providing rows, the index and Process objects
+            protected: Lowercase process names never terminated
+            timeout: Seconds processes get to exit after terminate()
+            kill_timeout: Seconds to wait after kill() for the survivors
+            max_workers: Threads sending the signals
+        """
+        self.registry = registry
+        self.protected = {name.lower() for name in protected}
+        self.timeout = timeout
+        self.kill_timeout = kill_timeout
+        self.max_workers = max_workers
+
+    def _excluded(self, row, untouchable):
+        return row.pid in untouchable or row.name.lower() in self.protected
+
+    def _members(self, index, pid, untouchable):
+        root = index.get(pid)
+        if root is None or self._excluded(root, untouchable):
+            return []
+        return [root] + index.descendants(pid, prune=lambda row: self._excluded(row, untouchable))
+
+    def tree(self, pid):
+        """Return the rows of pid and its descendants that may be terminated"""
+        return self._members(self.registry.lookup(), pid, untouchable_pids())
+
+    def rank(self, min_percent=0.0, limit=None):
+        """
+        Rank process trees by reclaimable memory
+
+        Args:
+            min_percent: Minimum share of total memory a tree must hold
+            limit: Maximum number of trees returned
+
+        Returns:
+            [(reclaimable bytes, root ProcessRow, [tree rows])], largest first;
+            a process inside a higher ranked tree is not listed again
+        """
+        index = self.registry.lookup()
+        untouchable = untouchable_pids()
+        total_memory = psutil.virtual_memory().total or 1
+        trees = []
+        for row in index.sorted_by('memory_rss'):
+            if self._excluded(row, untouchable):
+                continue
+            members = self._members(index, row.pid, untouchable)
+            trees.append((sum(member.memory_rss for member in members), row, members))
+        # A parent's tree always contains its children's, so it ranks first
+        trees.sort(key=lambda item: item[0], reverse=True)
+
+        ranked = []
+        covered = set()
+        for reclaimable, root, members in trees:
+            if root.pid in covered:
+                continue
+            covered.update(member.pid for member in members)
+            if reclaimable / total_memory * 100 < min_percent:
+                break
+            ranked.append((reclaimable, root, members))
+            if limit and len(ranked) >= limit:
+                break
+        return ranked
+
+    def terminate(self, rows):
+        """
+        Terminate processes in parallel, escalating to kill after the timeout
+
+        Args:
+            rows: ProcessRow list (typically the members of ranked trees)
+
+        Returns:
+            {'terminated': [names], 'killed': [names], 'survivors': [names],
+             'already_gone': [names], 'freed': bytes,
+             'available_before': bytes, 'available_after': bytes}
+        """
+        available_before = psutil.virtual_memory().available
+        targets = {}
+        for row in rows:
+            process = self.registry.process(row.pid)
+            if process is not None:
+                targets[process] = row
+
+        already_gone = []
+
+        def signal(process, kill=False):
+            try:
+                process.kill() if kill else process.terminate()
+                return process
+            except psutil.NoSuchProcess:
+                if not kill:
+                    # Exited on its own before the signal; nothing was freed by us
+                    already_gone.append(process)
+                    return None
+                return process
+            except psutil.AccessDenied:
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Terminate") as pool:
+            signalled = [p for p in pool.map(signal, list(targets)) if p is not None]
+            gone, alive = _wait(signalled, self.timeout)
+            killed = []
+            if alive:
+                killed = [p for p in pool.map(lambda p: signal(p, kill=True), alive) if p is not None]
+                more_gone, alive = _wait(killed, self.kill_timeout)
+                gone.extend(more_gone)
+
+        alive_set = set(alive)
+        return {
+            'terminated': [targets[p].name for p in gone if p not in killed],
+            'killed': [targets[p].name for p in killed if p not in alive_set],
+            'survivors': [targets[p].name for p in targets if p not in gone and p not in already_gone],
+            'already_gone': [targets[p].name for p in already_gone],
+            'freed': sum(targets[p].memory_rss for p in gone),
+            'available_before': available_before,
+            'available_after': psutil.virtual_memory().available,
+        }
+
+
+def _wait(processes, timeout):
+    """psutil.wait_procs that also counts unreaped zombies as gone"""
+    gone, alive = psutil.wait_procs(processes, timeout=timeout)
+    still_alive = []
+    for process in alive:
+        try:
+            if process.status() == psutil.STATUS_ZOMBIE:
+                gone.append(process)
+                continue
+        except psutil.NoSuchProcess:
+            gone.append(process)
+            continue
+        except psutil.AccessDenied:
+            pass
+        still_alive.append(process)
+    return gone, still_alive
@@ -14,6 +14,7 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import pyautogui
 import keyboard
+from system_monitor import get_shared_process_registry
 
 class TaskAutomation:
     """Elite Task Automation with advanced scheduling and automation tools"""
@@ -28,6 +29,7 @@ class TaskAutomation:
         self.log_callback = log_callback
         self.scheduled_tasks = []
         self.automation_running = False
+        self.processes = get_shared_process_registry()
         self.tasks_file = Path.home() / "QuantumDesk_Tasks.json"
         self.load_tasks()
         
@@ -123,16 +125,22 @@ class TaskAutomation:
                 exclude_list = ['explorer.exe', 'dwm.exe', 'winlogon.exe', 'csrss.exe']
             
             closed_apps = []
-            protected_apps = set(exclude_list)
+            protected_apps = {p.lower() for p in exclude_list}
+            index = self.processes.lookup()
             
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    if (proc.info['name'].endswith('.exe') and 
-                        proc.info['name'].lower() not in [p.lower() for p in protected_apps]):
-                        proc.terminate()
-                        closed_apps.append(proc.info['name'])
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
+            for name in index.names():
+                if not name.endswith('.exe') or name in protected_apps:
                     continue
+                for row in index.named(name):
+                    proc = self.processes.process(row.pid)
+                    if proc is None:
+                        # Exited since the registry was last updated
+                        continue
+                    try:
+                        proc.terminate()
+                        closed_apps.append(row.name)
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        continue
             
             result_text = f"Closed {len(closed_apps)} applications"
             self.log(f"Closed {len(closed_apps)} applications")
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from file_cleanup import CleanupEngine, CleanupTarget
+from system_optimizer.retention import DAY, RetentionPolicy
+
+
+def test_file_cleanup_does_not_import_system_optimizer():
+    code = "import sys, file_cleanup; print(any(m.startswith('system_optimizer') for m in sys.modules))"
+    src = str(Path(__file__).resolve().parents[1] / 'src')
+    result = subprocess.run([sys.executable, '-c', code], cwd=src, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+
+def test_plan_then_execute_removes_files_and_empty_dirs(tmp_path):
+    nested = tmp_path / 'a' / 'b'
+    nested.mkdir(parents=True)
+    (tmp_path / 'top.tmp').write_bytes(b'x' * 10)
+    (nested / 'deep.tmp').write_bytes(b'y' * 20)
+
+    engine = CleanupEngine(max_workers=2, batch_size=1)
+    plan = engine.plan([CleanupTarget('temp', str(tmp_path))])
+    assert plan.total_files == 2
+    assert plan.total_bytes == 30
+    assert (nested / 'deep.tmp').exists()
+
+    stats = engine.execute(plan)['temp']
+    assert (stats.files, stats.bytes, stats.errors) == (2, 30, 0)
+    assert list(tmp_path.iterdir()) == []
+    assert tmp_path.exists()
+
+
+def test_nested_target_keeps_its_own_policy(tmp_path):
+    class KeepAll:
+        def select(self, entries, now):
+            return [], list(entries)
+
+    inner = tmp_path / 'cache'
+    inner.mkdir()
+    (inner / 'warm.bin').write_bytes(b'z')
+    (tmp_path / 'old.tmp').write_bytes(b'x')
+
+    plan = CleanupEngine().plan([CleanupTarget('temp', str(tmp_path)),
+                                 CleanupTarget('cache', str(inner), policy=KeepAll())])
+    assert [entry.path for entry in plan.categories['temp'].files] == [str(tmp_path / 'old.tmp')]
+    assert plan.categories['cache'].files == []
+    assert plan.categories['cache'].kept_files == 1
+    assert str(inner) not in plan.categories['temp'].directories
+
+
+def test_file_edited_in_place_between_plans_is_kept(tmp_path):
+    path = tmp_path / 'session.log'
+    path.write_bytes(b'old')
+    two_days_ago = time.time() - 2 * DAY
+    os.utime(path, (two_days_ago, two_days_ago))
+    target = CleanupTarget('temp', str(tmp_path), policy=RetentionPolicy(min_age=DAY))
+
+    engine = CleanupEngine()
+    assert engine.plan([target]).total_files == 1
+
+    # Rewriting an existing file leaves the directory mtime (the listing cache key) alone
+    directory_mtime = os.stat(tmp_path).st_mtime_ns
+    with open(path, 'r+b') as f:
+        f.write(b'new')
+    assert os.stat(tmp_path).st_mtime_ns == directory_mtime
+
+    plan = engine.plan([target])
+    assert plan.total_files == 0
+    assert plan.categories['temp'].kept_files == 1
+
+
+def test_file_written_after_planning_is_not_deleted(tmp_path):
+    path = tmp_path / 'busy.tmp'
+    path.write_bytes(b'x')
+    os.utime(path, (1000, 1000))
+    engine = CleanupEngine()
+    plan = engine.plan([CleanupTarget('temp', str(tmp_path))])
+
+    path.write_bytes(b'xy')
+    stats = engine.execute(plan)['temp']
+    assert (stats.files, stats.skipped) == (0, 1)
+    assert path.exists()
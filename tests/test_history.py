@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from system_monitor.history import MetricsHistory, MultiResolutionHistory, RingBuffer
+
+
+def test_ring_buffer_view_is_oldest_first():
+    buffer = RingBuffer(3)
+    for value in range(5):
+        buffer.append(value)
+    assert buffer.view().tolist() == [2.0, 3.0, 4.0]
+    assert buffer.last() == 4.0
+
+
+def test_as_dict_is_not_changed_by_later_appends():
+    history = MetricsHistory(['cpu'], capacity=3)
+    for value in range(3):
+        history.append(float(value), cpu=value * 10)
+    snapshot = history.as_dict()
+    history.append(3.0, cpu=30)
+    assert snapshot['timestamp'].tolist() == [0.0, 1.0, 2.0]
+    assert snapshot['cpu'].tolist() == [0.0, 10.0, 20.0]
+    assert history.as_dict()['cpu'].tolist() == [10.0, 20.0, 30.0]
+
+
+def test_window_is_a_stable_copy():
+    history = MultiResolutionHistory(['cpu'], capacity=4)
+    for value in range(4):
+        history.append(float(value), cpu=value)
+    window = history.window(3)
+    history.append(4.0, cpu=4)
+    assert window['resolution'] == 0
+    assert window['cpu']['avg'].tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert np.all(np.diff(window['timestamp']) > 0)
+
+
+def test_window_rejects_unknown_resolution():
+    history = MultiResolutionHistory(['cpu'], capacity=4)
+    history.append(0.0, cpu=1)
+    with pytest.raises(ValueError, match="valid tiers: 0 \\(raw\\), 10, 60"):
+        history.window(60, resolution=30)
+
+
+def test_window_forced_resolution_uses_rollup():
+    history = MultiResolutionHistory(['cpu'], capacity=4)
+    for second in range(25):
+        history.append(float(second), cpu=second)
+    window = history.window(60, now=25.0, resolution=10)
+    assert window['resolution'] == 10
+    assert window['timestamp'].tolist() == [0.0, 10.0]
+    assert window['cpu']['max'].tolist() == [9.0, 19.0]
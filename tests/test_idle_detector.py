@@ -0,0 +1,107 @@
+import pytest
+
+from system_monitor.idle_detector import IdleDetector
+from system_monitor.process_index import ProcessIndex
+from system_monitor.process_table import ProcessRow
+
+
+def _row(pid, ppid=1, cpu_time=1.0, io_bytes=0, create_time=100.0, name=None):
+    return ProcessRow(pid, ppid, name or f"app{pid}.exe", 'user', 'sleeping', create_time,
+                      0.0, cpu_time, 50 * 1024 * 1024, 1.0, io_bytes)
+
+
+class FakeRegistry:
+    def __init__(self):
+        self.index = ProcessIndex()
+        self._rows = {}
+
+    def set_rows(self, rows):
+        rows = {row.pid: row for row in rows}
+        self.index.apply(added=[row for pid, row in rows.items() if pid not in self._rows],
+                         removed=[row for pid, row in self._rows.items() if pid not in rows],
+                         updated=[row for pid, row in rows.items() if pid in self._rows])
+        self._rows = rows
+        return rows
+
+    def rows(self, max_age=1.0):
+        return dict(self._rows)
+
+    def lookup(self, max_age=1.0):
+        return self.index
+
+
+@pytest.fixture
+def registry():
+    return FakeRegistry()
+
+
+def tick(detector, registry, now, *rows):
+    detector.update(registry.set_rows(rows), now)
+
+
+def test_idle_only_after_the_whole_window(registry):
+    detector = IdleDetector(registry, window=300)
+    for now in range(0, 300, 10):
+        tick(detector, registry, now, _row(10))
+    assert detector.idle_seconds(10) == 290
+    assert not detector.is_idle(10)
+
+    tick(detector, registry, 300, _row(10))
+    assert detector.is_idle(10)
+    assert [(row.pid, seconds) for row, seconds in detector.idle()] == [(10, 300)]
+    assert detector.is_idle(10, window=600) is False
+
+
+def test_cpu_and_io_above_threshold_count_as_activity(registry):
+    detector = IdleDetector(registry, window=300, cpu_threshold=0.5, io_threshold=1024)
+    tick(detector, registry, 0, _row(10), _row(11), _row(12))
+    # 0.1s of CPU in 10s is 1%; 20KB in 10s is 2KB/s; 0.01s of CPU is 0.1%
+    tick(detector, registry, 400, _row(10), _row(11), _row(12))
+    tick(detector, registry, 410, _row(10, cpu_time=1.1), _row(11, io_bytes=20 * 1024), _row(12, cpu_time=1.01))
+    assert detector.idle_seconds(10) == 0
+    assert detector.idle_seconds(11) == 0
+    assert detector.idle_seconds(12) == 410
+
+
+def test_unreadable_counters_are_never_idle(registry):
+    detector = IdleDetector(registry, window=300)
+    for now in (0, 200, 400):
+        tick(detector, registry, now, _row(10, cpu_time=None))
+    assert detector.idle_seconds(10) == 0
+    assert detector.idle() == []
+
+
+def test_foreground_tree_is_exempt_while_user_is_present(registry):
+    idle_input = [0]
+    detector = IdleDetector(registry, window=300, foreground=lambda: 20, input_idle=lambda: idle_input[0])
+    rows = (_row(10), _row(20, ppid=10), _row(30, ppid=20), _row(40))
+    tick(detector, registry, 0, *rows)
+    tick(detector, registry, 400, *rows)
+    # Foreground process, its parent and its child stay active
+    assert [row.pid for row, _ in detector.idle()] == [40]
+
+    # Nobody has touched the keyboard or mouse for a whole window
+    idle_input[0] = 300
+    tick(detector, registry, 800, *rows)
+    assert sorted(row.pid for row, _ in detector.idle()) == [10, 20, 30, 40]
+
+
+def test_failing_foreground_provider_exempts_nothing(registry):
+    def broken():
+        raise OSError("no desktop")
+
+    detector = IdleDetector(registry, window=300, foreground=broken)
+    tick(detector, registry, 0, _row(10))
+    tick(detector, registry, 300, _row(10))
+    assert detector.is_idle(10)
+
+
+def test_reused_pid_starts_a_new_window(registry):
+    detector = IdleDetector(registry, window=300)
+    tick(detector, registry, 0, _row(10))
+    tick(detector, registry, 300, _row(10))
+    assert detector.is_idle(10)
+
+    tick(detector, registry, 310, _row(10, create_time=305.0))
+    assert detector.idle_seconds(10) == 0
+    assert detector.idle() == []
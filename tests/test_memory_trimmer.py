@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from system_monitor.process_registry import ProcessStats
+from system_monitor.process_table import ProcessRow
+from system_optimizer.memory_trimmer import FakeTrimBackend, LinuxCgroupTrimBackend, MemoryTrimmer
+
+MB = 1024 * 1024
+
+
+def _row(pid, name, rss):
+    return ProcessRow(pid, 1, name, 'user', 'sleeping', 0.0, 0.0, 1.0, rss, 1.0, 0)
+
+
+def _stats(samples):
+    """ProcessStats from [(timestamp, cpu_percent, rss)]"""
+    stats = ProcessStats(samples[0][0], window=len(samples))
+    for sample in samples:
+        stats.add(*sample)
+    return stats
+
+
+class FakeRegistry:
+    def __init__(self, items):
+        self._items = items
+
+    def items(self, max_age=1.0):
+        return list(self._items)
+
+
+@pytest.fixture
+def registry():
+    return FakeRegistry([
+        # Idle for the whole window while holding 200MB
+        (_row(10, 'idle.exe', 200 * MB), _stats([(0, 0.0, 200 * MB), (60, 0.0, 200 * MB)])),
+        # Busy but grew by 300MB
+        (_row(11, 'leaky.exe', 400 * MB), _stats([(0, 50.0, 100 * MB), (60, 50.0, 400 * MB)])),
+        # Busy and stable: nothing to gain
+        (_row(12, 'busy.exe', 500 * MB), _stats([(0, 80.0, 500 * MB), (60, 80.0, 500 * MB)])),
+        # Below min_rss
+        (_row(13, 'tiny.exe', 10 * MB), _stats([(0, 0.0, 10 * MB), (60, 0.0, 10 * MB)])),
+        (_row(14, 'lsass.exe', 300 * MB), _stats([(0, 0.0, 300 * MB), (60, 0.0, 300 * MB)])),
+        (_row(os.getpid(), 'python', 300 * MB), _stats([(0, 0.0, 300 * MB), (60, 0.0, 300 * MB)])),
+    ])
+
+
+def test_candidates_rank_growth_and_idle_memory(registry):
+    trimmer = MemoryTrimmer(FakeTrimBackend(), registry, protected={'LSASS.exe'})
+    ranked = [(row.name, score) for score, row, _ in trimmer.candidates()]
+    assert ranked == [('leaky.exe', 300 * MB), ('idle.exe', 200 * MB)]
+
+
+def test_trim_measures_reclaimed_bytes_per_process(registry):
+    backend = FakeTrimBackend({10: 200 * MB, 11: 400 * MB}, reclaim_ratio=0.25, failing={11})
+    report = MemoryTrimmer(backend, registry, protected={'lsass.exe'}).trim()
+
+    assert report['processes'][0] == {'pid': 10, 'name': 'idle.exe', 'before': 200 * MB,
+                                      'after': 150 * MB, 'reclaimed': 50 * MB}
+    assert report['processes'][1]['reclaimed'] == 0
+    assert (report['reclaimed'], report['trimmed'], report['failed']) == (50 * MB, 1, 1)
+
+
+def test_processes_sharing_a_group_are_trimmed_once(registry):
+    backend = FakeTrimBackend({10: 200 * MB, 11: 400 * MB}, groups={10: 'app.slice', 11: 'app.slice'})
+    report = MemoryTrimmer(backend, registry, protected={'lsass.exe'}).trim()
+
+    assert backend.group_trims == [[11, 10]]
+    assert report['reclaimed'] == 300 * MB
+    assert report['trimmed'] == 2
+
+
+def test_cgroup_backend_reclaims_combined_target_once(tmp_path):
+    proc = tmp_path / 'proc'
+    cgroup = tmp_path / 'cgroup'
+    (cgroup / 'app.slice').mkdir(parents=True)
+    (cgroup / 'other.slice').mkdir()
+    for pid, path in ((1, 'app.slice'), (2, 'app.slice'), (3, 'other.slice')):
+        (proc / str(pid)).mkdir(parents=True)
+        (proc / str(pid) / 'cgroup').write_text(f"0::/{path}\n")
+        (cgroup / path / 'memory.reclaim').write_text('')
+
+    class Backend(LinuxCgroupTrimBackend):
+        def memory(self, pid):
+            return {1: 100 * MB, 2: 300 * MB}.get(pid)
+
+    backend = Backend(cgroup_root=str(cgroup), proc_root=str(proc), fraction=0.5)
+    assert backend.group(1) == backend.group(2) != backend.group(3)
+    assert backend.group(4) is None
+
+    assert backend.trim_group([1, 2])
+    assert (cgroup / 'app.slice' / 'memory.reclaim').read_text() == str(200 * MB)
+
+
+def test_file_cache_trim_is_unsupported_on_cgroup_backend(registry):
+    trimmer = MemoryTrimmer(LinuxCgroupTrimBackend(), registry)
+    assert not trimmer.supports_file_cache
+    assert trimmer.trim_file_cache()['success'] is False
+    assert MemoryTrimmer(FakeTrimBackend(), registry).supports_file_cache
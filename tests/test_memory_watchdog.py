@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import pytest
+
+from system_optimizer.memory_watchdog import MemoryWatchdog
+
+MB = 1024 * 1024
+
+
+def snapshot(timestamp, available, swapped=0):
+    return SimpleNamespace(timestamp=timestamp, memory=SimpleNamespace(percent=100.0 - available),
+                           swap=SimpleNamespace(sin=swapped, sout=0))
+
+
+@pytest.fixture
+def watchdog():
+    calls = []
+
+    def action(level):
+        def run():
+            calls.append(level)
+            return {"status": "success", "message": f"tier {level}"}
+        return run
+
+    events = []
+    watchdog = MemoryWatchdog(None, actions={level: action(level) for level in (1, 2, 3)},
+                              sustain=3, cooldown=60, on_event=events.append)
+    watchdog.calls = calls
+    watchdog.events = events
+    return watchdog
+
+
+def feed(watchdog, *samples):
+    """Evaluate (available, swapped) samples two seconds apart; returns the levels"""
+    start = getattr(watchdog, 'clock', 0)
+    levels = []
+    for offset, (available, swapped) in enumerate(samples):
+        levels.append(watchdog.evaluate(snapshot(start + 2 * offset, available, swapped)))
+        if watchdog._action_thread is not None:
+            watchdog._action_thread.join()
+    watchdog.clock = start + 2 * len(samples)
+    return levels
+
+
+def test_escalation_waits_for_sustained_pressure(watchdog):
+    assert feed(watchdog, (15, 0), (15, 0), (15, 0)) == [0, 0, 1]
+    assert watchdog.calls == [1]
+    assert [event['level'] for event in watchdog.events if event['event'] == 'tier'] == [1]
+
+
+def test_brief_spike_does_not_escalate(watchdog):
+    assert feed(watchdog, (15, 0), (15, 0), (50, 0), (15, 0), (15, 0)) == [0, 0, 0, 0, 0]
+    assert watchdog.calls == []
+
+
+def test_escalates_straight_to_the_highest_sustained_tier(watchdog):
+    assert feed(watchdog, (3, 0), (3, 0), (3, 0)) == [0, 0, 3]
+    # Every tier up to the current one runs its action
+    assert sorted(watchdog.calls) == [1, 2, 3]
+
+
+def test_swap_traffic_escalates_with_memory_available(watchdog):
+    # 20MB/s of swap traffic with plenty of free memory
+    assert feed(watchdog, (60, 0), (60, 40 * MB), (60, 80 * MB), (60, 120 * MB)) == [0, 0, 0, 2]
+
+
+def test_hysteresis_keeps_tier_until_exit_threshold(watchdog):
+    feed(watchdog, (15, 0), (15, 0), (15, 0))
+    # Above the entry threshold (20%) but below the exit threshold (25%)
+    assert feed(watchdog, (22, 0), (24, 0), (22, 0)) == [1, 1, 1]
+    assert feed(watchdog, (26, 0)) == [0]
+    assert [event['level'] for event in watchdog.events if event['event'] == 'tier'] == [1, 0]
+
+
+def test_actions_respect_cooldown_and_rerun_after_leaving_tier(watchdog):
+    feed(watchdog, (15, 0), (15, 0), (15, 0), (15, 0), (15, 0))
+    assert watchdog.calls == [1]
+    feed(watchdog, (30, 0), (15, 0), (15, 0), (15, 0))
+    assert watchdog.calls == [1, 1]
+
+
+def test_failing_action_is_reported_as_error(watchdog):
+    def fail():
+        raise RuntimeError("boom")
+
+    watchdog.actions[1] = fail
+    feed(watchdog, (15, 0), (15, 0), (15, 0))
+    results = [event['result'] for event in watchdog.events if event['event'] == 'action']
+    assert results == [{"status": "error", "message": "Error: boom"}]
+
+
+def test_swap_thresholds_are_dropped_without_swap_traffic():
+    watchdog = MemoryWatchdog(None, actions={}, sustain=3, swap_traffic=False)
+    assert all(tier.enter_swap_rate is None for tier in watchdog.tiers)
+    assert feed(watchdog, (60, 0), (60, 40 * MB), (60, 80 * MB), (60, 120 * MB)) == [0, 0, 0, 0]
+    assert feed(watchdog, (15, 0), (15, 0), (15, 0)) == [0, 0, 1]
@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+
+from system_monitor.metrics_store import MetricsStore
+
+
+def _fill(store, start, count):
+    for offset in range(count):
+        store.append(start + offset, cpu=float(start + offset))
+    store.close()
+
+
+def test_compact_merges_small_segments(tmp_path):
+    store = MetricsStore(tmp_path, fields=('cpu',), segment_rows=10, flush_every=1)
+    now = 1_000_000.0
+    # close() seals the segment, so every batch starts a new one
+    for start in (now, now + 3, now + 6):
+        _fill(store, start, 3)
+
+    assert len(store.segments()) == 3
+    assert store.compact(now=now + 10) == {'removed': 0, 'merged': 3}
+    assert len(store.segments()) == 1
+    assert not [p for p in os.listdir(tmp_path) if '.' in p]
+    assert store.query()['cpu'].tolist() == [now + i for i in range(9)]
+
+
+def test_failed_merge_keeps_original_segments(tmp_path, monkeypatch):
+    store = MetricsStore(tmp_path, fields=('cpu',), segment_rows=10, flush_every=1)
+    now = 1_000_000.0
+    _fill(store, now, 2)
+    _fill(store, now + 2, 2)
+    before = store.query()
+
+    real_replace = os.replace
+    calls = []
+
+    def flaky_replace(src, dst):
+        calls.append(src)
+        if len(calls) == 2:
+            raise PermissionError("segment is mapped")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(os, 'replace', flaky_replace)
+    assert store.compact(now=now + 10)['merged'] == 0
+    monkeypatch.setattr(os, 'replace', real_replace)
+
+    assert len(store.segments()) == 2
+    after = store.query()
+    assert np.array_equal(before['timestamp'], after['timestamp'])
+    assert not [p for p in os.listdir(tmp_path) if '.' in p]
+
+
+def test_compact_removes_stale_directories(tmp_path):
+    store = MetricsStore(tmp_path, fields=('cpu',))
+    (tmp_path / 'seg_0000000000000001.old').mkdir()
+    (tmp_path / 'seg_0000000000000001.compact').mkdir()
+    store.compact()
+    assert os.listdir(tmp_path) == []
+
+
+def test_directory_is_created_on_first_write(tmp_path):
+    directory = tmp_path / 'metrics'
+    store = MetricsStore(directory, fields=('cpu',), flush_every=1)
+    assert not directory.exists()
+    assert store.query()['cpu'].tolist() == []
+    assert store.compact() == {'removed': 0, 'merged': 0}
+    assert not directory.exists()
+
+    _fill(store, 1_000_000.0, 2)
+    assert len(store.segments()) == 1
+
+
+def test_compact_leaves_other_writers_segments_alone(tmp_path):
+    now = 1_000_000.0
+    other = MetricsStore(tmp_path, fields=('cpu',), segment_rows=10, flush_every=1)
+    store = MetricsStore(tmp_path, fields=('cpu',), segment_rows=10, flush_every=1)
+    _fill(store, now, 2)
+    # Another process is still appending to its segment
+    other.append(now + 2, cpu=now + 2)
+    _fill(store, now + 3, 2)
+    writing = other._active.path
+
+    assert store.compact(now=now + 10) == {'removed': 0, 'merged': 0}
+    other.append(now + 5, cpu=now + 5)
+    other.close()
+    assert writing.exists()
+    assert store.query()['cpu'].tolist() == [now + i for i in range(6)]
+
+    assert store.compact(now=now + 10)['merged'] == 2
+    assert store.query()['cpu'].tolist() == [now + i for i in range(6)]
+
+
+def test_compact_skips_while_another_process_compacts(tmp_path):
+    store = MetricsStore(tmp_path, fields=('cpu',), segment_rows=10, flush_every=1)
+    _fill(store, 1_000_000.0, 2)
+    _fill(store, 1_000_002.0, 2)
+    (tmp_path / 'compact.lock').touch()
+
+    assert store.compact(now=1_000_010.0) == {'removed': 0, 'merged': 0}
+    assert len(store.segments()) == 2
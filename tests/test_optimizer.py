@@ -0,0 +1,119 @@
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import psutil
+import pytest
+
+from system_optimizer import RetentionPolicy, SystemOptimizer
+from system_optimizer import optimizer as optimizer_module
+from system_optimizer.retention import HOUR
+
+
+def _named_python(tmp_path, name):
+    """Path to the Python interpreter under another process name"""
+    path = tmp_path / name
+    os.symlink(sys.executable, path)
+    return str(path)
+
+
+@pytest.fixture
+def optimizer():
+    optimizer = SystemOptimizer()
+    optimizer.terminator.timeout = 2
+    yield optimizer
+    optimizer.scheduler.restore()
+
+
+def test_clean_chrome_keeps_processes_launched_by_chrome(tmp_path, optimizer):
+    helper = _named_python(tmp_path, 'nativehost')
+    child = None
+    chrome = subprocess.Popen([
+        _named_python(tmp_path, 'chrome'), '-c',
+        f"import subprocess, time; subprocess.Popen([{helper!r}, '-c', 'import time; time.sleep(30)']); time.sleep(30)",
+    ])
+    try:
+        # Until it execs, the forked helper is still named chrome
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            children = psutil.Process(chrome.pid).children()
+            if children and children[0].name() == 'nativehost':
+                child = children[0]
+                break
+            time.sleep(0.05)
+        assert child is not None
+        optimizer.processes.update()
+
+        result = optimizer.clean_chrome()
+
+        assert result['status'] == 'success'
+        assert result['processes'] == ['chrome']
+        assert chrome.wait(timeout=5) is not None
+        assert child.is_running()
+    finally:
+        chrome.kill()
+        chrome.wait()
+        if child is not None and child.is_running():
+            child.kill()
+
+
+def test_directory_shared_by_operations_has_one_policy(tmp_path, monkeypatch, optimizer):
+    monkeypatch.setenv('TEMP', str(tmp_path))
+    monkeypatch.setenv('TMP', str(tmp_path))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path / 'local'))
+    temp_targets = {t.path: t for t in optimizer._cleanup_targets('temp')}
+    cache_targets = {t.path: t for t in optimizer._cleanup_targets('cache')}
+
+    assert cache_targets[str(tmp_path)].category == 'user_temp'
+    assert cache_targets[str(tmp_path)].policy is temp_targets[str(tmp_path)].policy
+    shader_cache = os.path.join(str(tmp_path / 'local'), 'D3DSCache')
+    assert cache_targets[shader_cache].policy is optimizer.retention_policies['cache']
+
+
+def test_cache_cleanup_respects_temp_retention(tmp_path, monkeypatch, optimizer):
+    monkeypatch.setenv('TEMP', str(tmp_path))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path / 'local'))
+    recent = tmp_path / 'recent.tmp'
+    recent.write_bytes(b'x')
+    two_hours_ago = time.time() - 7200
+    os.utime(recent, (two_hours_ago, two_hours_ago))
+    optimizer.set_retention_policy('cache', RetentionPolicy(min_age=HOUR))
+
+    optimizer.clear_cache()
+    assert recent.exists()
+
+
+def test_memory_watchdog_can_be_stopped(optimizer):
+    optimizer.start_memory_watchdog()
+    assert optimizer.memory_watchdog_running
+    optimizer.stop_memory_watchdog()
+    assert not optimizer.memory_watchdog_running
+    if optimizer.memory_trimmer is None or not optimizer.memory_trimmer.supports_file_cache:
+        assert 1 not in optimizer.memory_watchdog.actions
+
+
+def test_exit_handler_is_registered_once(monkeypatch):
+    registered = []
+    monkeypatch.setattr(SystemOptimizer, '_exit_handler_registered', False)
+    monkeypatch.setattr(optimizer_module.atexit, 'register', registered.append)
+
+    first, second = SystemOptimizer(), SystemOptimizer()
+    first.start_memory_watchdog()
+    first.stop_memory_watchdog()
+    assert registered == [SystemOptimizer._shutdown_all]
+    assert {first, second} <= set(SystemOptimizer._instances)
+
+
+def test_end_idle_apps_skips_protected_processes(monkeypatch, optimizer):
+    rows = [os.getpid(), 1001, 1002]
+    idle = [(SimpleNamespace(pid=pid, name=name), 600) for pid, name in
+            zip(rows, ['python.exe', 'svchost.exe', 'notepad.exe'])]
+    terminated = []
+    monkeypatch.setattr(optimizer.idle_detector, 'idle', lambda window=None: idle)
+    monkeypatch.setattr(optimizer, '_terminate', lambda pid: terminated.append(pid) or True)
+
+    result = optimizer.end_idle_apps()
+    assert result['apps'] == ['notepad.exe']
+    assert terminated == [1002]
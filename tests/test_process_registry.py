@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+from system_monitor.process_registry import EXIT, SPAWN, TICK, ProcessRegistry
+from system_monitor.process_table import ProcessTable
+
+
+@pytest.fixture
+def child():
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    yield process
+    process.kill()
+    process.wait()
+
+
+def test_spawn_and_exit_events(child):
+    registry = ProcessRegistry(table=ProcessTable())
+    registry.update()
+    events = []
+    registry.subscribe(lambda event, payload: events.append((event, payload)))
+
+    extra = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    try:
+        spawned, _ = registry.update()
+        assert extra.pid in [row.pid for row in spawned]
+    finally:
+        extra.kill()
+        extra.wait()
+    _, exited = registry.update()
+    assert extra.pid in [row.pid for row in exited]
+    assert [event for event, _ in events].count(TICK) == 2
+    assert registry.stats(extra.pid) is None
+
+
+def test_registry_reports_reused_pid_as_exit_and_spawn(child):
+    table = ProcessTable()
+    registry = ProcessRegistry(table=table)
+    registry.update()
+    created = registry.rows(max_age=None)[child.pid].create_time
+    stats_before = registry.stats(child.pid)
+
+    # The registry saw an earlier process; psutil still holds its identity
+    entry = table._entries[child.pid]
+    entry['process']._create_time = created - 100
+    entry['process']._ident = (child.pid, created - 100)
+    registry._rows[child.pid] = registry._rows[child.pid]._replace(create_time=created - 100)
+
+    events = []
+    registry.subscribe(lambda event, payload: events.append((event, payload)))
+    spawned, exited = registry.update()
+
+    assert [row.pid for row in exited] == [child.pid]
+    assert [row.pid for row in spawned] == [child.pid]
+    assert (EXIT, exited[0]) in events and (SPAWN, spawned[0]) in events
+    assert registry.stats(child.pid) is not stats_before
+    assert registry.stats(child.pid).count == 1
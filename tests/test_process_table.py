@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from system_monitor.process_table import ProcessTable
+
+
+@pytest.fixture
+def child():
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    yield process
+    process.kill()
+    process.wait()
+
+
+def _impersonate_dead_process(table, pid, create_time):
+    """Make the cached entry look like an earlier process that owned pid"""
+    entry = table._entries[pid]
+    entry['process']._create_time = create_time
+    entry['process']._ident = (pid, create_time)
+    entry['static'] = ('stale.exe', 'nobody')
+    return entry['process']
+
+
+def test_refresh_rows_include_children_and_self(child):
+    table = ProcessTable()
+    rows = table.refresh()
+    assert rows[child.pid].ppid == os.getpid()
+    assert table.process(child.pid).pid == child.pid
+    assert table.top(1, key='memory_rss')
+
+
+def test_reused_pid_gets_fresh_process_and_static_fields(child):
+    table = ProcessTable()
+    created = table.refresh()[child.pid].create_time
+    stale = _impersonate_dead_process(table, child.pid, created - 100)
+
+    row = table.refresh()[child.pid]
+    assert table.process(child.pid) is not stale
+    assert row.name != 'stale.exe'
+    assert row.create_time == created
+
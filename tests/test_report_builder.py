@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+from system_info.report_builder import ReportBuilder
+
+
+def _slow(seconds, value):
+    def collect():
+        time.sleep(seconds)
+        return value
+    return collect
+
+
+def test_sections_stream_in_completion_order():
+    builder = ReportBuilder([('slow', _slow(0.3, 1)), ('fast', _slow(0.0, 2)), ('medium', _slow(0.1, 3))])
+    seen = []
+    assert list(builder.stream(on_section=lambda name, result: seen.append(name))) == [
+        ('fast', 2), ('medium', 3), ('slow', 1)]
+    assert seen == ['fast', 'medium', 'slow']
+    # build() returns the sections in declaration order
+    assert list(builder.build()) == ['slow', 'fast', 'medium']
+
+
+def test_timed_out_section_does_not_hold_up_the_report():
+    release = threading.Event()
+    builder = ReportBuilder([('stuck', release.wait), ('quick', lambda: 'ok')],
+                            default_timeout=5, timeouts={'stuck': 0.2})
+    started = time.monotonic()
+    try:
+        results = builder.build()
+        assert time.monotonic() - started < 2
+        assert results == {'stuck': {'error': "Timed out collecting stuck after 0.2s"}, 'quick': 'ok'}
+        # The abandoned collector cannot block interpreter exit
+        assert all(thread.daemon for thread in threading.enumerate() if thread.name.startswith('ReportSection'))
+    finally:
+        release.set()
+
+
+def test_collector_errors_become_error_entries():
+    def broken():
+        raise OSError("WMI unavailable")
+
+    results = ReportBuilder([('gpu_info', broken), ('cpu_info', lambda: {'cores': 4})]).build()
+    assert results == {'gpu_info': {'error': "Failed to collect gpu_info: WMI unavailable"},
+                       'cpu_info': {'cores': 4}}
+
+
+def test_sections_queued_behind_a_timeout_are_skipped():
+    calls = []
+    builder = ReportBuilder([('stuck', _slow(0.5, None)), ('queued', lambda: calls.append(1))],
+                            default_timeout=0.1, max_workers=1)
+    results = builder.build()
+    assert results['queued'] == {'error': "Timed out collecting queued after 0.1s"}
+    time.sleep(0.6)
+    assert calls == []
+
+
+def test_astream_yields_every_section():
+    async def collect():
+        return [item async for item in ReportBuilder([('a', lambda: 1), ('b', lambda: 2)]).astream()]
+
+    assert sorted(asyncio.run(collect())) == [('a', 1), ('b', 2)]
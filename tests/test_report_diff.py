@@ -0,0 +1,73 @@
+import pytest
+
+from system_info.report_diff import ReportDiffer
+
+
+def _report(disks, software):
+    return {'disk_info': {'physical_disks': disks}, 'installed_software': software}
+
+
+def _disk(model, serial="Unknown", status="OK"):
+    return {'model': model, 'serial_number': serial, 'status': status}
+
+
+def test_disks_without_serial_are_not_merged():
+    base = _report([_disk('SSD A'), _disk('HDD B')], [])
+    target = _report([_disk('SSD A'), _disk('HDD B', status='Pred Fail')], [])
+    differ = ReportDiffer()
+    delta = differ.diff(base, target)
+    changes = delta['sections']['disk_info']['changed']['physical_disks']
+    assert list(changes['changed']) == ['1|HDD B']
+    assert 'added' not in changes and 'removed' not in changes
+    assert differ.apply(base, delta) == target
+
+
+def test_disks_are_keyed_by_serial_when_known():
+    base = _report([_disk('SSD', ' S1 '), _disk('SSD', 'S2')], [])
+    target = _report([_disk('SSD', 'S2'), _disk('SSD', ' S1 ', status='Degraded')], [])
+    delta = ReportDiffer().diff(base, target)
+    changes = delta['sections']['disk_info']['changed']['physical_disks']
+    assert list(changes['changed']) == ['serial:S1']
+
+
+def test_side_by_side_software_versions_are_kept_apart():
+    base = _report([], [{'name': 'Python', 'version': '3.11'}, {'name': 'Python', 'version': '3.12'}])
+    target = _report([], [{'name': 'Python', 'version': '3.12'}, {'name': 'Python', 'version': '3.13'}])
+    differ = ReportDiffer()
+    delta = differ.diff(base, target)
+    software = delta['sections']['installed_software']
+    assert software['removed'] == ['Python|3.11']
+    assert list(software['added']) == ['Python|3.13']
+    assert sorted(item['version'] for item in differ.apply(base, delta)['installed_software']) == ['3.12', '3.13']
+
+
+def _gpu(name, load):
+    return {'name': name, 'load': load}
+
+
+def _startup(name, command):
+    return {'location': 'HKCU Run', 'name': name, 'command': command}
+
+
+@pytest.mark.parametrize('base, target', [
+    # Load change on the first of two identical GPUs
+    ({'gpu_info': [_gpu('RTX 3090', 10), _gpu('RTX 3090', 20)]},
+     {'gpu_info': [_gpu('RTX 3090', 90), _gpu('RTX 3090', 20)]}),
+    # One of two same-named startup entries removed
+    ({'startup_programs': [_startup('Updater', 'a.exe'), _startup('Updater', 'b.exe')]},
+     {'startup_programs': [_startup('Updater', 'b.exe')]}),
+    # Modules WMI reports without a location, one added
+    ({'memory_info': {'memory_modules': [{'location': 'Unknown', 'size': 8}]}},
+     {'memory_info': {'memory_modules': [{'location': 'Unknown', 'size': 8}, {'location': 'Unknown', 'size': 16}]}}),
+    # Reordered duplicates
+    ({'gpu_info': [_gpu('A', 1), _gpu('A', 2), _gpu('B', 3)]},
+     {'gpu_info': [_gpu('B', 3), _gpu('A', 2), _gpu('A', 1)]}),
+    # A literal key that looks like an occurrence suffix
+    ({'gpu_info': [_gpu('X#2', 1), _gpu('X', 2), _gpu('X', 3)]},
+     {'gpu_info': [_gpu('X', 2), _gpu('X#2', 5), _gpu('X', 3)]}),
+])
+def test_round_trip_with_duplicate_keys(base, target):
+    differ = ReportDiffer()
+    delta = differ.diff(base, target)
+    assert delta['sections']
+    assert differ.apply(base, delta) == target
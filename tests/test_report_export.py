@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from system_info import report_export
+from system_info.report_export import (COMPRESSION, FORMATS, ReportWriter, iter_report, read_report,
+                                       report_filename, write_report)
+
+REPORT = {
+    'section': {'name': 'first section is called section'},
+    'cpu_info': {'cores': 8, 'model': 'Ryzen ™'},
+    'top_processes': [{'pid': 1, 'name': 'init'}, {'pid': 42, 'name': 'python'}],
+    'empty': {},
+}
+
+
+@pytest.mark.parametrize('compression', list(COMPRESSION))
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_round_trip(tmp_path, fmt, compression):
+    filename = tmp_path / report_filename('report', fmt, compression)
+    assert write_report(REPORT.items(), filename, fmt=fmt, compression=compression) == len(REPORT)
+
+    assert read_report(filename) == REPORT
+    assert [name for name, _ in iter_report(filename)] == list(REPORT)
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_json_report_is_one_document(tmp_path, indent):
+    filename = tmp_path / 'report.json'
+    write_report(REPORT.items(), filename, indent=indent)
+    assert json.loads(filename.read_text(encoding='utf-8')) == REPORT
+
+
+@pytest.mark.parametrize('fmt', ['json', 'jsonl'])
+def test_format_is_detected_without_a_suffix(tmp_path, fmt):
+    filename = tmp_path / 'report.out'
+    write_report(REPORT.items(), filename, fmt=fmt, compression='gzip')
+    assert read_report(filename) == REPORT
+
+
+def test_jsonl_without_marker_is_read_by_suffix(tmp_path):
+    filename = tmp_path / 'legacy.jsonl'
+    filename.write_text('{"data":{"cores":8},"section":"cpu_info"}\n\n{"section":"empty","data":{}}\n')
+    assert read_report(filename) == {'cpu_info': {'cores': 8}, 'empty': {}}
+
+
+@pytest.mark.parametrize('compression', list(COMPRESSION))
+def test_binary_reads_only_selected_sections(tmp_path, monkeypatch, compression):
+    filename = tmp_path / report_filename('report', 'binary', compression)
+    with ReportWriter(filename, 'binary', compression) as writer:
+        for name, data in REPORT.items():
+            writer.write_section(name, data)
+
+    decoded = []
+    real_loads = report_export.json.loads
+    monkeypatch.setattr(report_export.json, 'loads', lambda text: decoded.append(text) or real_loads(text))
+
+    assert read_report(filename, sections=['cpu_info', 'empty']) == {
+        'cpu_info': REPORT['cpu_info'], 'empty': {}}
+    # Skipped sections are never decoded
+    assert len(decoded) == 2
+
+
+def test_unknown_format_and_compression_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ReportWriter(tmp_path / 'report.csv', fmt='csv')
+    with pytest.raises(ValueError):
+        ReportWriter(tmp_path / 'report.json', compression='zip')
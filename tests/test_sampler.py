@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from system_monitor.sampler import MetricsSampler
+
+
+def test_set_min_interval_only_throttles_one_subscriber():
+    sampler = MetricsSampler(interval=1.0)
+    fast, slow = [], []
+    sampler.subscribe(fast.append)
+    sampler.subscribe(slow.append)
+    sampler.set_min_interval(slow.append, 5)
+
+    for second in range(10):
+        sampler._publish(SimpleNamespace(timestamp=100.0 + second))
+
+    assert len(fast) == 10
+    assert [snapshot.timestamp for snapshot in slow] == [100.0, 105.0]
+    assert sampler.interval == 1.0
+
+
+def test_sampling_interval_follows_fastest_subscriber():
+    sampler = MetricsSampler(interval=0.5)
+    monitor, watchdog = [], []
+    sampler.subscribe(monitor.append)
+    sampler.subscribe(watchdog.append, min_interval=2)
+    assert sampler.interval == 0.5
+
+    # Monitor hidden: only the watchdog's 2s remain
+    sampler.set_min_interval(monitor.append, 5)
+    assert sampler.interval == 2
+    sampler.unsubscribe(watchdog.append)
+    assert sampler.interval == 5
+
+    # Shown again: back to the base rate at once
+    sampler.set_min_interval(monitor.append, 0)
+    assert sampler.interval == 0.5
+    assert sampler._wake_event.is_set()
+
+
+def test_subscriber_at_the_tick_interval_gets_every_tick():
+    sampler = MetricsSampler(interval=0.5)
+    received = []
+    sampler.subscribe(received.append, min_interval=2)
+    # Ticks arrive slightly early or late around the 2s interval
+    for timestamp in (100.0, 101.98, 104.01, 105.99):
+        sampler._publish(SimpleNamespace(timestamp=timestamp))
+    assert len(received) == 4
@@ -0,0 +1,163 @@
+import sys
+from types import SimpleNamespace
+
+import psutil
+import pytest
+
+from system_monitor.process_index import ProcessIndex
+from system_monitor.process_table import ProcessRow
+from system_optimizer import scheduler as scheduler_module
+from system_optimizer.scheduler import PRIORITY_LEVELS, ProcessScheduler
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="nice values and ionice classes are POSIX")
+
+BE = getattr(psutil, 'IOPRIO_CLASS_BE', 2)
+IDLE = getattr(psutil, 'IOPRIO_CLASS_IDLE', 3)
+
+
+class FakeProcess:
+    """psutil.Process stand-in recording nice, ionice and affinity"""
+
+    def __init__(self, pid, nice=0, ionice=(BE, 4), affinity=(0, 1, 2, 3), fail_affinity=False):
+        self.pid = pid
+        self._nice = nice
+        self._ionice = ionice
+        self._affinity = list(affinity)
+        self.fail_affinity = fail_affinity
+
+    def settings(self):
+        return self._nice, self._ionice, sorted(self._affinity)
+
+    def is_running(self):
+        return True
+
+    def nice(self, value=None):
+        if value is None:
+            return self._nice
+        self._nice = value
+
+    def ionice(self, ioclass=None, value=None):
+        if ioclass is None:
+            return SimpleNamespace(ioclass=self._ionice[0], value=self._ionice[1])
+        self._ionice = (ioclass, value if value is not None else 0)
+
+    def cpu_affinity(self, cpus=None):
+        if cpus is None:
+            return list(self._affinity)
+        if self.fail_affinity:
+            raise RuntimeError("affinity broke")
+        self._affinity = list(cpus)
+
+
+class FakeRegistry:
+    def __init__(self, processes, rows):
+        self.processes = {process.pid: process for process in processes}
+        self._rows = {row.pid: row for row in rows}
+        self.index = ProcessIndex()
+        self.index.apply(added=rows)
+
+    def rows(self, max_age=1.0):
+        return dict(self._rows)
+
+    def lookup(self, max_age=1.0):
+        return self.index
+
+    def process(self, pid):
+        return self.processes.get(pid)
+
+    def items(self, max_age=1.0):
+        return []
+
+
+def _row(pid, ppid, name):
+    return ProcessRow(pid, ppid, name, 'user', 'sleeping', 100.0, 0.0, 1.0, 0, 0.0, 0)
+
+
+@pytest.fixture
+def processes():
+    return [
+        FakeProcess(5001),                             # workload
+        FakeProcess(5002),                             # its child
+        FakeProcess(5003),                             # background
+        FakeProcess(5004, nice=15, ionice=(IDLE, 0)),  # already lower than the profile
+        FakeProcess(5005),                             # protected
+    ]
+
+
+def _scheduler(processes):
+    rows = [_row(5001, 5000, 'game'), _row(5002, 5001, 'game-helper'), _row(5003, 5000, 'editor'),
+            _row(5004, 5000, 'backup'), _row(5005, 5000, 'lsass.exe')]
+    return ProcessScheduler(FakeRegistry(processes, rows), protected={'lsass.exe'})
+
+
+def test_apply_then_restore_returns_original_values(monkeypatch, processes):
+    monkeypatch.setattr(scheduler_module, 'nice_floor', lambda: None)
+    original = {process.pid: process.settings() for process in processes}
+    scheduler = _scheduler(processes)
+
+    report = scheduler.apply('game', pid=5001)
+    game, helper, editor, backup, protected = processes
+    assert report['cpus'] == [2, 3]
+    assert game.settings() == (PRIORITY_LEVELS['high'], (BE, 4), [2, 3])
+    assert helper.settings() == (PRIORITY_LEVELS['high'], (BE, 4), [2, 3])
+    assert editor.settings() == (PRIORITY_LEVELS['below_normal'], (BE, 7), [0, 1])
+    # Settings are only moved in the profile's direction
+    assert backup.settings() == (15, (IDLE, 0), [0, 1])
+    assert protected.settings() == original[5005]
+    assert (report['boosted'], report['demoted']) == (2, 2)
+
+    restored = scheduler.restore()
+    assert restored == {'profile': 'game', 'restored': 4, 'gone': 0, 'failed': []}
+    assert {process.pid: process.settings() for process in processes} == original
+    assert scheduler.active is None
+
+
+def test_nice_is_not_demoted_when_it_could_not_be_restored(monkeypatch, processes):
+    # Default RLIMIT_NICE of 0: nothing below nice 20 can be set again
+    monkeypatch.setattr(scheduler_module, 'nice_floor', lambda: 20)
+    original = {process.pid: process.settings() for process in processes}
+    scheduler = _scheduler(processes)
+
+    scheduler.apply('game', pid=5001)
+    editor = processes[2]
+    assert editor.settings() == (0, (BE, 7), [0, 1])
+
+    scheduler.restore()
+    assert {process.pid: process.settings() for process in processes} == original
+
+
+def test_failed_apply_restores_what_was_changed(monkeypatch, processes):
+    monkeypatch.setattr(scheduler_module, 'nice_floor', lambda: None)
+    processes[3].fail_affinity = True
+    original = {process.pid: process.settings() for process in processes}
+    scheduler = _scheduler(processes)
+
+    with pytest.raises(RuntimeError):
+        scheduler.apply('game', pid=5001)
+    assert scheduler.active is None
+    assert {process.pid: process.settings() for process in processes} == original
+
+
+def test_settings_changed_before_a_failing_setter_are_restored(monkeypatch, processes):
+    monkeypatch.setattr(scheduler_module, 'nice_floor', lambda: None)
+    # The editor's nice and ionice are lowered before its affinity fails
+    editor = processes[2]
+    editor.fail_affinity = True
+    original = {process.pid: process.settings() for process in processes}
+    scheduler = _scheduler(processes)
+
+    with pytest.raises(RuntimeError):
+        scheduler.apply('game', pid=5001)
+    assert editor.settings() == original[5003]
+    assert {process.pid: process.settings() for process in processes} == original
+
+
+def test_nice_floor_follows_rlimit(monkeypatch):
+    resource = pytest.importorskip('resource')
+    monkeypatch.setattr(scheduler_module.os, 'geteuid', lambda: 1000)
+    monkeypatch.setattr(resource, 'getrlimit', lambda which: (0, 0))
+    assert scheduler_module.nice_floor() == 20
+    monkeypatch.setattr(resource, 'getrlimit', lambda which: (25, 25))
+    assert scheduler_module.nice_floor() == -5
+    monkeypatch.setattr(scheduler_module.os, 'geteuid', lambda: 0)
+    assert scheduler_module.nice_floor() is None
@@ -0,0 +1,75 @@
+import threading
+
+from system_info.software_inventory import FakeRegistryBackend, SoftwareInventory
+
+UNINSTALL = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+WOW64 = r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
+
+
+def _backend():
+    backend = FakeRegistryBackend()
+    backend.set_key('HKLM', UNINSTALL + r"\7zip", {'DisplayName': '7-Zip', 'DisplayVersion': '23.01'}, 1)
+    backend.set_key('HKLM', UNINSTALL + r"\Python311", {'DisplayName': 'Python', 'DisplayVersion': '3.11'}, 1)
+    backend.set_key('HKLM', WOW64 + r"\Python311", {'DisplayName': 'Python', 'DisplayVersion': '3.11'}, 1)
+    backend.set_key('HKCU', UNINSTALL + r"\Python312", {'DisplayName': 'Python', 'DisplayVersion': '3.12'}, 1)
+    backend.set_key('HKLM', UNINSTALL + r"\KB123", {'DisplayName': 'Update', 'ParentKeyName': 'Office'}, 1)
+    backend.set_key('HKLM', UNINSTALL + r"\Driver", {'DisplayName': 'Driver', 'SystemComponent': 1}, 1)
+    backend.set_key('HKLM', UNINSTALL + r"\NoName", {'DisplayVersion': '1.0'}, 1)
+    return backend
+
+
+def test_scan_dedups_by_name_and_version():
+    software = SoftwareInventory(_backend()).scan()
+    assert [(item['name'], item['version']) for item in software] == [
+        ('7-Zip', '23.01'), ('Python', '3.11'), ('Python', '3.12'),
+    ]
+    assert software[1]['source'] == 'HKLM (64-bit)'
+
+
+def test_rescan_only_reads_changed_keys():
+    backend = _backend()
+    inventory = SoftwareInventory(backend)
+    inventory.scan()
+    reads = backend.value_reads
+
+    assert len(inventory.scan()) == 3
+    assert backend.value_reads == reads
+
+    backend.set_key('HKLM', UNINSTALL + r"\7zip", {'DisplayName': '7-Zip', 'DisplayVersion': '24.08'}, 2)
+    software = inventory.scan()
+    assert backend.value_reads == reads + 1
+    assert ('7-Zip', '24.08') in [(item['name'], item['version']) for item in software]
+
+
+def test_uninstalled_entries_are_forgotten():
+    backend = _backend()
+    inventory = SoftwareInventory(backend)
+    inventory.scan()
+    backend.delete_key('HKCU', UNINSTALL + r"\Python312")
+    assert ('Python', '3.12') not in [(item['name'], item['version']) for item in inventory.scan()]
+
+    # A key reappearing with the same last-write time is read again
+    backend.set_key('HKCU', UNINSTALL + r"\Python312", {'DisplayName': 'Python', 'DisplayVersion': '3.12'}, 1)
+    assert ('Python', '3.12') in [(item['name'], item['version']) for item in inventory.scan()]
+
+
+def test_concurrent_scans_return_the_same_inventory():
+    inventory = SoftwareInventory(_backend())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(inventory.scan())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8
+    assert all(result == results[0] for result in results)
+
+
+def test_invalidate_rereads_everything():
+    backend = _backend()
+    inventory = SoftwareInventory(backend)
+    inventory.scan()
+    reads = backend.value_reads
+    inventory.invalidate()
+    inventory.scan()
+    assert backend.value_reads == reads * 2
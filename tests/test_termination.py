@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+import psutil
+
+from system_monitor.process_index import ProcessIndex
+from system_monitor.process_table import ProcessRow
+from system_optimizer.termination import TerminationEngine, untouchable_pids
+
+MB = 1024 * 1024
+
+
+def _row(pid, ppid, name, rss=100 * MB):
+    return ProcessRow(pid, ppid, name, 'user', 'sleeping', 100.0, 0.0, 1.0, rss, 1.0, 0)
+
+
+class FakeRegistry:
+    def __init__(self, rows, processes=None):
+        self.index = ProcessIndex()
+        self.index.apply(added=rows)
+        self.processes = processes or {}
+
+    def lookup(self, max_age=1.0):
+        return self.index
+
+    def process(self, pid):
+        return self.processes.get(pid)
+
+
+def test_tree_stops_at_protected_processes():
+    rows = [
+        _row(6000, 5999, 'taskmgr.exe', rss=10 * MB),
+        # explorer restarted from Task Manager: every user app hangs below it
+        _row(6001, 6000, 'explorer.exe'),
+        _row(6002, 6001, 'word.exe', rss=500 * MB),
+        _row(6003, 6001, 'chrome.exe', rss=800 * MB),
+        _row(6004, 6000, 'taskmgr-helper.exe', rss=20 * MB),
+    ]
+    engine = TerminationEngine(FakeRegistry(rows), protected={'explorer.exe'})
+
+    assert [row.pid for row in engine.tree(6000)] == [6000, 6004]
+    assert engine.tree(6001) == []
+
+    ranked = [(root.pid, [member.pid for member in members]) for _, root, members in engine.rank()]
+    assert ranked == [(6003, [6003]), (6002, [6002]), (6000, [6000, 6004])]
+
+
+def test_pid_zero_is_never_a_tree_root():
+    rows = [_row(0, 0, 'System Idle Process', rss=0), _row(6010, 0, 'app.exe')]
+    engine = TerminationEngine(FakeRegistry(rows))
+    assert 0 in untouchable_pids()
+    assert engine.tree(0) == []
+    assert [root.pid for _, root, _ in engine.rank()] == [6010]
+
+
+def test_processes_gone_before_the_signal_free_nothing():
+    alive = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+    processes = {alive.pid: psutil.Process(alive.pid), exited.pid: psutil.Process(exited.pid)}
+    exited.wait()
+    try:
+        rows = [_row(alive.pid, 1, 'alive', rss=10 * MB), _row(exited.pid, 1, 'exited', rss=90 * MB)]
+        engine = TerminationEngine(FakeRegistry(rows, processes), timeout=5)
+
+        report = engine.terminate(rows)
+        assert report['terminated'] == ['alive']
+        assert report['already_gone'] == ['exited']
+        assert report['survivors'] == []
+        assert report['freed'] == 10 * MB
+    finally:
+        alive.kill()
+        alive.wait()
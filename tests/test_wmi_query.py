@@ -0,0 +1,77 @@
+import threading
+import time
+
+from system_info import wmi_query
+from system_info.wmi_query import StaticWmiProvider, WmiQueryExecutor
+
+
+def test_concurrent_requests_share_one_enumeration():
+    provider = StaticWmiProvider({'Win32_DiskDrive': [{'Model': 'SSD'}]}, delay=0.2)
+    executor = WmiQueryExecutor(provider)
+    futures = [executor.submit('Win32_DiskDrive') for _ in range(5)]
+    results = [future.result(timeout=2) for future in futures]
+    assert provider.calls == ['Win32_DiskDrive']
+    assert all(records[0].Model == 'SSD' for records in results)
+    executor.shutdown()
+
+
+def test_different_classes_run_concurrently():
+    provider = StaticWmiProvider({name: [{}] for name in wmi_query.STATIC_HARDWARE_CLASSES}, delay=0.3)
+    executor = WmiQueryExecutor(provider, max_workers=4)
+    started = time.monotonic()
+    futures = executor.prefetch(wmi_query.STATIC_HARDWARE_CLASSES)
+    for future in futures.values():
+        future.result(timeout=2)
+    assert time.monotonic() - started < 0.3 * len(futures) * 0.75
+    assert sorted(provider.calls) == sorted(wmi_query.STATIC_HARDWARE_CLASSES)
+    executor.shutdown()
+
+
+def test_cached_result_expires_after_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(wmi_query.time, 'monotonic', lambda: clock[0])
+    provider = StaticWmiProvider({'Win32_Service': [{'Name': 'Spooler'}]})
+    executor = WmiQueryExecutor(provider, ttl={'Win32_Service': 60})
+
+    executor.query('Win32_Service', timeout=2)
+    clock[0] += 59
+    executor.query('Win32_Service', timeout=2)
+    assert provider.calls == ['Win32_Service']
+
+    clock[0] += 2
+    executor.query('Win32_Service', timeout=2)
+    assert provider.calls == ['Win32_Service', 'Win32_Service']
+    executor.shutdown()
+
+
+def test_zero_ttl_is_never_cached_and_none_never_expires(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(wmi_query.time, 'monotonic', lambda: clock[0])
+    provider = StaticWmiProvider({'MSAcpi_ThermalZoneTemperature': [{}], 'Win32_CacheMemory': [{}]})
+    executor = WmiQueryExecutor(provider)
+    for _ in range(2):
+        executor.query('MSAcpi_ThermalZoneTemperature', timeout=2)
+        executor.query('Win32_CacheMemory', timeout=2)
+        clock[0] += 10 ** 6
+    assert provider.calls.count('MSAcpi_ThermalZoneTemperature') == 2
+    assert provider.calls.count('Win32_CacheMemory') == 1
+
+    executor.invalidate('Win32_CacheMemory')
+    executor.query('Win32_CacheMemory', timeout=2)
+    assert provider.calls.count('Win32_CacheMemory') == 2
+    executor.shutdown()
+
+
+def test_queries_from_many_threads():
+    provider = StaticWmiProvider({'Win32_PhysicalMemory': [{'Capacity': 8}]}, delay=0.05)
+    executor = WmiQueryExecutor(provider)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(executor.query('Win32_PhysicalMemory', timeout=2)))
+               for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 16
+    assert provider.calls == ['Win32_PhysicalMemory']
+    executor.shutdown()